@@ -0,0 +1,463 @@
+#!/usr/bin/env python3
+"""Offline benchmark for token_checker.
+
+Starts a local HTTP stand-in for all seven providers in a separate process,
+points the checker at it through api_origins and measures single lookups and
+batch runs: p50/p95/p99 latency, upstream requests per lookup, throughput and
+peak memory. Payloads have the shape of the real API responses; the MEXC
+exchangeInfo and 24h ticker snapshots are generated at realistic size.
+
+    python3 benchmark.py --lookups 50 --batch 200 --latency 0.05 --error-rate 0.01
+"""
+
+import argparse
+import json
+import multiprocessing
+import random
+import resource
+import statistics
+import sys
+import threading
+import time
+import tracemalloc
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional
+from urllib.parse import parse_qs, urlsplit
+
+import token_checker
+from token_checker import (PLATFORMS, EnhancedTokenChecker, AsyncTokenChecker, MexcSymbolIndex,
+                           RateLimiter, ResponseCache)
+
+
+# Query words used by the workloads; the stand-in builds matching tokens for them
+QUERY_WORDS = ['pepe', 'bonk', 'doge', 'shib', 'wif', 'floki', 'trump', 'moon', 'cat', 'frog',
+               'inu', 'elon', 'based', 'chad', 'wojak', 'meme', 'ape', 'baby', 'king', 'ai']
+NAME_SUFFIXES = ['', ' Inu', '2', ' Classic', ' AI', ' Sol', 'Coin', ' 2.0', ' Baby', ' Killer']
+CHAINS = ['ethereum', 'solana', 'bsc', 'base', 'arbitrum', 'polygon']
+
+
+def _address(rng: random.Random, chain: str) -> str:
+    if chain == 'solana':
+        return ''.join(rng.choice('123456789ABCDEFGHJKLMNPQRSTUVWXYZabcdefghijkmnopqrstuvwxyz') for _ in range(44))
+    return '0x' + ''.join(rng.choice('0123456789abcdef') for _ in range(40))
+
+
+def _names(query: str) -> List[str]:
+    word = query.strip().title() or 'Token'
+    return [f"{word}{suffix}" for suffix in NAME_SUFFIXES]
+
+
+class StandInPayloads:
+    """Deterministic response bodies shaped like each provider's API"""
+
+    def __init__(self, mexc_symbols: int = 2500, seed: int = 7, coingecko_coins: int = 15000):
+        self.seed = seed
+        rng = random.Random(seed)
+        bases = [word.upper() + suffix for word in QUERY_WORDS for suffix in ('', '2', 'INU', 'AI', 'SOL')]
+        while len(bases) < mexc_symbols // 2:
+            bases.append(''.join(rng.choice('ABCDEFGHIJKLMNOPQRSTUVWXYZ') for _ in range(rng.randint(3, 7))))
+        symbols = []
+        for base in bases:
+            for quote in ('USDT', 'USDC'):
+                if len(symbols) >= mexc_symbols:
+                    break
+                symbols.append(self._mexc_symbol(base, quote))
+        self.exchange_info = json.dumps({
+            'timezone': 'CST', 'serverTime': 1700000000000, 'rateLimits': [], 'exchangeFilters': [],
+            'symbols': symbols,
+        }).encode()
+        self.tickers = json.dumps([self._mexc_ticker(rng, symbol['symbol']) for symbol in symbols]).encode()
+        self.coins_list = json.dumps(self._coingecko_coins(rng, coingecko_coins)).encode()
+
+    @staticmethod
+    def _coingecko_coins(rng: random.Random, count: int) -> List[Dict]:
+        """coins/list?include_platform=true: every coin the searches can return, padded with others"""
+        names = [name for word in QUERY_WORDS for name in _names(word)]
+        while len(names) < count:
+            names.append(''.join(rng.choice('abcdefghijklmnopqrstuvwxyz') for _ in range(rng.randint(4, 10))))
+        coins = []
+        for name in names:
+            chains = rng.sample(CHAINS, rng.randint(0, 3))
+            coins.append({'id': name.lower().replace(' ', '-').replace('.', '-'), 'symbol': name.lower(), 'name': name,
+                          'platforms': {chain: _address(rng, chain) for chain in chains} or {'': ''}})
+        return coins
+
+    @staticmethod
+    def _mexc_symbol(base: str, quote: str) -> Dict:
+        return {
+            'symbol': f"{base}{quote}", 'status': '1', 'baseAsset': base, 'baseAssetPrecision': 2,
+            'quoteAsset': quote, 'quotePrecision': 6, 'quoteAssetPrecision': 6, 'baseCommissionPrecision': 2,
+            'quoteCommissionPrecision': 6, 'orderTypes': ['LIMIT', 'MARKET', 'LIMIT_MAKER'],
+            'isSpotTradingAllowed': True, 'isMarginTradingAllowed': False, 'quoteAmountPrecision': '1.000000',
+            'baseSizePrecision': '0', 'permissions': ['SPOT'], 'filters': [], 'maxQuoteAmount': '2000000.000000',
+            'makerCommission': '0', 'takerCommission': '0.0005', 'quoteAmountPrecisionMarket': '1.000000',
+            'maxQuoteAmountMarket': '100000.000000', 'fullName': f"{base.title()} Token",
+            'tradeSideType': 1, 'contractAddress': '', 'st': False,
+        }
+
+    @staticmethod
+    def _mexc_ticker(rng: random.Random, symbol: str) -> Dict:
+        price = rng.uniform(1e-8, 10)
+        return {
+            'symbol': symbol, 'priceChange': f"{price * 0.01:.10f}", 'priceChangePercent': f"{rng.uniform(-0.5, 0.5):.4f}",
+            'prevClosePrice': f"{price:.10f}", 'lastPrice': f"{price:.10f}", 'bidPrice': f"{price:.10f}",
+            'bidQty': '100', 'askPrice': f"{price:.10f}", 'askQty': '100', 'openPrice': f"{price:.10f}",
+            'highPrice': f"{price * 1.1:.10f}", 'lowPrice': f"{price * 0.9:.10f}", 'volume': f"{rng.uniform(0, 1e9):.2f}",
+            'quoteVolume': f"{rng.uniform(0, 1e7):.2f}", 'openTime': 1700000000000, 'closeTime': 1700086400000,
+            'count': None,
+        }
+
+    def _rng(self, *parts) -> random.Random:
+        return random.Random(f"{self.seed}:{':'.join(str(part) for part in parts)}")
+
+    def dexscreener(self, query: str) -> Dict:
+        rng = self._rng('dex', query)
+        pairs = []
+        for i in range(30):
+            name = rng.choice(_names(query))
+            chain = rng.choice(CHAINS)
+            pairs.append({
+                'chainId': chain, 'dexId': rng.choice(['uniswap', 'raydium', 'pancakeswap', 'orca']),
+                'url': f"https://dexscreener.com/{chain}/{i}", 'pairAddress': _address(rng, chain),
+                'baseToken': {'address': _address(rng, chain), 'name': name, 'symbol': name.upper().replace(' ', '')},
+                'quoteToken': {'address': _address(rng, chain), 'name': 'Wrapped Ether', 'symbol': 'WETH'},
+                'priceNative': f"{rng.uniform(1e-9, 1):.12f}", 'priceUsd': f"{rng.uniform(1e-9, 1):.12f}",
+                'txns': {'h24': {'buys': rng.randint(0, 5000), 'sells': rng.randint(0, 5000)}},
+                'volume': {'h24': rng.uniform(0, 1e7), 'h6': rng.uniform(0, 1e6)},
+                'priceChange': {'h24': rng.uniform(-90, 300)},
+                'liquidity': {'usd': rng.uniform(0, 5e6), 'base': rng.uniform(0, 1e12), 'quote': rng.uniform(0, 1e3)},
+                'fdv': rng.uniform(1e4, 1e9), 'marketCap': rng.uniform(1e4, 1e9),
+                'pairCreatedAt': rng.randint(1600000000000, 1790000000000),
+            })
+        return {'schemaVersion': '1.0.0', 'pairs': pairs}
+
+    def birdeye_tokenlist(self, query: str) -> Dict:
+        rng = self._rng('birdeye', query)
+        tokens = [{'address': _address(rng, 'solana'), 'name': name, 'symbol': name.upper().replace(' ', ''),
+                   'decimals': rng.choice([6, 9]), 'logoURI': None, 'liquidity': rng.uniform(0, 1e6)}
+                  for name in _names(query) * 2]
+        return {'success': True, 'data': {'tokens': tokens}}
+
+    def birdeye_overview(self, address: str) -> Dict:
+        rng = self._rng('overview', address)
+        return {'success': True, 'data': {'address': address, 'price': rng.uniform(1e-9, 1), 'liquidity': rng.uniform(0, 1e6),
+                                          'v24hUSD': rng.uniform(0, 1e7), 'mc': rng.uniform(1e4, 1e9),
+                                          'holder': rng.randint(1, 500000)}}
+
+    def coingecko_search(self, query: str) -> Dict:
+        coins = [{'id': name.lower().replace(' ', '-').replace('.', '-'), 'name': name,
+                  'api_symbol': name.lower(), 'symbol': name.upper().replace(' ', ''),
+                  'market_cap_rank': None, 'thumb': '', 'large': ''} for name in _names(query)]
+        return {'coins': coins, 'exchanges': [], 'icos': [], 'categories': [], 'nfts': []}
+
+    def coingecko_markets(self, ids: List[str]) -> List[Dict]:
+        markets = []
+        for coin_id in ids:
+            rng = self._rng('markets', coin_id)
+            markets.append({'id': coin_id, 'symbol': coin_id, 'name': coin_id, 'current_price': rng.uniform(1e-9, 1),
+                            'market_cap': rng.uniform(1e5, 1e10), 'total_volume': rng.uniform(0, 1e8),
+                            'price_change_percentage_24h': rng.uniform(-50, 50), 'circulating_supply': rng.uniform(1e6, 1e15),
+                            'total_supply': rng.uniform(1e6, 1e15), 'max_supply': None})
+        return markets
+
+    def pumpfun(self, query: str) -> List[Dict]:
+        rng = self._rng('pump', query)
+        return [{'mint': _address(rng, 'solana'), 'name': name, 'symbol': name.upper().replace(' ', ''),
+                 'description': f"The one and only {name}", 'creator': _address(rng, 'solana'),
+                 'created_timestamp': rng.randint(1700000000000, 1790000000000), 'market_cap': rng.uniform(1, 1e4),
+                 'twitter': None, 'telegram': None, 'website': None} for name in _names(query)]
+
+    def coinmarketcap(self, query: str) -> Dict:
+        rng = self._rng('cmc', query)
+        items = [{'id': i, 'name': name, 'symbol': name.upper().replace(' ', ''), 'slug': name.lower().replace(' ', '-'),
+                  'cmcRank': rng.randint(1, 9000), 'circulatingSupply': rng.uniform(1e6, 1e15),
+                  'totalSupply': rng.uniform(1e6, 1e15), 'maxSupply': None,
+                  'quotes': [{'name': 'USD', 'price': rng.uniform(1e-9, 1), 'marketCap': rng.uniform(1e5, 1e10),
+                              'volume24h': rng.uniform(0, 1e8), 'percentChange24h': rng.uniform(-50, 50)}]}
+                 for i, name in enumerate(_names(query) * 2)]
+        return {'data': {'cryptoCurrencyList': items, 'totalCount': str(len(items))}, 'status': {'error_code': '0'}}
+
+    def geckoterminal(self, query: str) -> Dict:
+        rng = self._rng('gt', query)
+        pools = []
+        for name in _names(query):
+            network = rng.choice(['eth', 'solana', 'bsc', 'base'])
+            pools.append({'id': f"{network}_{name}", 'type': 'pool', 'attributes': {
+                'name': f"{name.upper()} / WETH", 'address': _address(rng, network), 'network': network,
+                'dex_id': 'uniswap_v3', 'base_token_price_usd': f"{rng.uniform(1e-9, 1):.12f}",
+                'reserve_in_usd': f"{rng.uniform(0, 5e6):.2f}", 'volume_usd': {'h24': f"{rng.uniform(0, 1e7):.2f}"},
+                'price_change_percentage': {'h24': f"{rng.uniform(-90, 300):.2f}"},
+                'pool_created_at': '2024-03-01T12:00:00Z'}})
+        return {'data': pools}
+
+    def respond(self, platform: str, path: str, query: Dict[str, List[str]]) -> Optional[bytes]:
+        """Body for a request to the stand-in, or None for an unknown endpoint"""
+        first = lambda name: query.get(name, [''])[0]
+        if platform == 'dexscreener' and path.startswith('/latest/dex/search'):
+            payload = self.dexscreener(first('q'))
+        elif platform == 'birdeye' and path == '/public/tokenlist':
+            payload = self.birdeye_tokenlist(first('keyword'))
+        elif platform == 'birdeye' and path == '/public/token_overview':
+            payload = self.birdeye_overview(first('address'))
+        elif platform == 'coingecko' and path == '/api/v3/search':
+            payload = self.coingecko_search(first('query'))
+        elif platform == 'coingecko' and path == '/api/v3/coins/markets':
+            payload = self.coingecko_markets(first('ids').split(','))
+        elif platform == 'coingecko' and path == '/api/v3/coins/list':
+            return self.coins_list
+        elif platform == 'pumpfun' and path == '/coins':
+            payload = self.pumpfun(first('searchQuery'))
+        elif platform == 'mexc' and path == '/api/v3/exchangeInfo':
+            return self.exchange_info
+        elif platform == 'mexc' and path == '/api/v3/ticker/24hr':
+            return self.tickers
+        elif platform == 'coinmarketcap' and path.startswith('/data-api/v3/cryptocurrency/listing'):
+            payload = self.coinmarketcap(first('search'))
+        elif platform == 'geckoterminal' and path == '/api/v2/search/pools':
+            payload = self.geckoterminal(first('query'))
+        else:
+            return None
+        return json.dumps(payload).encode()
+
+
+def serve_stand_in(port_queue, latency: float, jitter: float, error_rate: float, mexc_symbols: int):
+    """Run the stand-in server until the parent process terminates it"""
+    payloads = StandInPayloads(mexc_symbols)
+    counts: Dict[str, int] = {}
+    counts_lock = threading.Lock()
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+
+        def do_GET(self):
+            parts = urlsplit(self.path)
+            platform, _, path = parts.path.lstrip('/').partition('/')
+            path = '/' + path
+            if platform == '__stats':
+                with counts_lock:
+                    return self._send(200, json.dumps(counts).encode())
+            if platform == '__reset':
+                with counts_lock:
+                    counts.clear()
+                return self._send(200, b'{}')
+
+            with counts_lock:
+                counts[platform] = counts.get(platform, 0) + 1
+            time.sleep(max(0.0, random.gauss(latency, jitter)))
+            if random.random() < error_rate:
+                return self._send(503, b'{"error": "stand-in failure"}')
+            body = payloads.respond(platform, path, parse_qs(parts.query))
+            if body is None:
+                return self._send(404, b'{"error": "not found"}')
+            self._send(200, body)
+
+        def _send(self, status: int, body: bytes):
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    class Server(ThreadingHTTPServer):
+        daemon_threads = True
+
+        def handle_error(self, request, client_address):
+            # Clients closing pooled keep-alive connections are expected, not worth a traceback
+            if not isinstance(sys.exc_info()[1], ConnectionError):
+                super().handle_error(request, client_address)
+
+    server = Server(('127.0.0.1', 0), Handler)
+    port_queue.put(server.server_address[1])
+    server.serve_forever()
+
+
+class StandIn:
+    """Starts the stand-in server in a child process so it does not skew the client's CPU and memory"""
+
+    def __init__(self, latency: float, jitter: float, error_rate: float, mexc_symbols: int):
+        port_queue = multiprocessing.Queue()
+        self.process = multiprocessing.Process(target=serve_stand_in, daemon=True,
+                                               args=(port_queue, latency, jitter, error_rate, mexc_symbols))
+        self.process.start()
+        self.root = f"http://127.0.0.1:{port_queue.get(timeout=60)}"
+        self._session = token_checker.requests.Session()
+
+    @property
+    def api_origins(self) -> Dict[str, str]:
+        return {platform: f"{self.root}/{platform}" for platform in PLATFORMS}
+
+    def reset(self):
+        self._session.get(f"{self.root}/__reset")
+
+    def request_counts(self) -> Dict[str, int]:
+        return self._session.get(f"{self.root}/__stats").json()
+
+    def stop(self):
+        self.process.terminate()
+        self.process.join()
+
+
+def percentile(samples: List[float], pct: float) -> float:
+    ordered = sorted(samples)
+    if not ordered:
+        return 0.0
+    k = (len(ordered) - 1) * pct / 100
+    low, high = int(k), min(int(k) + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (k - low)
+
+
+def make_checker(args, stand_in: StandIn, engine: str = 'sync', pool_size: Optional[int] = None):
+    """A quiet checker aimed at the stand-in, with a fresh MEXC index, cache and limiter"""
+    limiter = RateLimiter() if args.real_limits else RateLimiter({platform: (1e6, 1000000) for platform in PLATFORMS})
+    options = dict(mexc_index=MexcSymbolIndex(cache_file=None), use_cache=args.cache,
+                   cache=ResponseCache() if args.cache else None, verbose=False, limiter=limiter,
+                   api_origins=stand_in.api_origins)
+    if engine == 'async':
+        return AsyncTokenChecker(**options)
+    return EnhancedTokenChecker(pool_size=pool_size, **options)
+
+
+def queries(count: int, seed: int = 1) -> List[str]:
+    rng = random.Random(seed)
+    return [rng.choice(QUERY_WORDS) for _ in range(count)]
+
+
+def summarize(name: str, latencies: List[float], elapsed: float, lookups: int, requests: Dict[str, int],
+              peak_bytes: int) -> Dict:
+    total_requests = sum(requests.values())
+    return {
+        'workload': name,
+        'lookups': lookups,
+        'p50_ms': percentile(latencies, 50) * 1000,
+        'p95_ms': percentile(latencies, 95) * 1000,
+        'p99_ms': percentile(latencies, 99) * 1000,
+        'mean_ms': statistics.mean(latencies) * 1000 if latencies else 0.0,
+        'throughput_per_s': lookups / elapsed if elapsed else 0.0,
+        'requests_per_lookup': total_requests / lookups if lookups else 0.0,
+        'requests_by_platform': requests,
+        'peak_traced_mb': peak_bytes / 1e6,
+        'elapsed_s': elapsed,
+    }
+
+
+def run_workload(name: str, stand_in: StandIn, trace_memory: bool, body) -> Dict:
+    """Run body() -> (latencies, lookups) against a freshly reset stand-in and summarize it"""
+    stand_in.reset()
+    if trace_memory:
+        tracemalloc.start()
+    started = time.perf_counter()
+    latencies, lookups = body()
+    elapsed = time.perf_counter() - started
+    peak = 0
+    if trace_memory:
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    return summarize(name, latencies, elapsed, lookups, stand_in.request_counts(), peak)
+
+
+def sync_lookups(args, stand_in: StandIn):
+    checker = make_checker(args, stand_in)
+    checker.search_all('warmup')  # loads the MEXC index once, like a long-running process
+    names = queries(args.lookups)
+
+    def body():
+        latencies = []
+        for name in names:
+            started = time.perf_counter()
+            checker.search_all(name)
+            latencies.append(time.perf_counter() - started)
+        return latencies, len(names)
+    return run_workload('sync search_all', stand_in, args.trace_memory, body)
+
+
+def sync_batch(args, stand_in: StandIn):
+    checker = make_checker(args, stand_in, pool_size=args.workers * 4)
+    checker.search_all('warmup')
+    names = [f"{word}{i}" if i else word for i, word in enumerate(queries(args.batch, seed=2))]
+
+    def body():
+        latencies = []
+        started = time.perf_counter()
+        count = 0
+        for _ in checker.search_batch(names, workers=args.workers):
+            count += 1
+            # Completion times since the batch started; throughput is the headline number here
+            latencies.append(time.perf_counter() - started)
+        return latencies, count
+    return run_workload(f"sync batch x{args.workers}", stand_in, args.trace_memory, body)
+
+
+def async_lookups(args, stand_in: StandIn):
+    import asyncio
+    names = queries(args.lookups)
+
+    async def measure():
+        async with make_checker(args, stand_in, engine='async') as checker:
+            await checker.search_all('warmup')
+            latencies = []
+            for name in names:
+                started = time.perf_counter()
+                await checker.search_all(name)
+                latencies.append(time.perf_counter() - started)
+            return latencies, len(names)
+    return run_workload('async search_all', stand_in, args.trace_memory, lambda: asyncio.run(measure()))
+
+
+def print_report(rows: List[Dict]):
+    print(f"\n{'='*96}")
+    print(f"{'workload':<22}{'lookups':>8}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}"
+          f"{'lookups/s':>11}{'req/lookup':>12}{'peak MB':>10}")
+    print(f"{'-'*96}")
+    for row in rows:
+        print(f"{row['workload']:<22}{row['lookups']:>8}{row['p50_ms']:>10.1f}{row['p95_ms']:>10.1f}"
+              f"{row['p99_ms']:>10.1f}{row['throughput_per_s']:>11.2f}{row['requests_per_lookup']:>12.2f}"
+              f"{row['peak_traced_mb']:>10.2f}")
+    print(f"{'='*96}")
+    print(f"Peak RSS of this process: {resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024:.1f} MB\n")
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Benchmark token_checker against a local stand-in of every provider")
+    parser.add_argument('--lookups', type=int, default=30, help="single search_all lookups to time (default: %(default)s)")
+    parser.add_argument('--batch', type=int, default=100, help="tokens in the batch workload, 0 to skip (default: %(default)s)")
+    parser.add_argument('--workers', type=int, default=8, help="batch workers (default: %(default)s)")
+    parser.add_argument('--latency', type=float, default=0.05, help="mean stand-in response time in seconds (default: %(default)s)")
+    parser.add_argument('--jitter', type=float, default=0.01, help="standard deviation of the response time (default: %(default)s)")
+    parser.add_argument('--error-rate', type=float, default=0.0, help="fraction of requests answered with 503 (default: %(default)s)")
+    parser.add_argument('--mexc-symbols', type=int, default=2500, help="symbols in the MEXC exchangeInfo snapshot (default: %(default)s)")
+    parser.add_argument('--engine', choices=['sync', 'async', 'both'], default='sync', help="engines to measure (default: %(default)s)")
+    parser.add_argument('--cache', action='store_true', help="keep the response cache on (off by default so every lookup goes upstream)")
+    parser.add_argument('--real-limits', action='store_true', help="keep the production rate limits instead of lifting them")
+    parser.add_argument('--trace-memory', action='store_true', help="report peak Python allocations with tracemalloc (slower)")
+    parser.add_argument('--json', metavar='FILE', help="also write the results as JSON to FILE")
+    args = parser.parse_args(argv)
+
+    print(f"🧪 Starting stand-in ({args.mexc_symbols} MEXC symbols, {args.latency * 1000:.0f}ms latency, "
+          f"{args.error_rate:.1%} errors)...")
+    stand_in = StandIn(args.latency, args.jitter, args.error_rate, args.mexc_symbols)
+    rows = []
+    try:
+        if args.engine in ('sync', 'both'):
+            rows.append(sync_lookups(args, stand_in))
+            if args.batch:
+                rows.append(sync_batch(args, stand_in))
+        if args.engine in ('async', 'both'):
+            if token_checker.aiohttp is None:
+                print("⚠️  aiohttp is not installed, skipping the async engine", file=sys.stderr)
+            else:
+                rows.append(async_lookups(args, stand_in))
+    finally:
+        stand_in.stop()
+
+    print_report(rows)
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(rows, f, indent=2)
+        print(f"💾 Results saved to {args.json}")
+
+
+if __name__ == "__main__":
+    main()
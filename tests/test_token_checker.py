@@ -0,0 +1,458 @@
+import asyncio
+import http.client
+import json
+import os
+import sys
+import threading
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import token_checker
+from token_checker import (BACKOFF_BASE, MAX_RETRIES, MAX_RETRY_AFTER, AsyncSingleFlight, CircuitBreaker,
+                           EnhancedTokenChecker, MexcSymbolIndex, PlatformError, RateLimiter, ResponseCache, RiskScorer,
+                           SearchResults, TokenAPIServer, TokenBucket, TokenIndex, TokenMatcher, TokenRecord,
+                           TokenResolver, Watcher, diff_records, format_watch_event, json_default, load_batch_results,
+                           load_provider, main, parse_retry_after, run_batch, skeleton)
+
+
+def _mexc_index(*bases):
+    index = MexcSymbolIndex(cache_file=None)
+    index.update({'symbols': [
+        {'symbol': f'{base}USDT', 'baseAsset': base, 'quoteAsset': 'USDT', 'status': '1'}
+        for base in bases
+    ]})
+    return index
+
+
+def test_non_latin_names_keep_a_skeleton():
+    assert skeleton('狗狗币') == '狗狗币'
+    assert skeleton('🐸') == '🐸'
+    assert skeleton('P3PE') == skeleton('PEPE')
+
+
+def test_non_latin_names_match():
+    matcher = TokenMatcher.for_query('狗狗币')
+    assert matcher.score('狗狗币') == 1.0
+    assert matcher.matches('狗狗币')
+    assert matcher.score('狗狗币2') >= 0.8
+    assert matcher.score('PEPE') == 0.0
+    assert TokenMatcher.for_query('🐸').score('🐸') == 1.0
+
+
+def test_mexc_lookup_of_non_latin_base_asset():
+    index = _mexc_index('PEPE', '币安人生', '🐸', 'DOGE')
+    assert [s['symbol'] for s in index.lookup('币安人生')] == ['币安人生USDT']
+    assert [s['symbol'] for s in index.lookup('🐸')] == ['🐸USDT']
+    assert [s['symbol'] for s in index.lookup('pepe')] == ['PEPEUSDT']
+
+
+def test_async_single_flight_survives_leader_cancellation():
+    flights = AsyncSingleFlight()
+    calls = []
+
+    async def fetch():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        return 'data'
+
+    async def run():
+        leader = asyncio.ensure_future(flights.call('key', fetch))
+        await asyncio.sleep(0)
+        follower = asyncio.ensure_future(flights.call('key', fetch))
+        await asyncio.sleep(0)
+        leader.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await leader
+        return await follower
+
+    assert asyncio.run(run()) == ('data', True)
+    assert calls == [1]
+    assert flights.shared == 1
+
+
+def test_async_single_flight_shares_exceptions():
+    flights = AsyncSingleFlight()
+
+    async def fetch():
+        await asyncio.sleep(0.01)
+        raise ValueError('boom')
+
+    async def run():
+        return await asyncio.gather(flights.call('key', fetch), flights.call('key', fetch),
+                                    return_exceptions=True)
+
+    first, second = asyncio.run(run())
+    assert isinstance(first, ValueError) and second is first
+    assert not flights._calls
+
+
+def test_search_errors_go_to_stderr(capsys):
+    checker = EnhancedTokenChecker(mexc_index=MexcSymbolIndex(cache_file=None), cache=None, use_cache=False,
+                                   verbose=False)
+    checker._search_failed('mexc', 'MEXC', ValueError('boom'))
+    captured = capsys.readouterr()
+    assert captured.out == ''
+    assert 'MEXC error: boom' in captured.err
+
+
+@pytest.mark.parametrize('body', [{'tokens': 5}, {'tokens': 'pepe'}, {'tokens': ['pepe', 5]},
+                                  {'tokens': ['pepe'], 'platforms': 5}, {'tokens': ['pepe'], 'platforms': 'mexc'},
+                                  {'tokens': ['pepe'], 'platforms': [['mexc']]}])
+def test_api_batch_rejects_malformed_lists(body):
+    checker = EnhancedTokenChecker(mexc_index=MexcSymbolIndex(cache_file=None), cache=None, use_cache=False,
+                                   verbose=False)
+    server = TokenAPIServer(checker, port=0)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        connection = http.client.HTTPConnection('127.0.0.1', server.server_address[1], timeout=5)
+        connection.request('POST', '/batch', json.dumps(body), {'Content-Type': 'application/json'})
+        response = connection.getresponse()
+        assert response.status == 400
+        assert 'must be a list of strings' in json.loads(response.read())['error']
+        connection.close()
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_risk_reasons_separate_shared_listings_from_unlisted():
+    pytest.importorskip('numpy')
+    resolver = TokenResolver()
+    resolver.add({'platform': 'CoinGecko', 'symbol': 'PEPE', 'coingecko_id': 'pepe'})
+    resolver.add({'platform': 'DexScreener', 'symbol': 'PEPE', 'chain': 'ethereum', 'address': '0x' + '1' * 40})
+    resolver.add({'platform': 'DexScreener', 'symbol': 'PEPE', 'chain': 'bsc', 'address': '0x' + '2' * 40})
+    resolver.add({'platform': 'DexScreener', 'symbol': 'FROG', 'chain': 'bsc', 'address': '0x' + '3' * 40})
+    reasons = {(entry['symbol'], entry['chain']): entry['reasons'] for entry in RiskScorer().score(resolver)}
+    assert 'shared_listing' in reasons['PEPE', 'ethereum']
+    assert 'unlisted' not in reasons['PEPE', 'ethereum']
+    assert 'unlisted' in reasons['FROG', 'bsc']
+
+
+def test_watch_refuses_offline(tmp_path, monkeypatch, capsys):
+    checker = EnhancedTokenChecker(mexc_index=MexcSymbolIndex(cache_file=None), cache=None, use_cache=False,
+                                   verbose=False, index=TokenIndex(str(tmp_path / 'tokens.sqlite')), offline=True)
+    with pytest.raises(ValueError):
+        Watcher(checker, ['pepe'])
+    monkeypatch.setattr(sys, 'argv', ['token_checker.py', '--watch', 'tokens.txt', '--offline'])
+    with pytest.raises(SystemExit):
+        main()
+    assert 'cannot run --offline' in capsys.readouterr().err
+
+
+def test_coingecko_enrichment_skips_hits_without_an_id():
+    provider = load_provider('coingecko')
+    results = provider.parse({'coins': [{'name': 'Pepe', 'symbol': 'PEPE', 'id': 'pepe'},
+                                        {'name': 'Pepe', 'symbol': 'PEPE'}]}, 'pepe')
+    assert len(results) == 2
+    [(url, (_, target)), (contracts_url, _)] = provider.enrichments(results)
+    assert url.endswith('ids=pepe') and target is results
+    assert 'include_platform=true' in contracts_url
+    assert provider.enrichments(results[1:]) == []
+
+
+def test_coingecko_records_get_their_contract_addresses():
+    provider = load_provider('coingecko')
+    results = provider.parse({'coins': [{'name': 'Pepe', 'symbol': 'PEPE', 'id': 'pepe'}]}, 'pepe')
+    coins = [{'id': 'pepe', 'symbol': 'pepe', 'name': 'Pepe',
+              'platforms': {'ethereum': '0x6982508145454CE325DDBE47A25D4EC3D2311933', 'binance-smart-chain': '0x' + '2' * 40}},
+             {'id': 'bitcoin', 'symbol': 'btc', 'name': 'Bitcoin', 'platforms': {'': ''}}]
+    for url, target in provider.enrichments(results):
+        if 'coins/list' in url:
+            provider.enrich(target, coins)
+    [pepe] = results
+    assert (pepe.chain, pepe.contract_address) == ('ethereum', '0x6982508145454ce325ddbe47a25d4ec3d2311933')
+    assert pepe.contract_addresses[1] == 'bsc:0x' + '2' * 40
+    assert TokenResolver.entity_key(pepe)[0] == 'ethereum:0x6982508145454ce325ddbe47a25d4ec3d2311933'
+
+
+def test_parse_ranks_every_scanned_hit_before_keeping_max_results():
+    provider = load_provider('coinmarketcap')
+    names = ['Pepo', 'Pope', 'Pepe Inu', 'PEPE2', 'Peper', 'Pepe']
+    data = {'data': {'cryptoCurrencyList': [{'name': name, 'symbol': name.upper(), 'slug': name.lower()}
+                                            for name in names]}}
+    results = provider.parse(data, 'pepe')
+    assert len(results) == provider.max_results
+    assert results[0].name == 'Pepe' and results[0].match_score == 1.0
+
+
+def test_token_index_round_trip(tmp_path):
+    index = TokenIndex(str(tmp_path / 'tokens.sqlite'), ttl=60)
+    records = [TokenRecord(platform='DexScreener', name='Pepe', symbol='PEPE', chain='ethereum',
+                           address='0x' + 'a' * 40, url='https://dexscreener.com/ethereum/1'),
+               TokenRecord(platform='DexScreener', name='Pepe Inu', symbol='PEPEINU', chain='bsc',
+                           address='0x' + 'b' * 40, url='https://dexscreener.com/bsc/2')]
+    index.record('dexscreener', ' PEPE ', records)
+    assert [record.url for record in index.lookup('dexscreener', 'pepe')] == [record.url for record in records]
+    assert index.lookup('dexscreener', 'pepe', max_age=-1) is None
+    assert index.lookup('coingecko', 'pepe') is None
+    assert index.search('pepe')[0].symbol == 'PEPE'
+    assert index.stats() == {'tokens': 2, 'searches': 1}
+    index.close()
+
+
+def test_token_index_lookup_commits_last_used(tmp_path):
+    path = str(tmp_path / 'tokens.sqlite')
+    first, second = TokenIndex(path), TokenIndex(path)
+    first.record('coingecko', 'pepe', [TokenRecord(platform='CoinGecko', name='Pepe', symbol='PEPE', coingecko_id='pepe')])
+    first._db.execute("UPDATE searches SET last_used = 0")
+    first._db.commit()
+    assert first.lookup('coingecko', 'pepe')
+    # Another process sharing the file can still write, and the bump survives close()
+    second._db.execute("PRAGMA busy_timeout = 0")
+    second.record('coingecko', 'doge', [TokenRecord(platform='CoinGecko', name='Dogecoin', symbol='DOGE',
+                                                    coingecko_id='dogecoin')])
+    first.close()
+    last_used = second._db.execute("SELECT last_used FROM searches WHERE query = 'pepe'").fetchone()[0]
+    assert last_used > 0
+    second.close()
+
+
+def _failing_checker(tmp_path, failing, platforms=('dexscreener', 'coingecko')):
+    """A checker whose `failing` platforms raise PlatformError and whose others find nothing"""
+    checker = EnhancedTokenChecker(mexc_index=MexcSymbolIndex(cache_file=None), cache=None, use_cache=False,
+                                   verbose=False, index=TokenIndex(str(tmp_path / 'tokens.sqlite')),
+                                   platforms=platforms)
+
+    def get_json(platform, url, timeout=10):
+        if platform in failing:
+            raise PlatformError(f"{platform} failed after 4 attempts (HTTP 503)")
+        return {}
+
+    checker._get_json = get_json
+    return checker
+
+
+def test_failed_search_reports_its_error_and_is_not_indexed(tmp_path):
+    checker = _failing_checker(tmp_path, {'coingecko'})
+    results = checker.search_all('pepe')
+    assert results['dexscreener'] == [] and results['dexscreener'].error is None
+    assert results['coingecko'] == [] and 'HTTP 503' in results['coingecko'].error
+    assert checker.index.lookup('dexscreener', 'pepe') == []
+    assert checker.index.lookup('coingecko', 'pepe') is None
+
+
+def test_batch_output_lists_failed_platforms(tmp_path):
+    checker = _failing_checker(tmp_path, {'coingecko'})
+    source, output = tmp_path / 'tokens.txt', tmp_path / 'out.jsonl'
+    source.write_text('pepe\n')
+    run_batch(checker, str(source), str(output), workers=1)
+    [line] = [json.loads(line) for line in output.read_text().splitlines()]
+    assert line['results'] == {'dexscreener': [], 'coingecko': []}
+    assert list(line['errors']) == ['coingecko'] and line['error'] is None
+    assert load_batch_results(str(output)).failed_platforms('pepe') == {'coingecko'}
+
+    run_batch(checker, str(source), str(output), workers=1, per_record=True)
+    assert [json.loads(line)['source'] for line in output.read_text().splitlines()] == ['coingecko']
+
+
+def test_unlisted_is_unknown_when_the_trackers_failed():
+    pytest.importorskip('numpy')
+    dex = SearchResults([TokenRecord(platform='DexScreener', symbol='FROG', chain='bsc', address='0x' + '3' * 40)])
+    resolver = TokenResolver()
+    resolver.add_results({'dexscreener': dex, 'coingecko': SearchResults(error='HTTP 503')}, 'frog')
+    [entry] = RiskScorer().score(resolver)
+    assert 'unlisted' not in entry['features']
+    resolver = TokenResolver.from_results({'dexscreener': dex, 'coingecko': SearchResults()}, 'frog')
+    assert RiskScorer().score(resolver)[0]['features']['unlisted'] == 1.0
+
+
+def test_listing_is_matched_on_contract_not_symbol():
+    pytest.importorskip('numpy')
+    real, fake = '0x' + '1' * 40, '0x' + '2' * 40
+    resolver = TokenResolver()
+    resolver.add({'platform': 'CoinGecko', 'symbol': 'PEPE', 'coingecko_id': 'pepe', 'chain': 'ethereum',
+                  'contract_address': real, 'contract_addresses': [f'ethereum:{real}', f'base:{fake[:-1]}3']})
+    resolver.add({'platform': 'DexScreener', 'symbol': 'PEPE', 'chain': 'ethereum', 'address': real})
+    resolver.add({'platform': 'DexScreener', 'symbol': 'PEPE', 'chain': 'bsc', 'address': fake})
+    resolver.add({'platform': 'CoinMarketCap', 'symbol': 'PEPE', 'url': 'https://coinmarketcap.com/currencies/pepe'})
+    features = {entry['chain']: entry['features'] for entry in RiskScorer().score(resolver) if entry['address']}
+    assert features['ethereum']['unlisted'] == 0.0
+    assert features['bsc']['unlisted'] == 1.0
+
+
+def test_api_post_to_unknown_path_keeps_the_connection_usable():
+    checker = EnhancedTokenChecker(mexc_index=MexcSymbolIndex(cache_file=None), cache=None, use_cache=False,
+                                   verbose=False)
+    server = TokenAPIServer(checker, port=0)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        connection = http.client.HTTPConnection('127.0.0.1', server.server_address[1], timeout=5)
+        connection.request('POST', '/nope', json.dumps({'tokens': ['pepe']}), {'Content-Type': 'application/json'})
+        response = connection.getresponse()
+        assert response.status == 404
+        response.read()
+        connection.request('GET', '/health')
+        response = connection.getresponse()
+        assert response.status == 200 and json.loads(response.read())['status'] == 'ok'
+        connection.close()
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_watch_change_from_zero_has_no_percentage():
+    before = [TokenRecord(platform='DexScreener', symbol='PEPE', url='u', liquidity_usd=0, volume_24h=100)]
+    after = [TokenRecord(platform='DexScreener', symbol='PEPE', url='u', liquidity_usd=5000, volume_24h=200)]
+    changes = {change['field']: change for change in diff_records(before, after)}
+    assert changes['liquidity_usd']['change_pct'] is None
+    assert changes['volume_24h']['change_pct'] == 100.0
+    event = {'time': 'now', 'token': 'pepe', 'platform': 'dexscreener', **changes['liquidity_usd']}
+    json.dumps(event, default=json_default, allow_nan=False)
+    assert 'inf' not in format_watch_event(event) and '5,000' in format_watch_event(event)
+
+
+class FakeClock:
+    """Stands in for the time module inside token_checker, so time only moves when a test says so"""
+
+    def __init__(self, now: float = 1000.0):
+        self.now = now
+
+    def monotonic(self) -> float:
+        return self.now
+
+    time = perf_counter = monotonic
+
+    def sleep(self, seconds: float):
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(token_checker, 'time', fake)
+    return fake
+
+
+def test_parse_retry_after():
+    assert parse_retry_after(None) is None
+    assert parse_retry_after('') is None
+    assert parse_retry_after('12') == 12.0
+    assert parse_retry_after('-5') == 0.0
+    assert parse_retry_after('soon') is None
+    later = format_datetime(datetime.now(timezone.utc) + timedelta(seconds=120), usegmt=True)
+    assert 110 <= parse_retry_after(later) <= 120
+    assert parse_retry_after('Wed, 21 Oct 2015 07:28:00 GMT') == 0.0
+
+
+def test_token_bucket_reserve_and_backlog(clock):
+    bucket = TokenBucket(rate=2.0, capacity=2)
+    assert bucket.backlog(2) == 0.0
+    assert bucket.reserve() == 0.0
+    assert bucket.reserve() == 0.0
+    assert bucket.reserve() == pytest.approx(0.5)
+    assert bucket.reserve() == pytest.approx(1.0)
+    assert bucket.backlog() == pytest.approx(1.5)  # backlog() does not take a token
+    clock.sleep(1.0)
+    assert bucket.backlog() == pytest.approx(0.5)
+    bucket.pause(10)
+    assert bucket.backlog() == pytest.approx(10)
+    assert bucket.reserve() == pytest.approx(10)
+    bucket.throttle()
+    assert bucket.rate == 1.0
+    bucket.recover()
+    assert bucket.rate == pytest.approx(1.1)
+
+
+def test_circuit_breaker_half_open_trial(clock):
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=30)
+    breaker.record_failure()
+    assert breaker.allow() and not breaker.is_open
+    breaker.record_failure()
+    assert breaker.is_open and not breaker.allow()
+    clock.sleep(30)
+    assert breaker.allow()  # the one trial call
+    assert not breaker.allow()  # everyone else waits for its outcome
+    breaker.record_failure()
+    assert breaker.is_open and not breaker.allow()
+    clock.sleep(30)
+    assert breaker.allow()
+    breaker.record_success()
+    assert not breaker.is_open and breaker.allow() and breaker.allow()
+
+
+def test_retry_delay_honours_retry_after_up_to_the_limit(clock):
+    limiter = RateLimiter({'dexscreener': (4.0, 4)})
+    checker = EnhancedTokenChecker(mexc_index=MexcSymbolIndex(cache_file=None), cache=None, use_cache=False,
+                                   verbose=False, limiter=limiter, platforms=['dexscreener'])
+    assert checker._retry_delay('dexscreener', 0, 'HTTP 503', retry_after=3) == 3
+    assert 0 <= checker._retry_delay('dexscreener', 2, 'HTTP 503') <= BACKOFF_BASE * 4
+    # A 429 pauses the shared bucket instead of sleeping in the caller
+    assert checker._retry_delay('dexscreener', 0, 'HTTP 429', throttled=True, retry_after=5) == 0.0
+    assert limiter.backlog('dexscreener') == pytest.approx(5)
+    assert limiter.buckets['dexscreener'].rate == 2.0
+    with pytest.raises(PlatformError, match='retry after'):
+        checker._retry_delay('dexscreener', 0, 'HTTP 429', throttled=True, retry_after=MAX_RETRY_AFTER + 1)
+    assert limiter.backlog('dexscreener') == float('inf') and not limiter.allow('dexscreener')
+
+
+def test_retry_delay_gives_up_after_max_retries(clock):
+    limiter = RateLimiter({'dexscreener': (4.0, 4)})
+    checker = EnhancedTokenChecker(mexc_index=MexcSymbolIndex(cache_file=None), cache=None, use_cache=False,
+                                   verbose=False, limiter=limiter, platforms=['dexscreener'])
+    with pytest.raises(PlatformError, match=f'after {MAX_RETRIES + 1} attempts'):
+        checker._retry_delay('dexscreener', MAX_RETRIES, 'HTTP 503')
+    assert limiter.breakers['dexscreener'].failures == 1
+
+
+def test_response_cache_ttl_and_lru_eviction(clock):
+    cache = ResponseCache(max_entries=2, ttl_rules=[('mexc', '/ticker', 30)], default_ttls={'mexc': 300})
+    cache.set('mexc', 'https://API.mexc.com/api/v3/ticker/24hr?b=2&a=1', ['tickers'])
+    cache.set('mexc', 'https://api.mexc.com/api/v3/exchangeInfo', {'symbols': []})
+    assert cache.get('mexc', 'https://api.mexc.com/api/v3/ticker/24hr?a=1&b=2') == (True, ['tickers'])
+    clock.sleep(31)
+    assert cache.get('mexc', 'https://api.mexc.com/api/v3/ticker/24hr?a=1&b=2') == (False, None)
+    assert cache.get('mexc', 'https://api.mexc.com/api/v3/exchangeInfo')[0]
+    cache.set('mexc', 'https://api.mexc.com/one', 1)
+    cache.get('mexc', 'https://api.mexc.com/api/v3/exchangeInfo')  # most recently used
+    cache.set('mexc', 'https://api.mexc.com/two', 2)
+    assert cache.get('mexc', 'https://api.mexc.com/one') == (False, None)
+    assert cache.get('mexc', 'https://api.mexc.com/api/v3/exchangeInfo')[0]
+    assert cache.stats()['evictions'] == 1 and cache.stats()['entries'] == 2
+    cache.set('pumpfun', 'https://frontend-api.pump.fun/coins', [])  # no TTL, never cached
+    assert cache.get('pumpfun', 'https://frontend-api.pump.fun/coins') == (False, None)
+
+
+def test_response_cache_disk_tier_survives_restart(tmp_path, clock):
+    path = str(tmp_path / 'responses.sqlite')
+    cache = ResponseCache(db_path=path, default_ttls={'mexc': 60}, ttl_rules=[])
+    cache.set('mexc', 'https://api.mexc.com/x', {'a': 1})
+    cache.close()
+    reopened = ResponseCache(db_path=path, default_ttls={'mexc': 60}, ttl_rules=[])
+    assert reopened.get('mexc', 'https://api.mexc.com/x') == (True, {'a': 1})
+    assert reopened.stats()['disk_hits'] == 1
+    reopened.close()
+
+
+def test_resolver_merges_records_for_the_same_token():
+    address = '0xABCDEF' + '0' * 34
+    resolver = TokenResolver()
+    first = resolver.add({'platform': 'DexScreener', 'symbol': 'pepe', 'chain': 'ETH', 'address': address,
+                          'liquidity_usd': 100.0, 'listed_on': ['uniswap'], 'url': 'a'}, 'pepe')
+    second = resolver.add({'platform': 'GeckoTerminal', 'name': 'PEPE / WETH', 'chain': 'eth', 'address': 'pool',
+                           'url': 'b'}, 'pepe')
+    third = resolver.add({'platform': 'Birdeye', 'symbol': '$PEPE', 'chain': 'ethereum', 'address': address.lower(),
+                          'liquidity_usd': 999.0, 'holder_count': 5, 'listed_on': ['uniswap', 'sushiswap']}, 'pepe')
+    assert first == third == f'ethereum:{address.lower()}' and second != first
+    entity = next(entity for entity in resolver.entities() if entity['entity_id'] == first)
+    assert entity['symbol'] == 'PEPE'
+    assert entity['liquidity_usd'] == 100.0 and entity['holder_count'] == 5  # first source wins, gaps are filled
+    assert entity['listed_on'] == ['uniswap', 'sushiswap']
+    assert [source['platform'] for source in entity['sources']] == ['DexScreener', 'Birdeye']
+    assert len(resolver.entities()) == 2
+
+
+def test_mexc_lookup_memo_is_bounded(monkeypatch):
+    monkeypatch.setattr(token_checker, 'MEXC_LOOKUP_CACHE_SIZE', 2)
+    index = _mexc_index('PEPE', 'DOGE', 'SHIB')
+    first = index.lookup('pepe')
+    index.lookup('doge')
+    assert index.lookup('pepe') is first  # served from the memo, and now most recently used
+    index.lookup('shib')
+    assert list(index._lookups) == ['pepe', 'shib']
+    index.update({'symbols': []})
+    assert not index._lookups and index.lookup('pepe') == []
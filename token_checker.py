@@ -2,490 +2,3718 @@
 
 
 import requests
-from typing import Dict, List, Optional
+from requests.adapters import HTTPAdapter
+from typing import Dict, List, Optional, Any, Tuple, Iterable, Iterator, AsyncIterator, TextIO
 import time
+import os
 import json
+import csv
+import random
+import sqlite3
+import asyncio
+import argparse
+import threading
+from collections import OrderedDict
+from collections.abc import MutableMapping
+import sys
+import queue
+import heapq
+import itertools
+import bisect
+import functools
+import importlib
+import operator
+import re
+import unicodedata
+from concurrent.futures import ThreadPoolExecutor, as_completed, wait as wait_futures, FIRST_COMPLETED
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+from email.utils import parsedate_to_datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from datetime import datetime
 
+try:
+    import aiohttp
+except ImportError:  # only needed by AsyncTokenChecker
+    aiohttp = None
 
-class EnhancedTokenChecker:
+try:
+    import numpy as np
+except ImportError:  # only needed by RiskScorer
+    np = None
+
+
+USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+
+# Retries of 429, 5xx and connection errors use jittered exponential backoff
+# unless the platform sends Retry-After. A platform that asks for a longer
+# pause, or keeps failing, is skipped until its circuit breaker resets.
+MAX_RETRIES = 3
+BACKOFF_BASE = 0.5
+BACKOFF_MAX = 8.0
+MAX_RETRY_AFTER = 30
+CIRCUIT_FAILURE_THRESHOLD = 5
+CIRCUIT_RESET_TIMEOUT = 60
+
+# Upper bounds in seconds of the latency histogram buckets kept by Metrics
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+# Maximum Birdeye overview requests in flight for one search
+BIRDEYE_OVERVIEW_CONCURRENCY = 4
+
+CACHE_DIR = os.path.join(os.path.expanduser('~'), '.cache', 'token_checker')
+
+# The MEXC symbol list changes rarely, so it is cached on disk for hours
+MEXC_CACHE_FILE = os.path.join(CACHE_DIR, 'mexc_exchange_info.json')
+MEXC_SNAPSHOT_TTL = 6 * 3600
+# Distinct queries whose MEXC matches are remembered between snapshots (LRU)
+MEXC_LOOKUP_CACHE_SIZE = 4096
+
+# Name matching (see TokenMatcher). Candidates scoring MATCH_THRESHOLD or more
+# are kept. TYPO_LIMITS gives the edit distance tolerated for queries up to
+# each length. CONFUSABLES folds homoglyphs and leetspeak digits, applied
+# after NFKC normalization and casefolding.
+MATCH_THRESHOLD = 0.6
+TYPO_LIMITS = ((3, 0), (5, 1), (10 ** 9, 2))
+CONFUSABLES = str.maketrans({
+    # Cyrillic
+    'а': 'a', 'в': 'b', 'е': 'e', 'ё': 'e', 'к': 'k', 'м': 'm', 'н': 'h', 'о': 'o', 'р': 'p', 'с': 'c',
+    'т': 't', 'у': 'y', 'х': 'x', 'ѕ': 's', 'і': 'i', 'ї': 'i', 'ј': 'j', 'ԁ': 'd', 'ɡ': 'g', 'ո': 'n',
+    # Greek
+    'α': 'a', 'β': 'b', 'ε': 'e', 'η': 'n', 'ι': 'i', 'κ': 'k', 'μ': 'u', 'ν': 'v', 'ο': 'o', 'ρ': 'p',
+    'τ': 't', 'υ': 'u', 'χ': 'x', 'ω': 'w',
+    # Latin look-alikes and leetspeak
+    'ı': 'i', 'ł': 'l', 'ø': 'o', 'đ': 'd', 'ß': 'ss', '0': 'o', '1': 'l', '3': 'e', '4': 'a', '5': 's',
+    '7': 't', '@': 'a', '|': 'l',
+})
+_NON_ALNUM = re.compile(r'[\W_]+')
+
+# Response cache lifetimes are declared by each Provider: search results and
+# metadata live for minutes, price snapshots for seconds.
+CACHE_DB_FILE = os.path.join(CACHE_DIR, 'responses.sqlite')
+
+# Local token index: repeat queries younger than the TTL are answered from
+# disk, and stale searches looked up within the refresh window are refreshed
+# in the background.
+TOKEN_INDEX_FILE = os.path.join(CACHE_DIR, 'tokens.sqlite')
+TOKEN_INDEX_TTL = 30 * 60
+TOKEN_INDEX_REFRESH_WINDOW = 24 * 60 * 60
+TOKEN_INDEX_REFRESH_INTERVAL = 60
+
+# Risk scoring (see RiskScorer): weight of each feature in the score, the
+# liquidity/FDV ratio considered healthy and the age below which a token
+# counts as young.
+RISK_WEIGHTS = {
+    'liquidity_vs_fdv': 3.0,
+    'young': 2.0,
+    'volume_spike': 1.5,
+    'few_holders': 1.0,
+    'unlisted': 1.5,
+    'clones': 2.0,
+}
+RISK_HEALTHY_LIQUIDITY_RATIO = 0.10
+RISK_YOUNG_DAYS = 30
+
+# Watch mode: seconds between polls of one token on a platform when its
+# provider declares no watch_interval (unchanged results stretch the interval
+# up to WATCH_MAX_BACKOFF times), and the relative change of each field that
+# counts as worth reporting.
+WATCH_DEFAULT_INTERVAL = 30
+WATCH_MAX_BACKOFF = 8
+WATCH_THRESHOLDS = {
+    'liquidity_usd': 0.10,
+    'price_usd': 0.05,
+    'market_cap': 0.10,
+    'fdv': 0.10,
+    'volume_24h': 0.50,
+    'holder_count': 0.05,
+}
+
+# API server mode (see TokenAPIServer): default port, lookups run at once,
+# how long a request may wait for a free slot, how far upstream rate limits
+# may be backed up before new requests are turned away with 429, and the
+# size and parallelism of POST /batch.
+SERVER_PORT = 8750
+SERVER_MAX_CONCURRENT = 16
+SERVER_SLOT_WAIT = 5
+SERVER_MAX_QUEUE_DELAY = 10
+SERVER_MAX_BATCH = 100
+SERVER_BATCH_WORKERS = 4
+
+# Chain spellings used by the platforms, mapped to one identifier per chain
+CHAIN_ALIASES = {
+    'eth': 'ethereum',
+    'erc20': 'ethereum',
+    'sol': 'solana',
+    'bnb': 'bsc',
+    'binance_smart_chain': 'bsc',
+    'bnb_smart_chain': 'bsc',
+    'polygon_pos': 'polygon',
+    'matic': 'polygon',
+    'arbitrum_one': 'arbitrum',
+    'avax': 'avalanche',
+    'avalanche_c_chain': 'avalanche',
+    'optimistic_ethereum': 'optimism',
+    'op': 'optimism',
+    'trx': 'tron',
+}
+
+# Record fields that TokenResolver tracks separately instead of merging
+RESOLVER_SKIP_FIELDS = {'platform', 'url', 'listed_on', 'chain', 'address', 'symbol', 'match_score'}
+
+
+class Provider:
+    """One platform the checker can search, declared in one place
+    
+    A provider names its API origin and search endpoint, its rate limit
+    (requests per second, burst), its cost (upstream requests one search
+    usually makes, enrichment included), how long its responses are cached,
+    and how each hit in its payload maps onto TokenRecord: `fields` maps a
+    record field to a dotted path into the hit ('liquidity.usd',
+    'quotes.0.price') or to a function of the hit. The engines do all HTTP,
+    caching and rate limiting, so one provider serves both the sync and the
+    async checker.
+    
+    Extra data for the hits (prices, holders) is declared by enrichments(),
+    a list of (url, target) pairs, and merged in by enrich(target, payload).
+    """
+    
+    name = ''
+    label = ''
+    description = ''
+    origin = ''
+    search_url = ''
+    rate_limit: Tuple[float, int] = (1.0, 1)
+    cost = 1
+    cache_ttl: float = 120
+    cache_rules: Tuple[Tuple[str, float], ...] = ()  # (URL fragment, TTL) overriding cache_ttl
+    watch_interval: float = WATCH_DEFAULT_INTERVAL
+    items_path = ''  # where the list of hits sits in a search payload
+    scan_limit: Optional[int] = None  # hits considered per search
+    max_results: Optional[int] = None  # matches kept per search
+    fields: Dict[str, Any] = {}
+    enrich_concurrency = 1
+    enrich_timeout: float = 5
+    listing = False  # search_url returns the whole listing, searched locally (see new_listing)
+    
+    def __init__(self):
+        self._getters = tuple((field, self._getter(spec)) for field, spec in self.fields.items())
+    
+    @staticmethod
+    def _getter(spec: Any):
+        if callable(spec):
+            return spec
+        keys = tuple(int(key) if key.isdigit() else key for key in spec.split('.'))
+        
+        def get(item: Any) -> Any:
+            for key in keys:
+                if isinstance(item, dict):
+                    item = item.get(key)
+                elif isinstance(item, list) and isinstance(key, int) and key < len(item):
+                    item = item[key]
+                else:
+                    return None
+            return item
+        return get
+    
+    def url(self, token_name: str) -> str:
+        return self.search_url.format(query=token_name)
+    
+    def items(self, data: Any) -> List[Dict]:
+        for key in self.items_path.split('.') if self.items_path else ():
+            data = data.get(key) if isinstance(data, dict) else None
+        return data if isinstance(data, list) else []
+    
+    def score(self, matcher: 'TokenMatcher', record: 'TokenRecord') -> float:
+        """How well a hit matches the query: its name or symbol, whichever is closer"""
+        return max(matcher.score(record.name), matcher.score(record.symbol))
+    
+    def parse(self, data: Any, token_name: str) -> List['TokenRecord']:
+        """The hits in a search payload that match token_name, best first"""
+        results = []
+        matcher = TokenMatcher.for_query(token_name)
+        for item in self.items(data)[:self.scan_limit]:
+            record = TokenRecord(platform=self.label, **{field: get(item) for field, get in self._getters})
+            score = self.score(matcher, record)
+            if score >= MATCH_THRESHOLD:
+                record['match_score'] = round(score, 3)
+                results.append(record)
+        # Rank before cutting, so fuzzy hits early in the payload cannot push out a better match
+        return self.rank(results)[:self.max_results]
+    
+    def enrichments(self, results: List['TokenRecord']) -> List[Tuple[str, Any]]:
+        """(url, target) pairs to fetch once the search is parsed"""
+        return []
+    
+    def enrich(self, target: Any, payload: Any):
+        """Merge an enrichment payload into its target (a record or the result list)"""
+    
+    def new_listing(self) -> Any:
+        """Local index of the whole listing, for providers with listing = True"""
+        raise NotImplementedError
+    
+    @staticmethod
+    def rank(results: List['TokenRecord']) -> List['TokenRecord']:
+        """Best matches first, keeping the platform's order among equal scores"""
+        return sorted(results, key=lambda token_info: -(token_info.match_score or 0))
+
+
+class DexScreenerProvider(Provider):
+    name = 'dexscreener'
+    label = 'DexScreener'
+    description = 'Multi-chain'
+    origin = "https://api.dexscreener.com"
+    search_url = "https://api.dexscreener.com/latest/dex/search/?q={query}"
+    rate_limit = (5.0, 5)
+    watch_interval = 10
+    items_path = 'pairs'
+    scan_limit = 10
+    fields = {
+        'name': 'baseToken.name',
+        'symbol': 'baseToken.symbol',
+        'address': 'baseToken.address',
+        'chain': 'chainId',
+        'dex': 'dexId',
+        'price_usd': 'priceUsd',
+        'price_change_24h': 'priceChange.h24',
+        'liquidity_usd': 'liquidity.usd',
+        'volume_24h': 'volume.h24',
+        'fdv': 'fdv',
+        'market_cap': 'marketCap',
+        'pair_created_at': 'pairCreatedAt',
+        'url': 'url',
+        'listed_on': lambda pair: [pair.get('dexId')],
+    }
+
+
+class BirdeyeProvider(Provider):
+    name = 'birdeye'
+    label = 'Birdeye'
+    description = 'Solana'
+    origin = "https://public-api.birdeye.so"
+    search_url = "https://public-api.birdeye.so/public/tokenlist?keyword={query}"
+    overview_url = "https://public-api.birdeye.so/public/token_overview?address={address}"
+    rate_limit = (10.0, 10)
+    cost = 11  # the search plus one overview per hit
+    cache_ttl = 600
+    cache_rules = (('/token_overview', 60),)
+    watch_interval = 15
+    items_path = 'data.tokens'
+    scan_limit = 10
+    fields = {
+        'name': 'name',
+        'symbol': 'symbol',
+        'address': 'address',
+        'chain': lambda token: 'Solana',
+        'decimals': 'decimals',
+        'logo': 'logoURI',
+        'url': lambda token: f"https://birdeye.so/token/{token.get('address')}",
+    }
+    # Birdeye has no bulk overview, so a few per-token calls run at once
+    enrich_concurrency = BIRDEYE_OVERVIEW_CONCURRENCY
+    
+    def enrichments(self, results: List['TokenRecord']) -> List[Tuple[str, Any]]:
+        return [(self.overview_url.format(address=token_info.address), token_info) for token_info in results]
+    
+    def enrich(self, token_info: 'TokenRecord', overview: Dict):
+        meta = overview.get('data', {})
+        token_info.update({
+            'price_usd': meta.get('price'),
+            'liquidity_usd': meta.get('liquidity'),
+            'volume_24h': meta.get('v24hUSD'),
+            'market_cap': meta.get('mc'),
+            'holder_count': meta.get('holder'),
+        })
+
+
+class CoinGeckoProvider(Provider):
+    name = 'coingecko'
+    label = 'CoinGecko'
+    description = 'Market Data'
+    origin = "https://api.coingecko.com"
+    search_url = "https://api.coingecko.com/api/v3/search?query={query}"
+    markets_url = "https://api.coingecko.com/api/v3/coins/markets?vs_currency=usd&ids={ids}"
+    contracts_url = "https://api.coingecko.com/api/v3/coins/list?include_platform=true"
+    rate_limit = (0.5, 5)
+    cost = 2  # the search plus market data for every hit in one request; contract addresses are fetched daily
+    cache_ttl = 1800
+    cache_rules = (('/coins/markets', 60), ('/coins/list', 86400))
+    watch_interval = 60
+    items_path = 'coins'
+    scan_limit = 10
+    fields = {
+        'name': 'name',
+        'symbol': 'symbol',
+        'coingecko_id': 'id',
+        'market_cap_rank': 'market_cap_rank',
+        'url': lambda coin: f"https://www.coingecko.com/en/coins/{coin.get('id')}",
+    }
+    enrich_concurrency = 2
+    
+    def __init__(self):
+        super().__init__()
+        # The last coins/list payload seen and its {id: [(chain, address), ...]} map, rebuilt when the payload changes
+        self._contracts: Tuple[Any, Dict[str, List[Tuple[str, str]]]] = (None, {})
+    
+    def enrichments(self, results: List['TokenRecord']) -> List[Tuple[str, Any]]:
+        ids = [token_info.coingecko_id for token_info in results if token_info.coingecko_id]
+        if not ids:
+            return []
+        return [(self.markets_url.format(ids=','.join(ids)), ('markets', results)),
+                (self.contracts_url, ('contracts', results))]
+    
+    def enrich(self, target: Tuple[str, List['TokenRecord']], payload: List[Dict]):
+        kind, results = target
+        if kind == 'contracts':
+            self._add_contracts(results, payload)
+        else:
+            self._add_markets(results, payload)
+    
+    def _add_contracts(self, results: List['TokenRecord'], coins: List[Dict]):
+        """Give each coin its token contracts; the first one is its chain and contract_address"""
+        payload, contracts = self._contracts
+        if payload is not coins:
+            contracts = {}
+            for coin in coins:
+                pairs = [(normalize_chain(chain), normalize_address(address))
+                         for chain, address in (coin.get('platforms') or {}).items() if chain and address]
+                if pairs:
+                    contracts[coin.get('id')] = pairs
+            self._contracts = (coins, contracts)
+        for token_info in results:
+            pairs = contracts.get(token_info.coingecko_id)
+            if not pairs:
+                continue
+            token_info.update({
+                'chain': pairs[0][0],
+                'contract_address': pairs[0][1],
+                'contract_addresses': [f"{chain}:{address}" for chain, address in pairs],
+            })
+    
+    def _add_markets(self, results: List['TokenRecord'], markets: List[Dict]):
+        by_id = {market.get('id'): market for market in markets}
+        for token_info in results:
+            market = by_id.get(token_info.coingecko_id)
+            if market is None:
+                continue
+            token_info.update({
+                'price_usd': market.get('current_price'),
+                'market_cap': market.get('market_cap'),
+                'volume_24h': market.get('total_volume'),
+                'price_change_24h': market.get('price_change_percentage_24h'),
+                'circulating_supply': market.get('circulating_supply'),
+                'total_supply': market.get('total_supply'),
+                'max_supply': market.get('max_supply'),
+            })
+
+
+class PumpFunProvider(Provider):
+    name = 'pumpfun'
+    label = 'Pump.fun'
+    description = 'Solana Meme Tokens'
+    origin = "https://frontend-api.pump.fun"
+    search_url = "https://frontend-api.pump.fun/coins?searchQuery={query}&limit=10"
+    rate_limit = (5.0, 5)
+    watch_interval = 10
+    fields = {
+        'name': 'name',
+        'symbol': 'symbol',
+        'address': 'mint',
+        'chain': lambda token: 'Solana',
+        'creator': 'creator',
+        'market_cap': 'market_cap',
+        'created_timestamp': 'created_timestamp',
+        'description': 'description',
+        'twitter': 'twitter',
+        'telegram': 'telegram',
+        'website': 'website',
+        'url': lambda token: f"https://pump.fun/{token.get('mint')}",
+    }
+
+
+class MexcProvider(Provider):
+    name = 'mexc'
+    label = 'MEXC'
+    description = 'Exchange'
+    origin = "https://api.mexc.com"
+    search_url = "https://api.mexc.com/api/v3/exchangeInfo"
+    tickers_url = "https://api.mexc.com/api/v3/ticker/24hr"
+    rate_limit = (10.0, 10)
+    cost = 1  # one snapshot of all 24h tickers; the symbol list is kept by MexcSymbolIndex
+    cache_ttl = 30
+    cache_rules = (('/exchangeInfo', 0), ('/ticker/24hr', 30))
+    watch_interval = 15
+    max_results = 5
+    listing = True
+    
+    def new_listing(self) -> 'MexcSymbolIndex':
+        return MexcSymbolIndex()
+    
+    def parse(self, symbols: List[Dict], token_name: str) -> List['TokenRecord']:
+        results = []
+        matcher = TokenMatcher.for_query(token_name)
+        
+        # Symbols come from MexcSymbolIndex.lookup, already matched on base asset
+        for symbol in symbols[:self.max_results]:
+            token_info = TokenRecord(
+                platform=self.label,
+                match_score=round(matcher.score(symbol.get('baseAsset')), 3),
+                symbol=symbol.get('baseAsset'),
+                trading_pair=symbol.get('symbol'),
+                quote_asset=symbol.get('quoteAsset'),
+                status=symbol.get('status'),
+                listed_on=['MEXC'],
+                url=f"https://www.mexc.com/exchange/{symbol.get('symbol')}"
+            )
+            results.append(token_info)
+        return self.rank(results)
+    
+    def enrichments(self, results: List['TokenRecord']) -> List[Tuple[str, Any]]:
+        return [(self.tickers_url, results)] if results else []
+    
+    def enrich(self, results: List['TokenRecord'], tickers: List[Dict]):
+        by_symbol = {ticker.get('symbol'): ticker for ticker in tickers}
+        for token_info in results:
+            price_data = by_symbol.get(token_info.trading_pair)
+            if price_data is None:
+                continue
+            token_info.update({
+                'price_usd': price_data.get('lastPrice'),
+                'price_change_24h': price_data.get('priceChangePercent'),
+                'volume_24h': price_data.get('quoteVolume'),
+            })
+
+
+class CoinMarketCapProvider(Provider):
+    name = 'coinmarketcap'
+    label = 'CoinMarketCap'
+    description = 'Market Data'
+    origin = "https://api.coinmarketcap.com"
+    search_url = "https://api.coinmarketcap.com/data-api/v3/cryptocurrency/listing?start=1&limit=20&search={query}"
+    rate_limit = (2.0, 5)
+    cache_ttl = 300
+    watch_interval = 60
+    items_path = 'data.cryptoCurrencyList'
+    max_results = 5
+    fields = {
+        'name': 'name',
+        'symbol': 'symbol',
+        'cmc_rank': 'cmcRank',
+        'price_usd': 'quotes.0.price',
+        'market_cap': 'quotes.0.marketCap',
+        'volume_24h': 'quotes.0.volume24h',
+        'price_change_24h': 'quotes.0.percentChange24h',
+        'circulating_supply': 'circulatingSupply',
+        'total_supply': 'totalSupply',
+        'max_supply': 'maxSupply',
+        'url': lambda item: f"https://coinmarketcap.com/currencies/{item.get('slug')}",
+    }
+
+
+class GeckoTerminalProvider(Provider):
+    name = 'geckoterminal'
+    label = 'GeckoTerminal'
+    description = 'DEX Data'
+    origin = "https://api.geckoterminal.com"
+    search_url = "https://api.geckoterminal.com/api/v2/search/pools?query={query}"
+    rate_limit = (0.5, 5)
+    watch_interval = 30
+    items_path = 'data'
+    max_results = 5
+    fields = {
+        'name': 'attributes.name',
+        'address': 'attributes.address',
+        'chain': lambda pool: (pool.get('attributes', {}).get('network') or '').upper(),
+        'dex': 'attributes.dex_id',
+        'price_usd': 'attributes.base_token_price_usd',
+        'liquidity_usd': 'attributes.reserve_in_usd',
+        'volume_24h': 'attributes.volume_usd.h24',
+        'price_change_24h': 'attributes.price_change_percentage.h24',
+        'pool_created_at': 'attributes.pool_created_at',
+        'url': lambda pool: (f"https://www.geckoterminal.com/{pool.get('attributes', {}).get('network')}"
+                             f"/pools/{pool.get('attributes', {}).get('address')}"),
+    }
+    
+    def score(self, matcher: 'TokenMatcher', record: 'TokenRecord') -> float:
+        # Pools are named "PEPE / WETH", so the base token is scored on its own too
+        pool_name = record.name or ''
+        return max(matcher.score(pool_name.split(' / ')[0]), matcher.score(pool_name))
+
+
+# Every platform the checker can search, in the order they are searched and
+# reported. register_provider() adds plugins; a provider registered as a
+# "module:Class" string is only imported when a checker first uses it.
+PROVIDERS: Dict[str, Any] = {provider.name: provider for provider in (
+    DexScreenerProvider, BirdeyeProvider, CoinGeckoProvider, PumpFunProvider,
+    MexcProvider, CoinMarketCapProvider, GeckoTerminalProvider,
+)}
+_loaded_providers: Dict[str, Provider] = {}
+_providers_lock = threading.Lock()
+
+
+def register_provider(provider: Any, name: Optional[str] = None):
+    """Add a Provider subclass or instance, or a "module:Class" spec loaded on first use (which needs a name)"""
+    if isinstance(provider, str):
+        if not name:
+            raise ValueError(f"a provider given as {provider!r} needs a name")
+    else:
+        name = name or provider.name
+    with _providers_lock:
+        PROVIDERS[name] = provider
+        _loaded_providers.pop(name, None)
+
+
+def load_provider(name: str) -> Provider:
+    """The provider registered as name, imported and instantiated on first use"""
+    provider = _loaded_providers.get(name)
+    if provider is not None:
+        return provider
+    with _providers_lock:
+        if name not in _loaded_providers:
+            entry = PROVIDERS.get(name)
+            if entry is None:
+                raise ValueError(f"unknown platform {name!r} (known: {', '.join(PROVIDERS)})")
+            if isinstance(entry, str):
+                module_name, _, attribute = entry.partition(':')
+                entry = getattr(importlib.import_module(module_name), attribute)
+            _loaded_providers[name] = entry() if isinstance(entry, type) else entry
+        return _loaded_providers[name]
+
+
+# The built-in providers' declarations as per-platform tables
+PLATFORMS = tuple(PROVIDERS)
+RATE_LIMITS = {name: provider.rate_limit for name, provider in PROVIDERS.items()}
+API_ORIGINS = {name: provider.origin for name, provider in PROVIDERS.items()}
+SEARCH_URLS = {name: provider.search_url for name, provider in PROVIDERS.items()}
+CACHE_TTL_RULES = [(name, fragment, ttl) for name, provider in PROVIDERS.items() for fragment, ttl in provider.cache_rules]
+CACHE_DEFAULT_TTLS = {name: provider.cache_ttl for name, provider in PROVIDERS.items()}
+WATCH_INTERVALS = {name: provider.watch_interval for name, provider in PROVIDERS.items()}
+
+
+class PlatformError(Exception):
+    """A platform kept failing or throttling us, so its results are missing"""
+
+
+class CircuitOpenError(PlatformError):
+    """The platform's circuit breaker is open and calls are being skipped"""
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Seconds to wait from a Retry-After header given as seconds or an HTTP date"""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def backoff_delay(attempt: int) -> float:
+    """Exponential backoff with full jitter for the given zero-based attempt"""
+    return random.uniform(0, min(BACKOFF_MAX, BACKOFF_BASE * 2 ** attempt))
+
+
+class TokenBucket:
+    """Thread-safe token bucket that adapts its rate when the platform throttles us
+    
+    reserve() never blocks: it takes a token and returns how long the caller
+    must wait before using it, so threads sleep and tasks await the delay.
+    """
+    
+    def __init__(self, rate: float, capacity: int):
+        self.base_rate = rate
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+    
+    def reserve(self) -> float:
+        """Take a token and return seconds to wait before sending the request"""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+            return max(wait, self._paused_until - now)
+    
+    def backlog(self, requests: int = 1) -> float:
+        """Seconds until `requests` requests made now could all be sent, without taking tokens"""
+        with self._lock:
+            now = time.monotonic()
+            tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            wait = (requests - tokens) / self.rate if tokens < requests else 0.0
+            return max(wait, self._paused_until - now)
+    
+    def pause(self, seconds: float):
+        """Hold back every caller for the given time, e.g. after a 429"""
+        with self._lock:
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+    
+    def throttle(self):
+        """Halve the rate after being throttled"""
+        with self._lock:
+            self.rate = max(self.base_rate / 16, self.rate / 2)
+    
+    def recover(self):
+        """Creep back towards the configured rate after a success"""
+        if self.rate < self.base_rate:
+            with self._lock:
+                self.rate = min(self.base_rate, self.rate + self.base_rate / 20)
+
+
+class CircuitBreaker:
+    """Stops calling a platform for reset_timeout seconds after repeated failures
+    
+    Once the timeout passes a single trial call is let through; its outcome
+    closes the breaker again or re-opens it.
+    """
+    
+    def __init__(self, failure_threshold: int = CIRCUIT_FAILURE_THRESHOLD, reset_timeout: float = CIRCUIT_RESET_TIMEOUT):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self._open_until = 0.0
+        self._trial_running = False
+        self._lock = threading.Lock()
+    
+    @property
+    def is_open(self) -> bool:
+        return self.failures >= self.failure_threshold and time.monotonic() < self._open_until
+    
+    def allow(self) -> bool:
+        with self._lock:
+            if self.failures < self.failure_threshold:
+                return True
+            if time.monotonic() < self._open_until or self._trial_running:
+                return False
+            self._trial_running = True
+            return True
+    
+    def record_success(self):
+        with self._lock:
+            self.failures = 0
+            self._trial_running = False
+    
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            self._trial_running = False
+            if self.failures >= self.failure_threshold:
+                self._open_until = time.monotonic() + self.reset_timeout
+    
+    def trip(self, seconds: float):
+        """Open immediately, e.g. when the platform asks us to come back much later"""
+        with self._lock:
+            self.failures = max(self.failures, self.failure_threshold)
+            self._trial_running = False
+            self._open_until = time.monotonic() + seconds
+
+
+class RateLimiter:
+    """Per-platform token buckets and circuit breakers
+    
+    One instance is shared process-wide by default (see shared()), so every
+    checker, thread and task stays within the same provider limits.
+    """
+    
+    _shared = None
+    _shared_lock = threading.Lock()
+    
+    def __init__(self, limits: Dict[str, tuple] = RATE_LIMITS):
+        self.buckets = {platform: TokenBucket(rate, capacity) for platform, (rate, capacity) in limits.items()}
+        self.breakers = {platform: CircuitBreaker() for platform in limits}
+        self._lock = threading.Lock()
+    
+    @classmethod
+    def shared(cls) -> 'RateLimiter':
+        with cls._shared_lock:
+            if cls._shared is None:
+                cls._shared = cls()
+            return cls._shared
+    
+    def configure(self, platform: str, rate: float, capacity: int):
+        """Add limits for a platform without any yet, e.g. a provider loaded from a plugin"""
+        with self._lock:
+            if platform not in self.buckets:
+                self.buckets[platform] = TokenBucket(rate, capacity)
+                self.breakers[platform] = CircuitBreaker()
+    
+    def reserve(self, platform: str) -> float:
+        bucket = self.buckets.get(platform)
+        return bucket.reserve() if bucket is not None else 0.0
+    
+    def allow(self, platform: str) -> bool:
+        breaker = self.breakers.get(platform)
+        return breaker is None or breaker.allow()
+    
+    def record_success(self, platform: str):
+        if platform in self.breakers:
+            self.breakers[platform].record_success()
+            self.buckets[platform].recover()
+    
+    def record_failure(self, platform: str):
+        """Count a request that failed for good towards opening the circuit"""
+        if platform in self.breakers:
+            self.breakers[platform].record_failure()
+    
+    def record_throttle(self, platform: str, pause: float):
+        """Slow the platform down and hold every caller back for `pause` seconds"""
+        if platform in self.buckets:
+            bucket = self.buckets[platform]
+            bucket.throttle()
+            bucket.pause(pause)
+    
+    def trip(self, platform: str, seconds: float):
+        if platform in self.breakers:
+            self.breakers[platform].trip(seconds)
+    
+    def backlog(self, platform: str, requests: int = 1) -> float:
+        """Seconds until the platform would let `requests` more requests through; infinite while its circuit is open"""
+        if platform in self.breakers and self.breakers[platform].is_open:
+            return float('inf')
+        bucket = self.buckets.get(platform)
+        return bucket.backlog(requests) if bucket is not None else 0.0
+
+
+class SingleFlight:
+    """Runs one call per key at a time; concurrent callers with the same key share its outcome
+    
+    The first caller for a key runs the function, everyone who asks for the
+    same key while it is in flight waits and gets the same result (or
+    exception). Nothing is kept once the call finishes, so it deduplicates
+    without caching.
+    """
+    
+    def __init__(self):
+        self._calls: Dict[Any, list] = {}
+        self._lock = threading.Lock()
+        self.shared = 0
+    
+    def do(self, key: Any, fn, *args, **kwargs) -> Any:
+        return self.call(key, fn, *args, **kwargs)[0]
+    
+    def call(self, key: Any, fn, *args, **kwargs) -> Tuple[Any, bool]:
+        """Like do(), returning (result, shared) where shared means another caller's run was reused"""
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                # [finished event, result, exception]
+                call = self._calls[key] = [threading.Event(), None, None]
+            else:
+                self.shared += 1
+        done = call[0]
+        if not leader:
+            done.wait()
+        else:
+            try:
+                call[1] = fn(*args, **kwargs)
+            except BaseException as e:
+                call[2] = e
+            finally:
+                with self._lock:
+                    del self._calls[key]
+                done.set()
+        if call[2] is not None:
+            raise call[2]
+        return call[1], not leader
+
+
+class AsyncSingleFlight:
+    """asyncio counterpart of SingleFlight, for use on one event loop
+    
+    The shared call runs as a task of its own, so cancelling any caller -
+    including the one that started it - only stops that caller waiting; the
+    others still get the result.
+    """
+    
     def __init__(self):
+        self._calls: Dict[Any, asyncio.Task] = {}
+        self.shared = 0
+    
+    async def call(self, key: Any, fn, *args, **kwargs) -> Tuple[Any, bool]:
+        task = self._calls.get(key)
+        leader = task is None
+        if leader:
+            task = self._calls[key] = asyncio.ensure_future(fn(*args, **kwargs))
+            task.add_done_callback(lambda done: self._finished(key, done))
+        else:
+            self.shared += 1
+        return await asyncio.shield(task), not leader
+    
+    def _finished(self, key: Any, task: asyncio.Task):
+        if self._calls.get(key) is task:
+            del self._calls[key]
+        if not task.cancelled():
+            task.exception()  # retrieved here, so an exception nobody waited for is not logged
+
+
+class Histogram:
+    """Cumulative-bucket histogram in the Prometheus style (not thread-safe; Metrics locks around it)"""
+    
+    def __init__(self, buckets: Tuple[float, ...] = LATENCY_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+    
+    def observe(self, value: float):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+    
+    def quantile(self, q: float) -> Optional[float]:
+        """Upper bound of the bucket holding the q-th quantile, None when empty or past the last bucket"""
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for bound, count in zip(self.buckets, self.counts):
+            seen += count
+            if seen >= rank:
+                return bound
+        return None
+    
+    def cumulative(self) -> List[Tuple[str, int]]:
+        """(le, count) pairs including +Inf, as Prometheus expects"""
+        pairs = list(zip((f"{bound:g}" for bound in self.buckets), itertools.accumulate(self.counts)))
+        return pairs + [('+Inf', self.count)]
+    
+    def summary(self) -> Dict[str, Any]:
+        return {
+            'count': self.count,
+            'sum': self.sum,
+            'mean': self.sum / self.count if self.count else None,
+            'p50': self.quantile(0.5),
+            'p95': self.quantile(0.95),
+            'p99': self.quantile(0.99),
+        }
+
+
+class Metrics:
+    """Per-platform counters and latency histograms for HTTP calls and searches
+    
+    One instance is shared process-wide by default (see shared()). Read it
+    with snapshot() or render_prometheus(), or expose it with serve_metrics().
+    """
+    
+    _shared = None
+    _shared_lock = threading.Lock()
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.request_latency: Dict[str, Histogram] = {}
+        self.search_latency: Dict[str, Histogram] = {}
+        self.requests: Dict[Tuple[str, str], int] = {}
+        self.response_bytes: Dict[str, int] = {}
+        self.cache: Dict[Tuple[str, str], int] = {}
+        self.coalesced: Dict[str, int] = {}
+        self.search_results: Dict[str, int] = {}
+        self.search_errors: Dict[str, int] = {}
+        self.enrichment_failures: Dict[str, int] = {}
+        self.deadline_misses: Dict[str, int] = {}
+        self.started = time.time()
+    
+    @classmethod
+    def shared(cls) -> 'Metrics':
+        with cls._shared_lock:
+            if cls._shared is None:
+                cls._shared = cls()
+            return cls._shared
+    
+    def observe_request(self, platform: str, status: str, seconds: float, nbytes: int = 0):
+        """Record one HTTP attempt; status is the HTTP code or 'error' for connection failures"""
+        with self._lock:
+            histogram = self.request_latency.get(platform)
+            if histogram is None:
+                histogram = self.request_latency[platform] = Histogram()
+            histogram.observe(seconds)
+            key = (platform, status)
+            self.requests[key] = self.requests.get(key, 0) + 1
+            self.response_bytes[platform] = self.response_bytes.get(platform, 0) + nbytes
+    
+    def observe_cache(self, platform: str, hit: bool):
+        key = (platform, 'hit' if hit else 'miss')
+        with self._lock:
+            self.cache[key] = self.cache.get(key, 0) + 1
+    
+    def count_coalesced(self, platform: str):
+        """Count a request answered by sharing an identical request already in flight"""
+        with self._lock:
+            self.coalesced[platform] = self.coalesced.get(platform, 0) + 1
+    
+    def observe_search(self, platform: str, seconds: float, results: int):
+        with self._lock:
+            histogram = self.search_latency.get(platform)
+            if histogram is None:
+                histogram = self.search_latency[platform] = Histogram()
+            histogram.observe(seconds)
+            self.search_results[platform] = self.search_results.get(platform, 0) + results
+    
+    def count_search_error(self, platform: str):
+        with self._lock:
+            self.search_errors[platform] = self.search_errors.get(platform, 0) + 1
+    
+    def count_enrichment_failure(self, platform: str):
+        with self._lock:
+            self.enrichment_failures[platform] = self.enrichment_failures.get(platform, 0) + 1
+    
+    def count_deadline_miss(self, platform: str):
+        """Count a search left out of a lookup's results because it ran past its deadline"""
+        with self._lock:
+            self.deadline_misses[platform] = self.deadline_misses.get(platform, 0) + 1
+    
+    def snapshot(self) -> Dict[str, Any]:
+        """Plain-dict view of every metric, grouped by platform"""
+        with self._lock:
+            platforms = sorted(set(self.request_latency) | set(self.search_latency) | set(self.search_errors)
+                               | set(self.enrichment_failures) | set(self.coalesced) | set(self.deadline_misses)
+                               | {platform for platform, _ in self.cache})
+            snapshot = {'uptime_seconds': time.time() - self.started, 'platforms': {}}
+            for platform in platforms:
+                snapshot['platforms'][platform] = {
+                    'requests': {status: count for (name, status), count in self.requests.items() if name == platform},
+                    'response_bytes': self.response_bytes.get(platform, 0),
+                    'request_latency': self.request_latency[platform].summary() if platform in self.request_latency else None,
+                    'cache_hits': self.cache.get((platform, 'hit'), 0),
+                    'cache_misses': self.cache.get((platform, 'miss'), 0),
+                    'coalesced_requests': self.coalesced.get(platform, 0),
+                    'search_latency': self.search_latency[platform].summary() if platform in self.search_latency else None,
+                    'search_results': self.search_results.get(platform, 0),
+                    'search_errors': self.search_errors.get(platform, 0),
+                    'enrichment_failures': self.enrichment_failures.get(platform, 0),
+                    'deadline_misses': self.deadline_misses.get(platform, 0),
+                }
+            return snapshot
+    
+    def render_prometheus(self) -> str:
+        """Every metric in the Prometheus text exposition format"""
+        lines = []
+        
+        def family(name: str, kind: str, help_text: str):
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+        
+        def histograms(name: str, help_text: str, by_platform: Dict[str, Histogram]):
+            family(name, 'histogram', help_text)
+            for platform, histogram in sorted(by_platform.items()):
+                for le, count in histogram.cumulative():
+                    lines.append(f'{name}_bucket{{platform="{platform}",le="{le}"}} {count}')
+                lines.append(f'{name}_sum{{platform="{platform}"}} {histogram.sum}')
+                lines.append(f'{name}_count{{platform="{platform}"}} {histogram.count}')
+        
+        def counters(name: str, help_text: str, values: Dict, label: Optional[str] = None):
+            family(name, 'counter', help_text)
+            for key, value in sorted(values.items()):
+                if label is None:
+                    lines.append(f'{name}{{platform="{key}"}} {value}')
+                else:
+                    lines.append(f'{name}{{platform="{key[0]}",{label}="{key[1]}"}} {value}')
+        
+        with self._lock:
+            histograms('token_checker_http_request_duration_seconds', "Time per HTTP attempt, including failed ones.",
+                       self.request_latency)
+            counters('token_checker_http_requests_total', "HTTP attempts by status code ('error' = no response).",
+                     self.requests, 'status')
+            counters('token_checker_http_response_bytes_total', "Response body bytes downloaded.", self.response_bytes)
+            counters('token_checker_cache_lookups_total', "Response cache lookups by result.", self.cache, 'result')
+            counters('token_checker_http_coalesced_total', "Requests that shared an identical request already in flight.",
+                     self.coalesced)
+            histograms('token_checker_search_duration_seconds', "Time per platform search, enrichment included.",
+                       self.search_latency)
+            counters('token_checker_search_results_total', "Records returned by platform searches.", self.search_results)
+            counters('token_checker_search_errors_total', "Platform searches that failed and returned nothing.",
+                     self.search_errors)
+            counters('token_checker_enrichment_failures_total', "Enrichment calls that failed, leaving records unenriched.",
+                     self.enrichment_failures)
+            counters('token_checker_search_deadline_misses_total', "Searches left out of a lookup for running past their deadline.",
+                     self.deadline_misses)
+        return '\n'.join(lines) + '\n'
+
+
+def serve_metrics(port: int, metrics: Optional[Metrics] = None, host: str = '127.0.0.1') -> ThreadingHTTPServer:
+    """Serve metrics in Prometheus text format at /metrics (JSON at /metrics.json) from a daemon thread"""
+    metrics = metrics if metrics is not None else Metrics.shared()
+    
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            path = urlsplit(self.path).path
+            if path == '/metrics':
+                body, content_type = metrics.render_prometheus().encode(), 'text/plain; version=0.0.4'
+            elif path == '/metrics.json':
+                body, content_type = json.dumps(metrics.snapshot()).encode(), 'application/json'
+            else:
+                self.send_error(404)
+                return
+            self.send_response(200)
+            self.send_header('Content-Type', content_type)
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        
+        def log_message(self, *args):
+            pass
+    
+    server = ThreadingHTTPServer((host, port), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def instrumented(method):
+    """Decorate a search_provider method (sync or async) to record each search's latency and result count"""
+    if asyncio.iscoroutinefunction(method):
+        @functools.wraps(method)
+        async def wrapper(self, platform: str, token_name: str):
+            started = time.perf_counter()
+            results = await method(self, platform, token_name)
+            self.metrics.observe_search(platform, time.perf_counter() - started, len(results))
+            return results
+    else:
+        @functools.wraps(method)
+        def wrapper(self, platform: str, token_name: str):
+            started = time.perf_counter()
+            results = method(self, platform, token_name)
+            self.metrics.observe_search(platform, time.perf_counter() - started, len(results))
+            return results
+    return wrapper
+
+
+class ResponseCache:
+    """Two-tier cache of decoded JSON responses keyed by platform and normalized URL
+    
+    The first tier is an in-memory LRU of max_entries responses; the optional
+    second tier is a SQLite database at db_path that survives restarts. Each
+    entry expires after the TTL of the first matching rule in ttl_rules, or
+    the platform's default TTL.
+    """
+    
+    def __init__(self, max_entries: int = 1024, db_path: Optional[str] = None,
+                 ttl_rules: List[tuple] = CACHE_TTL_RULES, default_ttls: Dict[str, float] = CACHE_DEFAULT_TTLS):
+        self.max_entries = max_entries
+        self.db_path = db_path
+        self.ttl_rules = list(ttl_rules)
+        self.default_ttls = dict(default_ttls)
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+        self._db = None
+        if db_path:
+            os.makedirs(os.path.dirname(db_path) or '.', exist_ok=True)
+            self._db = sqlite3.connect(db_path, check_same_thread=False)
+            self._db.execute("CREATE TABLE IF NOT EXISTS responses (key TEXT PRIMARY KEY, expires_at REAL, body TEXT)")
+            self._db.execute("DELETE FROM responses WHERE expires_at < ?", (time.time(),))
+            self._db.commit()
+    
+    @staticmethod
+    def normalize_url(url: str) -> str:
+        """Lowercase scheme and host and sort query parameters so equivalent URLs share a key"""
+        parts = urlsplit(url.strip())
+        query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+        return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), parts.path, query, ''))
+    
+    def configure(self, platform: str, ttl: float, rules: Iterable[Tuple[str, float]] = ()):
+        """Add TTLs for a platform without any yet, e.g. a provider loaded from a plugin"""
+        if platform not in self.default_ttls:
+            self.ttl_rules.extend((platform, fragment, rule_ttl) for fragment, rule_ttl in rules)
+            self.default_ttls[platform] = ttl
+    
+    def ttl_for(self, platform: str, url: str) -> float:
+        for rule_platform, path_fragment, ttl in self.ttl_rules:
+            if rule_platform == platform and path_fragment in url:
+                return ttl
+        return self.default_ttls.get(platform, 0)
+    
+    def get(self, platform: str, url: str) -> Tuple[bool, Any]:
+        """Return (True, data) on a fresh hit, else (False, None)"""
+        key = f"{platform} {self.normalize_url(url)}"
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if entry[0] > now:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return True, entry[1]
+                del self._entries[key]
+            
+            if self._db is not None:
+                row = self._db.execute("SELECT expires_at, body FROM responses WHERE key = ?", (key,)).fetchone()
+                if row is not None and row[0] > now:
+                    data = json.loads(row[1])
+                    self._remember(key, row[0], data)
+                    self.hits += 1
+                    self.disk_hits += 1
+                    return True, data
+            
+            self.misses += 1
+            return False, None
+    
+    def set(self, platform: str, url: str, data: Any):
+        ttl = self.ttl_for(platform, url)
+        if ttl <= 0:
+            return
+        key = f"{platform} {self.normalize_url(url)}"
+        expires_at = time.time() + ttl
+        with self._lock:
+            self._remember(key, expires_at, data)
+            if self._db is not None:
+                self._db.execute("INSERT OR REPLACE INTO responses VALUES (?, ?, ?)", (key, expires_at, json.dumps(data)))
+                self._db.commit()
+    
+    def _remember(self, key: str, expires_at: float, data: Any):
+        self._entries[key] = (expires_at, data)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+    
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            if self._db is not None:
+                self._db.execute("DELETE FROM responses")
+                self._db.commit()
+    
+    def stats(self) -> Dict[str, int]:
+        return {
+            'hits': self.hits,
+            'disk_hits': self.disk_hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'entries': len(self._entries),
+        }
+    
+    def close(self):
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+
+
+def _fold_text(text: str) -> str:
+    """NFKC-normalize, casefold and strip accents, so 'Ｐｅｐé' and 'pepe' compare equal"""
+    text = unicodedata.normalize('NFKD', unicodedata.normalize('NFKC', text).casefold())
+    return ''.join(ch for ch in text if not unicodedata.combining(ch))
+
+
+def skeleton(text: Optional[str]) -> str:
+    """Look-alike-insensitive form of a name: folded, confusables mapped, only letters and digits kept
+    
+    Names with no letters or digits at all (emoji) keep their folded text,
+    minus whitespace, so they can still be matched.
+    """
+    if not text:
+        return ''
+    folded = _fold_text(text).strip().lstrip('$')
+    return _NON_ALNUM.sub('', folded.translate(CONFUSABLES)) or ''.join(folded.split())
+
+
+def bounded_edit_distance(a: str, b: str, limit: int) -> Optional[int]:
+    """Optimal string alignment distance (edits plus adjacent swaps), or None if above limit"""
+    if abs(len(a) - len(b)) > limit:
+        return None
+    if a == b:
+        return 0
+    previous2: List[int] = []
+    previous = list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        current = [i] + [0] * len(b)
+        best = current[0]
+        for j in range(1, len(b) + 1):
+            cost = 0 if a[i - 1] == b[j - 1] else 1
+            value = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost)
+            if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                value = min(value, previous2[j - 2] + 1)
+            current[j] = value
+            best = min(best, value)
+        if best > limit:
+            return None
+        previous2, previous = previous, current
+    distance = previous[-1]
+    return distance if distance <= limit else None
+
+
+def typo_limit(length: int) -> int:
+    """Edits tolerated for a query of this length; short names get none, or everything would match"""
+    for max_length, limit in TYPO_LIMITS:
+        if length <= max_length:
+            return limit
+    return TYPO_LIMITS[-1][1]
+
+
+def deletions(text: str, depth: int) -> set:
+    """text and every string left by deleting up to depth of its characters
+    
+    Two strings within depth edits (or adjacent swaps) of each other share a
+    deletion variant, so indexing these finds typo candidates by lookup.
+    """
+    variants = {text}
+    frontier = {text}
+    for _ in range(depth):
+        frontier = {word[:i] + word[i + 1:] for word in frontier for i in range(len(word))}
+        variants |= frontier
+    return variants
+
+
+def trigrams(text: str) -> set:
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+class TokenMatcher:
+    """Scores candidate names against one query, normalized once
+    
+    score() ranks a candidate from 0 to 1:
+    
+    * 1.0   same name ignoring case and a leading '$'
+    * 0.95  same skeleton, i.e. a homoglyph or leetspeak look-alike ('PEPΕ', 'P3PE')
+    * 0.7+  contains the query ('PEPE2', 'Pepe Inu'), higher the closer in length
+    * 0.6+  within typo_limit() edits of the query, as a whole or one word ('Pepo')
+    * <0.6  trigram similarity only, below MATCH_THRESHOLD
+    """
+    
+    def __init__(self, query: str):
+        self.query = query
+        self.plain = _fold_text(query).strip().lstrip('$')
+        self.skeleton = skeleton(query)
+        self.limit = typo_limit(len(self.skeleton))
+        self.trigrams = trigrams(self.skeleton)
+    
+    @classmethod
+    @functools.lru_cache(maxsize=1024)
+    def for_query(cls, query: str) -> 'TokenMatcher':
+        """Shared matcher for a query, so repeated parses and lookups normalize it only once"""
+        return cls(query)
+    
+    def score(self, candidate: Optional[str]) -> float:
+        if not candidate:
+            return 0.0
+        if self.plain and _fold_text(candidate).strip().lstrip('$') == self.plain:
+            return 1.0
+        if not self.skeleton:
+            return 0.0
+        return self.score_skeleton(skeleton(candidate), candidate)
+    
+    def score_skeleton(self, candidate_skeleton: str, candidate: Optional[str] = None) -> float:
+        """Score from the candidate's precomputed skeleton (plus the original, to try its words)"""
+        query = self.skeleton
+        if not candidate_skeleton:
+            return 0.0
+        if candidate_skeleton == query:
+            return 0.95
+        if query in candidate_skeleton:
+            return 0.7 + 0.2 * len(query) / len(candidate_skeleton)
+        if self.limit:
+            words = [candidate_skeleton]
+            if candidate is not None and len(candidate.split()) > 1:
+                words += [skeleton(word) for word in candidate.split()]
+            distances = [d for d in (bounded_edit_distance(query, word, self.limit) for word in words) if d is not None]
+            if distances:
+                return MATCH_THRESHOLD + 0.15 * (1 - min(distances) / (self.limit + 1))
+        if not self.trigrams:
+            return 0.0
+        other = trigrams(candidate_skeleton)
+        return 0.5 * 2 * len(self.trigrams & other) / (len(self.trigrams) + len(other))
+    
+    def matches(self, candidate: Optional[str]) -> bool:
+        return self.score(candidate) >= MATCH_THRESHOLD
+
+
+class MexcSymbolIndex:
+    """Cached, indexed snapshot of the MEXC exchangeInfo symbol list
+    
+    The multi-megabyte exchangeInfo payload is reduced to the few fields the
+    checker uses, kept in memory and persisted to cache_file. Symbols are
+    indexed by the skeleton of their base asset (see TokenMatcher), with a
+    trigram index for substring candidates and a deletion-variant index for
+    typo candidates, so a lookup only scores the handful of base assets that
+    can contain or be a near-miss of the query.
+    """
+    
+    def __init__(self, cache_file: Optional[str] = MEXC_CACHE_FILE, ttl: float = MEXC_SNAPSHOT_TTL):
+        self.cache_file = cache_file
+        self.ttl = ttl
+        self.fetched_at = 0.0
+        self._symbols: List[Dict] = []
+        self._by_base: Dict[str, List[int]] = {}
+        self._grams: Dict[str, set] = {}
+        self._deletes: Dict[str, set] = {}
+        self._lookups: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+        self._refreshing = False
+        if cache_file:
+            self._load()
+    
+    @property
+    def is_empty(self) -> bool:
+        return not self._symbols
+    
+    @property
+    def is_stale(self) -> bool:
+        return time.time() - self.fetched_at > self.ttl
+    
+    def begin_refresh(self) -> bool:
+        """Claim the background refresh; False if one is already running"""
+        with self._lock:
+            if self._refreshing:
+                return False
+            self._refreshing = True
+            return True
+    
+    def end_refresh(self):
+        with self._lock:
+            self._refreshing = False
+    
+    def update(self, exchange_info: Dict):
+        """Replace the snapshot with a freshly downloaded exchangeInfo payload"""
+        symbols = [
+            {key: symbol.get(key) for key in ('symbol', 'baseAsset', 'quoteAsset', 'status')}
+            for symbol in exchange_info.get('symbols', [])
+        ]
+        self._build(symbols, time.time())
+        if self.cache_file:
+            self._save()
+    
+    def lookup(self, query: str) -> List[Dict]:
+        """Symbols whose base asset matches query (see TokenMatcher), best match first, then in exchange order"""
+        key = query.strip().casefold()
+        with self._lock:
+            symbols, by_base, grams, deletes, lookups = (self._symbols, self._by_base, self._grams,
+                                                         self._deletes, self._lookups)
+            cached = lookups.get(key)
+            if cached is not None:
+                lookups.move_to_end(key)
+                return cached
+        
+        matcher = TokenMatcher.for_query(query)
+        target = matcher.skeleton
+        query_grams = matcher.trigrams
+        if query_grams:
+            candidates = {base for base in set.intersection(*(grams.get(gram, set()) for gram in query_grams))
+                          if target in base}
+        else:
+            candidates = {base for base in by_base if target and target in base}
+        
+        limit = matcher.limit
+        if limit:
+            near = set()
+            for variant in deletions(target, limit):
+                near.update(deletes.get(variant, ()))
+            candidates.update(base for base in near - candidates if bounded_edit_distance(target, base, limit) is not None)
+        
+        scored = []
+        for base in candidates:
+            for i in by_base[base]:
+                score = matcher.score(symbols[i].get('baseAsset'))
+                if score >= MATCH_THRESHOLD:
+                    scored.append((-score, i))
+        result = [symbols[i] for _, i in sorted(scored)]
+        with self._lock:
+            # A snapshot swapped in meanwhile starts a fresh memo; don't seed it with old matches
+            if lookups is self._lookups:
+                lookups[key] = result
+                while len(lookups) > MEXC_LOOKUP_CACHE_SIZE:
+                    lookups.popitem(last=False)
+        return result
+    
+    def _build(self, symbols: List[Dict], fetched_at: float):
+        by_base: Dict[str, List[int]] = {}
+        for i, symbol in enumerate(symbols):
+            by_base.setdefault(skeleton(symbol.get('baseAsset')), []).append(i)
+        grams: Dict[str, set] = {}
+        deletes: Dict[str, set] = {}
+        max_typos = TYPO_LIMITS[-1][1]
+        for base in by_base:
+            for gram in trigrams(base):
+                grams.setdefault(gram, set()).add(base)
+            for variant in deletions(base, max_typos):
+                deletes.setdefault(variant, set()).add(base)
+        # Swap everything in at once so concurrent lookups see a consistent snapshot
+        with self._lock:
+            self._symbols, self._by_base, self._grams, self._deletes = symbols, by_base, grams, deletes
+            self._lookups = OrderedDict()
+            self.fetched_at = fetched_at
+    
+    def _load(self):
+        try:
+            with open(self.cache_file) as f:
+                cached = json.load(f)
+            self._build(cached['symbols'], cached['fetched_at'])
+        except (OSError, ValueError, KeyError):
+            pass
+    
+    def _save(self):
+        try:
+            os.makedirs(os.path.dirname(self.cache_file) or '.', exist_ok=True)
+            tmp_file = f"{self.cache_file}.tmp"
+            with open(tmp_file, 'w') as f:
+                json.dump({'fetched_at': self.fetched_at, 'symbols': self._symbols}, f)
+            os.replace(tmp_file, self.cache_file)
+        except OSError as e:
+            print(f"⚠️  Could not write MEXC cache: {str(e)}", file=sys.stderr)
+
+
+class TokenRecord(MutableMapping):
+    """One normalized search hit from any platform
+    
+    Every value a platform can return has a typed slot, so records carry no
+    per-instance __dict__ and are much smaller than the old free-form dicts.
+    Prices, volumes and supplies are coerced to float (MEXC, DexScreener and
+    GeckoTerminal send them as strings) and counts to int. Records still
+    behave as a read/write mapping of their non-None fields, so
+    record['price_usd'], record.get(...), record.items() and dict(record)
+    keep working.
+    """
+    
+    platform: Optional[str]
+    match_score: Optional[float]
+    name: Optional[str]
+    symbol: Optional[str]
+    address: Optional[str]
+    chain: Optional[str]
+    dex: Optional[str]
+    price_usd: Optional[float]
+    price_change_24h: Optional[float]
+    liquidity_usd: Optional[float]
+    volume_24h: Optional[float]
+    fdv: Optional[float]
+    market_cap: Optional[float]
+    market_cap_rank: Optional[int]
+    cmc_rank: Optional[int]
+    holder_count: Optional[int]
+    decimals: Optional[int]
+    circulating_supply: Optional[float]
+    total_supply: Optional[float]
+    max_supply: Optional[float]
+    pair_created_at: Optional[int]
+    pool_created_at: Optional[str]
+    created_timestamp: Optional[int]
+    coingecko_id: Optional[str]
+    contract_address: Optional[str]
+    contract_addresses: Optional[List[str]]  # 'chain:address' of every contract a tracker lists for the coin
+    trading_pair: Optional[str]
+    quote_asset: Optional[str]
+    status: Optional[str]
+    creator: Optional[str]
+    description: Optional[str]
+    twitter: Optional[str]
+    telegram: Optional[str]
+    website: Optional[str]
+    logo: Optional[str]
+    url: Optional[str]
+    listed_on: Optional[List[str]]
+    
+    FIELDS = (
+        'platform', 'match_score', 'name', 'symbol', 'address', 'chain', 'dex',
+        'price_usd', 'price_change_24h', 'liquidity_usd', 'volume_24h', 'fdv', 'market_cap',
+        'market_cap_rank', 'cmc_rank', 'holder_count', 'decimals',
+        'circulating_supply', 'total_supply', 'max_supply',
+        'pair_created_at', 'pool_created_at', 'created_timestamp',
+        'coingecko_id', 'contract_address', 'contract_addresses', 'trading_pair', 'quote_asset', 'status',
+        'creator', 'description', 'twitter', 'telegram', 'website', 'logo', 'url', 'listed_on',
+    )
+    FLOAT_FIELDS = frozenset({
+        'match_score', 'price_usd', 'price_change_24h', 'liquidity_usd', 'volume_24h', 'fdv', 'market_cap',
+        'circulating_supply', 'total_supply', 'max_supply',
+    })
+    INT_FIELDS = frozenset({
+        'market_cap_rank', 'cmc_rank', 'holder_count', 'decimals', 'pair_created_at', 'created_timestamp',
+    })
+    __slots__ = FIELDS
+    
+    def __init__(self, **fields):
+        for field in self.FIELDS:
+            object.__setattr__(self, field, None)
+        for field, value in fields.items():
+            self[field] = value
+    
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'TokenRecord':
+        """Build a record from a dict such as a JSON line written by to_dict()"""
+        return cls(**{field: value for field, value in data.items() if field in cls.__slots__})
+    
+    def to_dict(self) -> Dict:
+        """The non-None fields as a plain, JSON-serialisable dict"""
+        return {field: getattr(self, field) for field in self}
+    
+    def to_json(self) -> str:
+        return json.dumps(self.to_dict())
+    
+    @classmethod
+    def coerce(cls, field: str, value: Any) -> Any:
+        if value is None or value == '':
+            return None
+        try:
+            if field in cls.FLOAT_FIELDS:
+                return float(value)
+            if field in cls.INT_FIELDS:
+                return int(float(value))
+        except (TypeError, ValueError):
+            return None
+        return value
+    
+    def __getitem__(self, field: str) -> Any:
+        value = getattr(self, field, None) if field in self.__slots__ else None
+        if value is None:
+            raise KeyError(field)
+        return value
+    
+    def __setitem__(self, field: str, value: Any):
+        if field not in self.__slots__:
+            raise KeyError(f"TokenRecord has no field {field!r}")
+        object.__setattr__(self, field, self.coerce(field, value))
+    
+    def __delitem__(self, field: str):
+        self[field]  # raise KeyError if unset
+        object.__setattr__(self, field, None)
+    
+    def __iter__(self) -> Iterator[str]:
+        return (field for field in self.FIELDS if getattr(self, field) is not None)
+    
+    def __len__(self) -> int:
+        return sum(1 for field in self.FIELDS if getattr(self, field) is not None)
+    
+    def __repr__(self) -> str:
+        return f"TokenRecord({', '.join(f'{field}={value!r}' for field, value in self.items())})"
+
+
+class SearchResults(list):
+    """One platform's records for a search, plus why the search failed if it did
+    
+    It is the plain list of TokenRecords callers always got, so an empty list
+    still means nothing was returned; error is None when the platform
+    answered (with or without matches) and says what went wrong when it
+    could not be searched, so a failure is never mistaken for "no hits".
+    """
+    
+    def __init__(self, records: Iterable[TokenRecord] = (), error: Optional[str] = None):
+        super().__init__(records)
+        self.error = error
+
+
+def platform_errors(results: Dict[str, List[TokenRecord]]) -> Dict[str, str]:
+    """{platform: error} for the platforms in a search_all result that could not be searched"""
+    return {platform: records.error for platform, records in results.items() if getattr(records, 'error', None)}
+
+
+def json_default(obj: Any) -> Any:
+    """json.dump hook that serialises TokenRecord objects"""
+    if isinstance(obj, TokenRecord):
+        return obj.to_dict()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+# Display formatting, worked out once per field instead of once per printed value
+DISPLAY_MONEY_FIELDS = frozenset({'liquidity_usd', 'volume_24h', 'market_cap', 'fdv'})
+DISPLAY_SUPPLY_FIELDS = frozenset({'supply', 'circulating_supply', 'total_supply', 'max_supply'})
+DISPLAY_TIMESTAMP_FIELDS = frozenset({'pair_created_at', 'pool_created_at', 'created_timestamp'})
+DESCRIPTION_PREVIEW = 150
+
+
+def _format_money(value: Any) -> str:
+    return f"${value:,.2f}" if isinstance(value, (int, float)) and value > 1000 else str(value)
+
+
+def _format_supply(value: Any) -> str:
+    return f"{value:,.0f}" if isinstance(value, (int, float)) and value > 1000 else str(value)
+
+
+def _format_count(value: Any) -> str:
+    return f"{value:,}" if isinstance(value, int) and value > 1000 else str(value)
+
+
+def _format_price(value: Any) -> str:
+    # Show small prices in full rather than as 1e-05
+    return f"{value:.12f}".rstrip('0').rstrip('.') if isinstance(value, float) else str(value)
+
+
+def _format_timestamp(value: Any) -> str:
+    """Seconds or milliseconds since the epoch as local time; anything else as given"""
+    if not isinstance(value, (int, float)):
+        return str(value)
+    try:
+        return datetime.fromtimestamp(value / 1000 if value > 10000000000 else value).strftime("%Y-%m-%d %H:%M:%S")
+    except (OverflowError, OSError, ValueError):
+        return str(value)
+
+
+def _format_list(value: Any) -> str:
+    return ', '.join(str(v) for v in value if v) if isinstance(value, list) else str(value)
+
+
+def _field_formatter(field: str):
+    if field in DISPLAY_MONEY_FIELDS:
+        return _format_money
+    if field in DISPLAY_SUPPLY_FIELDS:
+        return _format_supply
+    if field == 'holder_count':
+        return _format_count
+    if field == 'price_usd':
+        return _format_price
+    if field in DISPLAY_TIMESTAMP_FIELDS:
+        return _format_timestamp
+    if field in ('listed_on', 'contract_addresses'):
+        return _format_list
+    return str
+
+
+FIELD_LABELS = {field: field.replace('_', ' ').title() for field in TokenRecord.FIELDS}
+FIELD_FORMATTERS = {field: _field_formatter(field) for field in TokenRecord.FIELDS}
+
+
+def _compact_number(value: Optional[float], prefix: str = '') -> str:
+    """1234567 -> 1.23M, for narrow table columns"""
+    if value is None:
+        return ''
+    for scale, suffix in ((1e12, 'T'), (1e9, 'B'), (1e6, 'M'), (1e3, 'K')):
+        if abs(value) >= scale:
+            return f"{prefix}{value / scale:.2f}{suffix}"
+    return f"{prefix}{value:,.2f}" if isinstance(value, float) else f"{prefix}{value}"
+
+
+def _compact_price(value: Optional[float]) -> str:
+    if value is None:
+        return ''
+    return f"${value:.4g}" if value < 1 else _compact_number(value, '$')
+
+
+class ResultRenderer:
+    """Writes search results to a text stream, one platform's records at a time
+    
+    Each call to render() formats its whole block into one string and writes
+    it with a single call, so large result sets are not slowed down by one
+    print() per field. The stream defaults to whatever sys.stdout is at
+    write time.
+    """
+    
+    name = ''
+    decorated = True  # whether the interactive summary and tips are printed around the records
+    
+    def __init__(self, stream: Optional[TextIO] = None):
+        self._stream = stream
+    
+    @property
+    def stream(self) -> TextIO:
+        return self._stream or sys.stdout
+    
+    def start(self):
+        """Begin a new report, e.g. write a header row"""
+    
+    def render(self, platform: str, tokens: List[TokenRecord], query: Optional[str] = None):
+        if tokens:
+            self.stream.write(''.join(self.lines(platform, tokens, query)))
+    
+    def lines(self, platform: str, tokens: List[TokenRecord], query: Optional[str]) -> Iterator[str]:
+        raise NotImplementedError
+    
+    def flush(self):
+        self.stream.flush()
+
+
+class TextRenderer(ResultRenderer):
+    """The interactive layout: a heading per platform, then one labelled line per field"""
+    
+    name = 'text'
+    # (field, line prefix, formatter) for every field shown as a labelled line
+    ROWS = tuple((field, f"    {FIELD_LABELS[field]}: ", FIELD_FORMATTERS[field])
+                 for field in TokenRecord.FIELDS if field != 'description')
+    
+    def lines(self, platform: str, tokens: List[TokenRecord], query: Optional[str]) -> Iterator[str]:
+        rule = '─' * 60
+        heading = f" for {query!r}" if query else ''
+        yield f"\n{rule}\n🔹 {platform.upper()} ({len(tokens)} results){heading}\n{rule}\n"
+        for i, token in enumerate(tokens, 1):
+            yield f"\n  #{i}\n"
+            for field, prefix, formatter in self.ROWS:
+                value = getattr(token, field)
+                if value is not None:
+                    yield f"{prefix}{formatter(value)}\n"
+            desc = token.description
+            if desc:
+                if len(desc) > DESCRIPTION_PREVIEW:
+                    desc = desc[:DESCRIPTION_PREVIEW] + "..."
+                yield f"    Description: {desc}\n"
+
+
+class TableRenderer(ResultRenderer):
+    """One fixed-width row per record, with the header written once per report"""
+    
+    name = 'table'
+    # (heading, width, value for a record); the address column is last and never cut
+    COLUMNS = (
+        ('PLATFORM', 13, lambda record: record.platform or ''),
+        ('SYMBOL', 10, lambda record: record.symbol or ''),
+        ('NAME', 22, lambda record: record.name or ''),
+        ('CHAIN', 10, lambda record: record.chain or ''),
+        ('PRICE', 11, lambda record: _compact_price(record.price_usd)),
+        ('LIQUIDITY', 10, lambda record: _compact_number(record.liquidity_usd, '$')),
+        ('VOL 24H', 10, lambda record: _compact_number(record.volume_24h, '$')),
+        ('MCAP', 10, lambda record: _compact_number(record.market_cap if record.market_cap is not None else record.fdv, '$')),
+        ('HOLDERS', 8, lambda record: _compact_number(record.holder_count)),
+        ('SCORE', 5, lambda record: f"{record.match_score:.2f}" if record.match_score is not None else ''),
+        ('ADDRESS', 0, lambda record: record.address or record.contract_address or record.trading_pair or ''),
+    )
+    QUERY_WIDTH = 16
+    
+    def __init__(self, stream: Optional[TextIO] = None, show_query: bool = False):
+        super().__init__(stream)
+        self.show_query = show_query
+    
+    def start(self):
+        header = ' '.join(f"{heading:<{width}}" for heading, width, _ in self.COLUMNS).rstrip()
+        if self.show_query:
+            header = f"{'QUERY':<{self.QUERY_WIDTH}} {header}"
+        self.stream.write(f"{header}\n")
+    
+    def lines(self, platform: str, tokens: List[TokenRecord], query: Optional[str]) -> Iterator[str]:
+        prefix = f"{(query or '')[:self.QUERY_WIDTH]:<{self.QUERY_WIDTH}} " if self.show_query else ''
+        for token in tokens:
+            cells = []
+            for _, width, value in self.COLUMNS:
+                text = value(token)
+                cells.append(f"{text[:width]:<{width}}" if width else text)
+            yield f"{prefix}{' '.join(cells)}\n"
+
+
+class CsvRenderer(ResultRenderer):
+    """Every record field as a CSV row, tagged with the query and platform key"""
+    
+    name = 'csv'
+    decorated = False
+    VALUES = operator.attrgetter(*TokenRecord.FIELDS)
+    
+    def __init__(self, stream: Optional[TextIO] = None):
+        super().__init__(stream)
+        self._writer = None
+    
+    def start(self):
+        self._writer = csv.writer(self.stream)
+        self._writer.writerow(('query', 'source') + TokenRecord.FIELDS)
+    
+    def render(self, platform: str, tokens: List[TokenRecord], query: Optional[str] = None):
+        if self._writer is None:
+            self.start()
+        self._writer.writerows((query or '', platform) + tuple(map(self._cell, self.VALUES(token)))
+                               for token in tokens)
+    
+    @staticmethod
+    def _cell(value: Any) -> Any:
+        if value is None:
+            return ''
+        return ';'.join(map(str, value)) if isinstance(value, list) else value
+
+
+RENDERERS = {renderer.name: renderer for renderer in (TextRenderer, TableRenderer, CsvRenderer)}
+
+
+class TokenIndex:
+    """Persistent SQLite store of every record the searches return
+    
+    Records are kept per platform, keyed by their URL or resolved identity and
+    indexed by name, symbol, chain and address. Each (query, platform) search
+    remembers which records it returned, so a repeated query is answered from
+    disk while it is younger than ttl. Names and symbols are also indexed for
+    trigram full-text search (FTS5; plain LIKE where SQLite lacks it), which
+    serves fuzzy lookups and offline mode.
+    """
+    
+    def __init__(self, db_path: str = TOKEN_INDEX_FILE, ttl: float = TOKEN_INDEX_TTL):
+        self.db_path = db_path
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        if db_path != ':memory:':
+            os.makedirs(os.path.dirname(db_path) or '.', exist_ok=True)
+        self._db = sqlite3.connect(db_path, check_same_thread=False)
+        self._db.executescript("""
+            CREATE TABLE IF NOT EXISTS tokens (
+                id INTEGER PRIMARY KEY, platform TEXT NOT NULL, key TEXT NOT NULL,
+                name TEXT, symbol TEXT, chain TEXT, address TEXT, record TEXT NOT NULL, updated REAL NOT NULL,
+                UNIQUE (platform, key));
+            CREATE INDEX IF NOT EXISTS tokens_name ON tokens (name COLLATE NOCASE);
+            CREATE INDEX IF NOT EXISTS tokens_symbol ON tokens (symbol COLLATE NOCASE);
+            CREATE INDEX IF NOT EXISTS tokens_chain_address ON tokens (chain, address);
+            CREATE INDEX IF NOT EXISTS tokens_address ON tokens (address);
+            CREATE TABLE IF NOT EXISTS searches (
+                query TEXT NOT NULL, platform TEXT NOT NULL, updated REAL NOT NULL, last_used REAL NOT NULL,
+                PRIMARY KEY (query, platform));
+            CREATE TABLE IF NOT EXISTS search_hits (
+                query TEXT NOT NULL, platform TEXT NOT NULL, position INTEGER NOT NULL, token_id INTEGER NOT NULL,
+                PRIMARY KEY (query, platform, position));
+        """)
+        try:
+            self._db.execute("CREATE VIRTUAL TABLE IF NOT EXISTS tokens_fts USING fts5(name, symbol, tokenize='trigram')")
+            self.full_text = True
+        except sqlite3.OperationalError:  # SQLite older than 3.34 or built without FTS5
+            self.full_text = False
+        self._db.commit()
+    
+    @staticmethod
+    def normalize_query(query: str) -> str:
+        return ' '.join(query.lower().split())
+    
+    @staticmethod
+    def record_key(record: Dict) -> str:
+        """DexScreener and GeckoTerminal return one record per pair, so their URL tells records apart"""
+        return record.get('url') or TokenResolver.entity_key(record)[0]
+    
+    def record(self, platform: str, query: str, records: List[TokenRecord]):
+        """Store what a platform returned for query, replacing the previous answer"""
+        query = self.normalize_query(query)
+        now = time.time()
+        with self._lock:
+            token_ids = [self._upsert(platform, record, now) for record in records]
+            self._db.execute("DELETE FROM search_hits WHERE query = ? AND platform = ?", (query, platform))
+            self._db.executemany("INSERT INTO search_hits VALUES (?, ?, ?, ?)",
+                                 [(query, platform, position, token_id) for position, token_id in enumerate(token_ids)])
+            self._db.execute("INSERT OR REPLACE INTO searches VALUES (?, ?, ?, ?)", (query, platform, now, now))
+            self._db.commit()
+    
+    def _upsert(self, platform: str, record: TokenRecord, now: float) -> int:
+        key = self.record_key(record)
+        name, symbol = record.get('name'), record.get('symbol')
+        row = (platform, key, name, symbol, normalize_chain(record.get('chain')),
+               normalize_address(record.get('address') or record.get('contract_address')), record.to_json(), now)
+        existing = self._db.execute("SELECT id FROM tokens WHERE platform = ? AND key = ?", (platform, key)).fetchone()
+        if existing is None:
+            token_id = self._db.execute("INSERT INTO tokens (platform, key, name, symbol, chain, address, record, updated) "
+                                        "VALUES (?, ?, ?, ?, ?, ?, ?, ?)", row).lastrowid
+        else:
+            token_id = existing[0]
+            self._db.execute("UPDATE tokens SET name = ?, symbol = ?, chain = ?, address = ?, record = ?, updated = ? "
+                             "WHERE id = ?", row[2:] + (token_id,))
+            if self.full_text:
+                self._db.execute("DELETE FROM tokens_fts WHERE rowid = ?", (token_id,))
+        if self.full_text:
+            self._db.execute("INSERT INTO tokens_fts (rowid, name, symbol) VALUES (?, ?, ?)", (token_id, name or '', symbol or ''))
+        return token_id
+    
+    def lookup(self, platform: str, query: str, max_age: Optional[float] = None) -> Optional[List[TokenRecord]]:
+        """Records the platform last returned for query, or None if it was never searched or the answer
+        is older than max_age (default ttl; pass float('inf') to accept any age)"""
+        query = self.normalize_query(query)
+        max_age = self.ttl if max_age is None else max_age
+        now = time.time()
+        with self._lock:
+            row = self._db.execute("SELECT updated FROM searches WHERE query = ? AND platform = ?",
+                                   (query, platform)).fetchone()
+            if row is None or now - row[0] > max_age:
+                return None
+            self._db.execute("UPDATE searches SET last_used = ? WHERE query = ? AND platform = ?", (now, query, platform))
+            # Commit right away, so the write lock is not held open against other processes sharing the file
+            self._db.commit()
+            rows = self._db.execute("SELECT t.record FROM search_hits h JOIN tokens t ON t.id = h.token_id "
+                                    "WHERE h.query = ? AND h.platform = ? ORDER BY h.position", (query, platform)).fetchall()
+        return [TokenRecord.from_dict(json.loads(record)) for record, in rows]
+    
+    def search(self, text: str, platform: Optional[str] = None, limit: int = 20) -> List[TokenRecord]:
+        """Fuzzy lookup of stored records by name, symbol or exact address, best matches first
+        
+        Candidates sharing any trigram with the text (or its look-alike
+        skeleton) are ranked with TokenMatcher, so near-misses, typos and
+        homoglyph spellings still find the token.
+        """
+        address = normalize_address(text) if len(text.split()) == 1 else None
+        matcher = TokenMatcher.for_query(text)
+        text = self.normalize_query(text)
+        if not text:
+            return []
+        platform_filter = " AND t.platform = ?" if platform else ""
+        params = (platform,) if platform else ()
+        grams = sorted(trigrams(text) | matcher.trigrams)
+        with self._lock:
+            rows = self._db.execute(f"SELECT t.record FROM tokens t WHERE t.address = ?{platform_filter} LIMIT ?",
+                                    (address,) + params + (limit,)).fetchall() if address else []
+            if self.full_text and grams:
+                match = ' OR '.join('"' + gram.replace('"', '""') + '"' for gram in grams)
+                rows += self._db.execute(
+                    f"SELECT t.record FROM tokens_fts f JOIN tokens t ON t.id = f.rowid "
+                    f"WHERE tokens_fts MATCH ?{platform_filter} ORDER BY f.rank LIMIT ?",
+                    (match,) + params + (limit * 5,)).fetchall()
+            else:
+                pattern = f"%{text}%"
+                rows += self._db.execute(
+                    f"SELECT t.record FROM tokens t WHERE (t.name LIKE ? OR t.symbol LIKE ?){platform_filter} LIMIT ?",
+                    (pattern, pattern) + params + (limit,)).fetchall()
+        
+        scored, seen = [], set()
+        for record, in rows:
+            if record in seen:
+                continue
+            seen.add(record)
+            token_info = TokenRecord.from_dict(json.loads(record))
+            if address is not None and normalize_address(token_info.get('address')) == address:
+                score = 1.0
+            else:
+                score = max(matcher.score(token_info.get('name')), matcher.score(token_info.get('symbol')))
+            if score >= MATCH_THRESHOLD:
+                token_info.match_score = round(score, 3)
+                scored.append((-score, len(scored), token_info))
+        return [token_info for _, _, token_info in sorted(scored, key=lambda item: item[:2])][:limit]
+    
+    def stale_searches(self, max_age: Optional[float] = None, used_within: float = TOKEN_INDEX_REFRESH_WINDOW,
+                       limit: int = 100) -> List[Tuple[str, str]]:
+        """(query, platform) pairs older than max_age that were looked up recently, oldest first"""
+        now = time.time()
+        max_age = self.ttl if max_age is None else max_age
+        with self._lock:
+            return self._db.execute("SELECT query, platform FROM searches WHERE updated < ? AND last_used > ? "
+                                    "ORDER BY updated LIMIT ?", (now - max_age, now - used_within, limit)).fetchall()
+    
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                'tokens': self._db.execute("SELECT COUNT(*) FROM tokens").fetchone()[0],
+                'searches': self._db.execute("SELECT COUNT(*) FROM searches").fetchone()[0],
+            }
+    
+    def close(self):
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
+
+class TokenCheckerBase:
+    """Matching, parsing and output shared by the sync and async engines"""
+    
+    def __init__(self, mexc_index: Optional[MexcSymbolIndex] = None,
+                 cache: Optional[ResponseCache] = None, use_cache: bool = True, verbose: bool = True,
+                 limiter: Optional[RateLimiter] = None, api_origins: Optional[Dict[str, str]] = None,
+                 metrics: Optional[Metrics] = None, index: Optional[TokenIndex] = None, offline: bool = False,
+                 platforms: Optional[Iterable[str]] = None, deadlines: Optional[Dict[str, float]] = None,
+                 budget: Optional[float] = None):
+        if offline and index is None:
+            raise ValueError("offline mode needs a TokenIndex to answer from")
+        self.platforms = tuple(PROVIDERS) if platforms is None else tuple(dict.fromkeys(platforms))
+        unknown = [platform for platform in self.platforms if platform not in PROVIDERS]
+        if unknown:
+            raise ValueError(f"unknown platforms: {', '.join(unknown)} (known: {', '.join(PROVIDERS)})")
+        self.deadlines = deadlines or {}
+        self.budget = budget
+        self.verbose = verbose
+        self.index = index
+        self.offline = offline
+        self.api_origins = api_origins or {}
+        self.limiter = limiter if limiter is not None else RateLimiter.shared()
+        self.metrics = metrics if metrics is not None else Metrics.shared()
+        self.renderer: ResultRenderer = TextRenderer()
+        self._providers: Dict[str, Provider] = {}
+        # Local listings (the MEXC symbol index) are loaded from disk on first use only
+        self._listings: Dict[str, Any] = {'mexc': mexc_index} if mexc_index is not None else {}
+        self._listings_lock = threading.Lock()
+        if not use_cache:
+            self.cache = None
+        else:
+            self.cache = cache if cache is not None else ResponseCache()
+    
+    def __getattr__(self, attribute: str):
+        # search_dexscreener(token_name) and friends, for every registered provider
+        if attribute.startswith('search_') and attribute[len('search_'):] in PROVIDERS:
+            return functools.partial(self.search_provider, attribute[len('search_'):])
+        raise AttributeError(f"{type(self).__name__!r} object has no attribute {attribute!r}")
+    
+    def provider(self, platform: str) -> Provider:
+        """The platform's provider, loaded on first use and registered with this checker's limiter and cache"""
+        provider = self._providers.get(platform)
+        if provider is None:
+            provider = load_provider(platform)
+            self.limiter.configure(platform, *provider.rate_limit)
+            if self.cache is not None:
+                self.cache.configure(platform, provider.cache_ttl, provider.cache_rules)
+            self._providers[platform] = provider
+        return provider
+    
+    def listing(self, platform: str) -> Any:
+        """The local listing of a provider with listing = True, created on first use"""
+        listing = self._listings.get(platform)
+        if listing is None:
+            with self._listings_lock:
+                listing = self._listings.get(platform)
+                if listing is None:
+                    listing = self._listings[platform] = self.provider(platform).new_listing()
+        return listing
+    
+    @property
+    def mexc_index(self) -> MexcSymbolIndex:
+        return self.listing('mexc')
+    
+    def _api_url(self, platform: str, url: str) -> str:
+        """Rewrite url onto the platform's overridden API origin, if any"""
+        origin = self.api_origins.get(platform)
+        default_origin = self.provider(platform).origin if origin else None
+        if origin and default_origin and url.startswith(default_origin):
+            return origin.rstrip('/') + url[len(default_origin):]
+        return url
+    
+    def _log(self, message: str):
+        """Print search progress unless running quietly (e.g. in batch mode)"""
+        if self.verbose:
+            print(message)
+    
+    def _search_failed(self, platform: str, label: str, error: Exception) -> SearchResults:
+        self.metrics.count_search_error(platform)
+        print(f"❌ {label} error: {str(error)}", file=sys.stderr)
+        return SearchResults(error=str(error) or type(error).__name__)
+    
+    def _from_index(self, platform: str, token_name: str) -> Optional[List[TokenRecord]]:
+        """Records from the token index if it holds a fresh answer, or any answer at all when offline"""
+        if self.index is None:
+            return None
+        if not self.offline:
+            records = self.index.lookup(platform, token_name)
+        else:
+            records = self.index.lookup(platform, token_name, max_age=float('inf'))
+            if records is None:
+                records = self.index.search(token_name, platform)
+        if records is not None:
+            self._log(f"📚 {platform}: {len(records)} results from the local index")
+        return records
+    
+    def _index_results(self, platform: str, token_name: str, results: SearchResults):
+        """Store a search's results, unless the search failed and its empty result means nothing"""
+        if self.index is not None and results.error is None:
+            self.index.record(platform, token_name, results)
+    
+    def _enrichment_failed(self, platform: str, error: Exception):
+        """Count an enrichment call that failed; the records are still returned without its data"""
+        self.metrics.count_enrichment_failure(platform)
+        self._log(f"⚠️  {platform} enrichment failed: {error}")
+    
+    def _time_allowed(self, platform: str, budget: Optional[float]) -> float:
+        """Seconds a lookup waits for the platform: its deadline, capped by the lookup's budget"""
+        budget = self.budget if budget is None else budget
+        return min(self.deadlines.get(platform, float('inf')), budget if budget is not None else float('inf'))
+    
+    def _cannot_finish(self, platform: str, seconds: float) -> bool:
+        """Whether the platform's rate limit alone would hold a search back longer than it is allowed"""
+        return seconds != float('inf') and self.limiter.backlog(platform, self.provider(platform).cost) > seconds
+    
+    def _missed_deadline(self, platform: str) -> Tuple[str, SearchResults]:
+        self.metrics.count_deadline_miss(platform)
+        self._log(f"⏱️  {self.provider(platform).label} missed its deadline, continuing without it")
+        return platform, SearchResults(error="missed its deadline")
+    
+    def _check_circuit(self, platform: str):
+        if not self.limiter.allow(platform):
+            raise CircuitOpenError(f"{platform} is failing, skipping it for now")
+    
+    def _retry_delay(self, platform: str, attempt: int, reason: str,
+                     throttled: bool = False, retry_after: Optional[float] = None) -> float:
+        """Record a failed attempt and return seconds to wait before the next one
+        
+        Raises PlatformError once retries are exhausted or the platform asks
+        for a longer pause than MAX_RETRY_AFTER.
+        """
+        if retry_after is not None and retry_after > MAX_RETRY_AFTER:
+            self.limiter.trip(platform, retry_after)
+            raise PlatformError(f"{platform} asked us to retry after {retry_after:.0f}s ({reason})")
+        if attempt >= MAX_RETRIES:
+            self.limiter.record_failure(platform)
+            raise PlatformError(f"{platform} failed after {attempt + 1} attempts ({reason})")
+        
+        delay = retry_after if retry_after is not None else backoff_delay(attempt)
+        if throttled:
+            # Pausing the shared bucket makes every caller's next reserve() wait
+            self.limiter.record_throttle(platform, delay)
+            return 0.0
+        return delay
+    
+    def is_match(self, token_name: str, search_term: str) -> bool:
+        """Check if token name matches search term: exact, look-alike, contains or near-typo (see TokenMatcher)"""
+        return TokenMatcher.for_query(search_term).matches(token_name)
+    
+    def display_results(self, results: Dict[str, List[TokenRecord]], renderer: Optional[ResultRenderer] = None):
+        """Display formatted results"""
+        renderer = renderer or self.renderer
+        total_found = sum(len(v) for v in results.values())
+        if renderer.decorated:
+            self._display_summary(total_found)
+            if total_found == 0:
+                return
+        
+        renderer.start()
+        for platform, tokens in results.items():
+            renderer.render(platform, tokens)
+        renderer.flush()
+        if renderer.decorated:
+            self._display_tips()
+    
+    def display_stream(self, stream: Iterable[Tuple[str, List[TokenRecord]]],
+                       renderer: Optional[ResultRenderer] = None) -> Dict[str, List[TokenRecord]]:
+        """Display each platform's results as they arrive and return them all"""
+        renderer = renderer or self.renderer
+        found = {}
+        renderer.start()
+        for platform, tokens in stream:
+            found[platform] = tokens
+            renderer.render(platform, tokens)
+            renderer.flush()
+        
+        if renderer.decorated:
+            total_found = sum(len(v) for v in found.values())
+            self._display_summary(total_found)
+            if total_found:
+                self._display_tips()
+        return {platform: found.get(platform, []) for platform in dict.fromkeys((*self.platforms, *found))}
+    
+    def display_clones(self, results: Dict[str, List[TokenRecord]]):
+        """Warn about symbols claimed by several different token addresses"""
+        groups = TokenResolver.from_results(results).clone_groups()
+        if not groups:
+            return
+        
+        print(f"\n{'='*60}")
+        print("⚠️  SAME SYMBOL, DIFFERENT TOKENS - check for impersonators")
+        print(f"{'='*60}")
+        for symbol, entities in groups.items():
+            print(f"\n  {symbol}:")
+            for entity in entities:
+                if not entity['address']:
+                    continue
+                platforms = ', '.join(dict.fromkeys(source['platform'] for source in entity['sources']))
+                liquidity = entity.get('liquidity_usd')
+                liquidity = f", liquidity ${float(liquidity):,.0f}" if liquidity is not None else ""
+                print(f"    • {entity['chain']} {entity['address']} ({platforms}{liquidity})")
+    
+    def _display_summary(self, total_found: int):
+        print(f"\n{'='*60}")
+        print(f"📊 SEARCH RESULTS - Found {total_found} total matches")
+        print(f"{'='*60}\n")
+        
+        if total_found == 0:
+            print("❌ No tokens found matching your search.")
+            print("\n💡 Try:")
+            print("   • Different spelling or token symbol")
+            print("   • Searching by contract address if you have it")
+            print("   • Checking these explorers manually:")
+            print("     - Etherscan: https://etherscan.io/tokens")
+            print("     - BSCScan: https://bscscan.com/tokens")
+            print("     - Solscan: https://solscan.io")
+            print("     - OKLink: https://www.oklink.com")
+    
+    def _display_tips(self):
+        print(f"\n{'='*60}")
+        print("💡 TIP: For more detailed info, also check:")
+        print("   • Etherscan (ETH): https://etherscan.io/tokens")
+        print("   • BSCScan (BSC): https://bscscan.com/tokens") 
+        print("   • Solscan (Solana): https://solscan.io")
+        print("   • OKLink (Multi-chain): https://www.oklink.com")
+        print(f"{'='*60}\n")
+    
+    def save_results(self, results: Dict[str, List[TokenRecord]], filename: str = "token_results.json"):
+        """Save results to JSON file"""
+        try:
+            with open(filename, 'w') as f:
+                json.dump(results, f, indent=2, default=json_default)
+            print(f"💾 Results saved to {filename}")
+        except Exception as e:
+            print(f"❌ Error saving results: {str(e)}")
+
+
+class EnhancedTokenChecker(TokenCheckerBase):
+    def __init__(self, max_workers: int = 7, mexc_index: Optional[MexcSymbolIndex] = None,
+                 cache: Optional[ResponseCache] = None, use_cache: bool = True, verbose: bool = True,
+                 limiter: Optional[RateLimiter] = None, api_origins: Optional[Dict[str, str]] = None,
+                 pool_size: Optional[int] = None, metrics: Optional[Metrics] = None,
+                 index: Optional[TokenIndex] = None, offline: bool = False, platforms: Optional[Iterable[str]] = None,
+                 deadlines: Optional[Dict[str, float]] = None, budget: Optional[float] = None):
+        super().__init__(mexc_index, cache, use_cache, verbose, limiter, api_origins, metrics, index, offline,
+                         platforms, deadlines, budget)
+        self.max_workers = max_workers
         self.session = requests.Session()
         self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+            'User-Agent': USER_AGENT
         })
+        # Pool enough connections for every worker plus enrichment calls
+        adapter = HTTPAdapter(pool_connections=len(PLATFORMS), pool_maxsize=pool_size or max_workers * 2)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        self._listing_refresh_lock = threading.Lock()
+        self._flights = SingleFlight()
     
-    def is_match(self, token_name: str, search_term: str) -> bool:
-        """Check if token name matches search term (exact or contains)"""
-        if not token_name:
-            return False
-        token_lower = token_name.lower()
-        search_lower = search_term.lower()
-        # Exact match or contains the search term
-        return search_lower in token_lower
-        
-    def search_dexscreener(self, token_name: str) -> List[Dict]:
-        """Search DexScreener for token matches with enhanced metadata"""
-        print(f"🔍 Searching DexScreener for '{token_name}'...")
-        results = []
+    def _get_json(self, platform: str, url: str, timeout: float = 10) -> Optional[Any]:
+        """Cached, rate-limited, deduplicated GET with retries, returning the decoded JSON body
         
-        try:
-            url = f"https://api.dexscreener.com/latest/dex/search/?q={token_name}"
-            response = self.session.get(url, timeout=10)
+        Threads asking for the same URL while it is being fetched wait for
+        that fetch and share its decoded body instead of sending their own.
+        Returns None for responses such as 404 that retrying will not fix and
+        raises PlatformError when the platform keeps failing or throttling.
+        """
+        url = self._api_url(platform, url)
+        if self.cache is not None:
+            hit, data = self.cache.get(platform, url)
+            self.metrics.observe_cache(platform, hit)
+            if hit:
+                return data
+        
+        data, shared = self._flights.call((platform, ResponseCache.normalize_url(url)), self._fetch_json,
+                                          platform, url, timeout)
+        if shared:
+            self.metrics.count_coalesced(platform)
+        return data
+    
+    def _fetch_json(self, platform: str, url: str, timeout: float) -> Optional[Any]:
+        self._check_circuit(platform)
+        attempt = 0
+        while True:
+            delay = self.limiter.reserve(platform)
+            if delay > 0:
+                time.sleep(delay)
+            started = time.perf_counter()
+            try:
+                response = self.session.get(url, timeout=timeout)
+            except requests.RequestException as e:
+                self.metrics.observe_request(platform, 'error', time.perf_counter() - started)
+                time.sleep(self._retry_delay(platform, attempt, str(e)))
+                attempt += 1
+                continue
             
-            if response.status_code == 200:
-                data = response.json()
-                pairs = data.get('pairs', [])
-                
-                for pair in pairs[:10]:
-                    base_token = pair.get('baseToken', {})
-                    name = base_token.get('name')
-                    symbol = base_token.get('symbol')
-                    
-                    # Only include if name or symbol matches
-                    if self.is_match(name, token_name) or self.is_match(symbol, token_name):
-                        token_info = {
-                            'platform': 'DexScreener',
-                            'name': name,
-                            'symbol': symbol,
-                            'address': base_token.get('address'),
-                            'chain': pair.get('chainId'),
-                            'dex': pair.get('dexId'),
-                            'price_usd': pair.get('priceUsd'),
-                            'price_change_24h': pair.get('priceChange', {}).get('h24'),
-                            'liquidity_usd': pair.get('liquidity', {}).get('usd'),
-                            'volume_24h': pair.get('volume', {}).get('h24'),
-                            'fdv': pair.get('fdv'),
-                            'market_cap': pair.get('marketCap'),
-                            'pair_created_at': pair.get('pairCreatedAt'),
-                            'url': pair.get('url'),
-                            'listed_on': [pair.get('dexId')]
-                        }
-                        results.append(token_info)
-                    
-        except Exception as e:
-            print(f"❌ DexScreener error: {str(e)}")
+            status = response.status_code
+            self.metrics.observe_request(platform, str(status), time.perf_counter() - started, len(response.content))
+            if status == 429 or status >= 500:
+                retry_after = parse_retry_after(response.headers.get('Retry-After'))
+                time.sleep(self._retry_delay(platform, attempt, f"HTTP {status}", status == 429, retry_after))
+                attempt += 1
+                continue
             
-        return results
+            self.limiter.record_success(platform)
+            if status != 200:
+                self._log(f"⚠️  {platform} returned HTTP {status} for {url}")
+                return None
+            data = response.json()
+            if self.cache is not None:
+                self.cache.set(platform, url, data)
+            return data
     
-    def search_birdeye(self, token_name: str) -> List[Dict]:
-        """Search Birdeye for Solana tokens with metadata"""
-        print(f"🔍 Searching Birdeye for '{token_name}'...")
+    @instrumented
+    def search_provider(self, platform: str, token_name: str) -> SearchResults:
+        """Search one platform over the network and enrich its hits; a failed search returns no results and its error"""
+        provider = self.provider(platform)
+        self._log(f"🔍 Searching {provider.label} for '{token_name}'...")
         results = []
         
         try:
-            url = f"https://public-api.birdeye.so/public/tokenlist?keyword={token_name}"
-            response = self.session.get(url, timeout=10)
-            
-            if response.status_code == 200:
-                data = response.json()
-                tokens = data.get('data', {}).get('tokens', [])
-                
-                for token in tokens[:10]:
-                    name = token.get('name')
-                    symbol = token.get('symbol')
-                    address = token.get('address')
-                    
-                    # Only include if name or symbol matches
-                    if self.is_match(name, token_name) or self.is_match(symbol, token_name):
-                        token_info = {
-                            'platform': 'Birdeye',
-                            'name': name,
-                            'symbol': symbol,
-                            'address': address,
-                            'chain': 'Solana',
-                            'decimals': token.get('decimals'),
-                            'logo': token.get('logoURI'),
-                            'url': f"https://birdeye.so/token/{address}"
-                        }
-                        
-                        # Try to get additional metadata
-                        try:
-                            meta_url = f"https://public-api.birdeye.so/public/token_overview?address={address}"
-                            meta_response = self.session.get(meta_url, timeout=5)
-                            if meta_response.status_code == 200:
-                                meta = meta_response.json().get('data', {})
-                                token_info.update({
-                                    'price_usd': meta.get('price'),
-                                    'liquidity_usd': meta.get('liquidity'),
-                                    'volume_24h': meta.get('v24hUSD'),
-                                    'market_cap': meta.get('mc'),
-                                    'holder_count': meta.get('holder'),
-                                })
-                        except:
-                            pass
-                        
-                        results.append(token_info)
-                    
+            if provider.listing:
+                data = self._listing_lookup(provider, token_name)
+            else:
+                data = self._get_json(platform, provider.url(token_name))
+            if data is not None:
+                results = provider.parse(data, token_name)
+                self._enrich(provider, results)
         except Exception as e:
-            print(f"❌ Birdeye error: {str(e)}")
+            return self._search_failed(platform, provider.label, e)
             
-        return results
+        return SearchResults(results)
     
-    def search_coingecko(self, token_name: str) -> List[Dict]:
-        """Search CoinGecko with detailed token information"""
-        print(f"🔍 Searching CoinGecko for '{token_name}'...")
-        results = []
+    def _enrich(self, provider: Provider, results: List[TokenRecord]):
+        """Fetch and apply the provider's enrichments, a few at a time; failures leave the records as they are"""
+        try:
+            jobs = provider.enrichments(results)
+        except Exception as e:
+            self._enrichment_failed(provider.name, e)
+            return
+        
+        def fetch(job: Tuple[str, Any]):
+            url, target = job
+            try:
+                payload = self._get_json(provider.name, url, timeout=provider.enrich_timeout)
+                if payload is not None:
+                    provider.enrich(target, payload)
+            except Exception as e:
+                self._enrichment_failed(provider.name, e)
         
+        if len(jobs) > 1 and provider.enrich_concurrency > 1:
+            with ThreadPoolExecutor(max_workers=provider.enrich_concurrency) as executor:
+                list(executor.map(fetch, jobs))
+        else:
+            for job in jobs:
+                fetch(job)
+    
+    def _refresh_listing(self, provider: Provider):
+        listing = self.listing(provider.name)
         try:
-            url = f"https://api.coingecko.com/api/v3/search?query={token_name}"
-            response = self.session.get(url, timeout=10)
-            
-            if response.status_code == 200:
-                data = response.json()
-                coins = data.get('coins', [])
-                
-                for coin in coins[:10]:
-                    name = coin.get('name')
-                    symbol = coin.get('symbol')
-                    
-                    # Only include if name or symbol matches
-                    if self.is_match(name, token_name) or self.is_match(symbol, token_name):
-                        coin_id = coin.get('id')
-                        token_info = {
-                            'platform': 'CoinGecko',
-                            'name': name,
-                            'symbol': symbol,
-                            'coingecko_id': coin_id,
-                            'market_cap_rank': coin.get('market_cap_rank'),
-                            'url': f"https://www.coingecko.com/en/coins/{coin_id}"
-                        }
-                        
-                        # Try to get detailed info
-                        try:
-                            detail_url = f"https://api.coingecko.com/api/v3/coins/{coin_id}"
-                            detail_response = self.session.get(detail_url, timeout=5)
-                            if detail_response.status_code == 200:
-                                detail = detail_response.json()
-                                market_data = detail.get('market_data', {})
-                                
-                                token_info.update({
-                                    'price_usd': market_data.get('current_price', {}).get('usd'),
-                                    'market_cap': market_data.get('market_cap', {}).get('usd'),
-                                    'volume_24h': market_data.get('total_volume', {}).get('usd'),
-                                    'price_change_24h': market_data.get('price_change_percentage_24h'),
-                                    'circulating_supply': market_data.get('circulating_supply'),
-                                    'total_supply': market_data.get('total_supply'),
-                                    'genesis_date': detail.get('genesis_date'),
-                                    'listed_on': [ex.get('name') for ex in detail.get('tickers', [])[:5]],
-                                    'contract_address': detail.get('contract_address'),
-                                    'description': detail.get('description', {}).get('en', '')[:200] if detail.get('description', {}).get('en') else None
-                                })
-                        except:
-                            pass
-                        
-                        results.append(token_info)
-                    
+            payload = self._get_json(provider.name, provider.search_url)
+            if payload is not None:
+                listing.update(payload)
+        finally:
+            listing.end_refresh()
+    
+    def _refresh_listing_in_background(self, provider: Provider):
+        try:
+            self._refresh_listing(provider)
         except Exception as e:
-            print(f"❌ CoinGecko error: {str(e)}")
-            
+            self._search_failed(provider.name, f"{provider.label} listing refresh", e)
+    
+    def _listing_lookup(self, provider: Provider, token_name: str) -> List[Dict]:
+        """Look the query up in the provider's listing, downloading it only when missing or stale
+        
+        Raises when there is no listing to search, so the search is reported
+        as failed rather than as having no matches.
+        """
+        listing = self.listing(provider.name)
+        if listing.is_empty:
+            # Cold start: one thread downloads while the others wait for it
+            with self._listing_refresh_lock:
+                if listing.is_empty and listing.begin_refresh():
+                    self._refresh_listing(provider)
+            if listing.is_empty:
+                raise PlatformError(f"{provider.name} listing is unavailable")
+        elif listing.is_stale and listing.begin_refresh():
+            threading.Thread(target=self._refresh_listing_in_background, args=(provider,), daemon=True).start()
+        return listing.lookup(token_name)
+    
+    def _search_platform(self, platform: str, token_name: str) -> SearchResults:
+        """Answer from the token index when it can, else search the platform and index the results"""
+        records = self._from_index(platform, token_name)
+        if records is not None:
+            return SearchResults(records)
+        results = self.search_provider(platform, token_name)
+        self._index_results(platform, token_name, results)
         return results
     
-    def search_pumpfun(self, token_name: str) -> List[Dict]:
-        """Search Pump.fun for Solana meme tokens with metadata"""
-        print(f"🔍 Searching Pump.fun for '{token_name}'...")
-        results = []
+    def refresh_stale_index(self, limit: int = 50) -> int:
+        """Re-run up to `limit` stale index searches that were looked up recently; returns how many ran"""
+        if self.index is None or self.offline:
+            return 0
+        stale = self.index.stale_searches(limit=limit)
+        for query, platform in stale:
+            if platform not in PROVIDERS:
+                continue
+            self._index_results(platform, query, self.search_provider(platform, query))
+        return len(stale)
+    
+    def start_index_refresh(self, interval: float = TOKEN_INDEX_REFRESH_INTERVAL) -> threading.Thread:
+        """Refresh stale index entries every `interval` seconds on a daemon thread"""
+        def run():
+            while True:
+                time.sleep(interval)
+                try:
+                    self.refresh_stale_index()
+                except Exception as e:
+                    self._log(f"⚠️  Index refresh failed: {e}")
+        
+        thread = threading.Thread(target=run, daemon=True)
+        thread.start()
+        return thread
+    
+    def search_all(self, token_name: str, concurrent: bool = True, platforms: Optional[Iterable[str]] = None,
+                   budget: Optional[float] = None) -> Dict[str, List[TokenRecord]]:
+        """Search the checker's platforms (or just `platforms`) for the token, in parallel unless concurrent=False
+        
+        With a budget (seconds, default self.budget) or per-platform deadlines,
+        platforms that have not answered in time are returned with no results
+        and their error set, like platforms whose search failed (see SearchResults).
+        """
+        self._log(f"\n{'='*60}")
+        self._log(f"🚀 Searching for token: {token_name}")
+        self._log(f"{'='*60}\n")
+        
+        platforms = self.platforms if platforms is None else tuple(platforms)
+        # Rate limiting is handled per platform by _get_json, so no sleeps here
+        if not concurrent:
+            return {platform: self._search_platform(platform, token_name) for platform in platforms}
         
+        found = dict(self._iter_platforms(token_name, platforms, budget))
+        return {platform: found[platform] for platform in platforms}
+    
+    def iter_search(self, token_name: str, platforms: Optional[Iterable[str]] = None,
+                    budget: Optional[float] = None) -> Iterator[Tuple[str, List[TokenRecord]]]:
+        """Search the platforms in parallel, yielding (platform, results) as each one answers"""
+        self._log(f"\n{'='*60}")
+        self._log(f"🚀 Searching for token: {token_name}")
+        self._log(f"{'='*60}\n")
+        return self._iter_platforms(token_name, platforms, budget)
+    
+    def _iter_platforms(self, token_name: str, platforms: Optional[Iterable[str]] = None,
+                        budget: Optional[float] = None) -> Iterator[Tuple[str, List[TokenRecord]]]:
+        """Yield (platform, results) as each platform answers or runs out of time
+        
+        A platform whose rate limit alone would outlast its time is skipped
+        up front. One still searching at its deadline is yielded with no
+        results and left to finish in the background, so its answer still
+        reaches the cache and index for next time.
+        """
+        platforms = self.platforms if platforms is None else tuple(platforms)
+        started = time.monotonic()
+        allowed = {platform: self._time_allowed(platform, budget) for platform in platforms}
+        skipped = [platform for platform in platforms if self._cannot_finish(platform, allowed[platform])]
+        executor = ThreadPoolExecutor(max_workers=self.max_workers)
         try:
-            url = f"https://frontend-api.pump.fun/coins?searchQuery={token_name}&limit=10"
-            response = self.session.get(url, timeout=10)
-            
-            if response.status_code == 200:
-                data = response.json()
-                
-                for token in data:
-                    name = token.get('name')
-                    symbol = token.get('symbol')
-                    
-                    # Only include if name or symbol matches
-                    if self.is_match(name, token_name) or self.is_match(symbol, token_name):
-                        token_info = {
-                            'platform': 'Pump.fun',
-                            'name': name,
-                            'symbol': symbol,
-                            'address': token.get('mint'),
-                            'chain': 'Solana',
-                            'creator': token.get('creator'),
-                            'market_cap': token.get('market_cap'),
-                            'created_timestamp': token.get('created_timestamp'),
-                            'description': token.get('description'),
-                            'twitter': token.get('twitter'),
-                            'telegram': token.get('telegram'),
-                            'website': token.get('website'),
-                            'url': f"https://pump.fun/{token.get('mint')}"
-                        }
-                        results.append(token_info)
-                    
-        except Exception as e:
-            print(f"❌ Pump.fun error: {str(e)}")
+            futures = {executor.submit(self._search_platform, platform, token_name): platform
+                       for platform in platforms if platform not in skipped}
+            for platform in skipped:
+                yield self._missed_deadline(platform)
             
-        return results
+            pending = set(futures)
+            while pending:
+                next_deadline = started + min(allowed[futures[future]] for future in pending)
+                timeout = None if next_deadline == float('inf') else max(0.0, next_deadline - time.monotonic())
+                done, pending = wait_futures(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield futures[future], future.result()
+                expired = [future for future in pending if started + allowed[futures[future]] <= time.monotonic()]
+                for future in expired:
+                    pending.discard(future)
+                    future.cancel()
+                    yield self._missed_deadline(futures[future])
+        finally:
+            executor.shutdown(wait=False)
     
-    def search_mexc(self, token_name: str) -> List[Dict]:
-        """Search MEXC exchange for token listings"""
-        print(f"🔍 Searching MEXC for '{token_name}'...")
-        results = []
+    def stream_batch(self, token_names: Iterable[str], workers: int = 4) -> Iterator[Tuple[str, Optional[str], SearchResults, Optional[str]]]:
+        """Search many tokens, yielding (token_name, platform, results, error) as each platform answers
         
-        try:
-            # MEXC API endpoint for symbols
-            url = "https://api.mexc.com/api/v3/exchangeInfo"
-            response = self.session.get(url, timeout=10)
+        Up to `workers` tokens are searched at once, each fanning out to every
+        platform, so per-platform rate limits still apply across the whole
+        batch. token_names is consumed lazily and nothing is retained once
+        yielded. A platform that could not be searched has results.error set.
+        Each token ends with a (token_name, None, [], error) event, where
+        error is None unless the token failed; the batch carries on.
+        """
+        names = iter(token_names)
+        events = queue.Queue()
+        
+        def run(token_name: str):
+            try:
+                for platform, results in self._iter_platforms(token_name):
+                    events.put((token_name, platform, results, None))
+                events.put((token_name, None, SearchResults(), None))
+            except Exception as e:
+                events.put((token_name, None, SearchResults(), str(e)))
+        
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            in_flight = 0
+            for token_name in itertools.islice(names, workers):
+                executor.submit(run, token_name)
+                in_flight += 1
+            while in_flight:
+                event = events.get()
+                if event[1] is None:
+                    in_flight -= 1
+                    for token_name in itertools.islice(names, 1):
+                        executor.submit(run, token_name)
+                        in_flight += 1
+                yield event
+    
+    def search_batch(self, token_names: Iterable[str], workers: int = 4) -> Iterator[Tuple[str, Optional[Dict[str, List[TokenRecord]]], Optional[str]]]:
+        """Search many tokens, yielding (token_name, results, error) as each one finishes
+        
+        Like stream_batch, but each token's platforms are collected into the
+        search_all result shape first. Token names should be distinct.
+        """
+        collected: Dict[str, Dict[str, List[TokenRecord]]] = {}
+        for token_name, platform, results, error in self.stream_batch(token_names, workers):
+            if platform is not None:
+                collected.setdefault(token_name, {})[platform] = results
+                continue
+            found = collected.pop(token_name, {})
+            if error:
+                yield token_name, None, error
+            else:
+                yield token_name, {platform: found.get(platform, []) for platform in self.platforms}, None
+
+
+class AsyncTokenChecker(TokenCheckerBase):
+    """asyncio counterpart of EnhancedTokenChecker, returning the same result shape
+    
+    Requires aiohttp. All requests share one keep-alive connection pool, and
+    in-flight requests are capped per host. Use as an async context manager
+    or call close() when done.
+    """
+    
+    def __init__(self, per_host_limit: int = 4, total_limit: int = 100, mexc_index: Optional[MexcSymbolIndex] = None,
+                 cache: Optional[ResponseCache] = None, use_cache: bool = True, verbose: bool = True,
+                 limiter: Optional[RateLimiter] = None, api_origins: Optional[Dict[str, str]] = None,
+                 metrics: Optional[Metrics] = None, index: Optional[TokenIndex] = None, offline: bool = False,
+                 platforms: Optional[Iterable[str]] = None, deadlines: Optional[Dict[str, float]] = None,
+                 budget: Optional[float] = None):
+        if aiohttp is None:
+            raise ImportError("AsyncTokenChecker requires aiohttp (pip install aiohttp)")
+        super().__init__(mexc_index, cache, use_cache, verbose, limiter, api_origins, metrics, index, offline,
+                         platforms, deadlines, budget)
+        self._listing_loads: Dict[str, asyncio.Future] = {}
+        self._flights = AsyncSingleFlight()
+        self.per_host_limit = per_host_limit
+        self.total_limit = total_limit
+        self.session = None
+    
+    async def __aenter__(self):
+        self._ensure_session()
+        return self
+    
+    async def __aexit__(self, *exc_info):
+        await self.close()
+    
+    def _ensure_session(self):
+        if self.session is None or self.session.closed:
+            connector = aiohttp.TCPConnector(limit=self.total_limit, limit_per_host=self.per_host_limit)
+            self.session = aiohttp.ClientSession(connector=connector, headers={'User-Agent': USER_AGENT})
+        return self.session
+    
+    async def close(self):
+        if self.session is not None:
+            await self.session.close()
+            self.session = None
+    
+    async def _get_json(self, platform: str, url: str, timeout: float = 10) -> Optional[Any]:
+        """Cached, rate-limited, deduplicated GET with retries; see EnhancedTokenChecker._get_json"""
+        url = self._api_url(platform, url)
+        if self.cache is not None:
+            hit, data = self.cache.get(platform, url)
+            self.metrics.observe_cache(platform, hit)
+            if hit:
+                return data
+        
+        data, shared = await self._flights.call((platform, ResponseCache.normalize_url(url)), self._fetch_json,
+                                                platform, url, timeout)
+        if shared:
+            self.metrics.count_coalesced(platform)
+        return data
+    
+    async def _fetch_json(self, platform: str, url: str, timeout: float) -> Optional[Any]:
+        self._check_circuit(platform)
+        session = self._ensure_session()
+        attempt = 0
+        while True:
+            delay = self.limiter.reserve(platform)
+            if delay > 0:
+                await asyncio.sleep(delay)
+            started = time.perf_counter()
+            try:
+                async with session.get(url, timeout=aiohttp.ClientTimeout(total=timeout)) as response:
+                    status = response.status
+                    retry_after = parse_retry_after(response.headers.get('Retry-After'))
+                    body = await response.read()
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                self.metrics.observe_request(platform, 'error', time.perf_counter() - started)
+                await asyncio.sleep(self._retry_delay(platform, attempt, str(e) or type(e).__name__))
+                attempt += 1
+                continue
             
-            if response.status_code == 200:
-                data = response.json()
-                symbols = data.get('symbols', [])
-                
-                # Search for matching tokens - exact or contains
-                for symbol in symbols:
-                    base_asset = symbol.get('baseAsset', '')
-                    if self.is_match(base_asset, token_name):
-                        token_info = {
-                            'platform': 'MEXC',
-                            'symbol': base_asset,
-                            'trading_pair': symbol.get('symbol'),
-                            'quote_asset': symbol.get('quoteAsset'),
-                            'status': symbol.get('status'),
-                            'listed_on': ['MEXC'],
-                            'url': f"https://www.mexc.com/exchange/{symbol.get('symbol')}"
-                        }
-                        
-                        # Try to get price data
-                        try:
-                            price_url = f"https://api.mexc.com/api/v3/ticker/24hr?symbol={symbol.get('symbol')}"
-                            price_response = self.session.get(price_url, timeout=5)
-                            if price_response.status_code == 200:
-                                price_data = price_response.json()
-                                token_info.update({
-                                    'price_usd': price_data.get('lastPrice'),
-                                    'price_change_24h': price_data.get('priceChangePercent'),
-                                    'volume_24h': price_data.get('quoteVolume'),
-                                })
-                        except:
-                            pass
-                        
-                        results.append(token_info)
-                        if len(results) >= 5:  # Limit to 5 results
-                            break
-                    
-        except Exception as e:
-            print(f"❌ MEXC error: {str(e)}")
+            self.metrics.observe_request(platform, str(status), time.perf_counter() - started, len(body))
+            if status == 429 or status >= 500:
+                await asyncio.sleep(self._retry_delay(platform, attempt, f"HTTP {status}", status == 429, retry_after))
+                attempt += 1
+                continue
             
-        return results
+            self.limiter.record_success(platform)
+            if status != 200:
+                self._log(f"⚠️  {platform} returned HTTP {status} for {url}")
+                return None
+            data = json.loads(body)
+            if self.cache is not None:
+                self.cache.set(platform, url, data)
+            return data
     
-    def search_coinmarketcap(self, token_name: str) -> List[Dict]:
-        """Search CoinMarketCap with enhanced data"""
-        print(f"🔍 Searching CoinMarketCap for '{token_name}'...")
-        results = []
-        
+    async def _enrich(self, provider: Provider, results: List[TokenRecord]):
+        """Fetch and apply the provider's enrichments concurrently; see EnhancedTokenChecker._enrich"""
         try:
-            url = f"https://api.coinmarketcap.com/data-api/v3/cryptocurrency/listing?start=1&limit=20&search={token_name}"
-            response = self.session.get(url, timeout=10)
-            
-            if response.status_code == 200:
-                data = response.json()
-                for item in data.get('data', {}).get('cryptoCurrencyList', []):
-                    name = item.get('name')
-                    symbol = item.get('symbol')
-                    
-                    # Only include if name or symbol matches
-                    if self.is_match(name, token_name) or self.is_match(symbol, token_name):
-                        quotes = item.get('quotes', [{}])[0]
-                        
-                        token_info = {
-                            'platform': 'CoinMarketCap',
-                            'name': name,
-                            'symbol': symbol,
-                            'cmc_rank': item.get('cmcRank'),
-                            'price_usd': quotes.get('price'),
-                            'market_cap': quotes.get('marketCap'),
-                            'volume_24h': quotes.get('volume24h'),
-                            'price_change_24h': quotes.get('percentChange24h'),
-                            'circulating_supply': item.get('circulatingSupply'),
-                            'total_supply': item.get('totalSupply'),
-                            'max_supply': item.get('maxSupply'),
-                            'url': f"https://coinmarketcap.com/currencies/{item.get('slug')}"
-                        }
-                        results.append(token_info)
-                        if len(results) >= 5:  # Limit to 5 results
-                            break
-                    
+            jobs = provider.enrichments(results)
         except Exception as e:
-            print(f"❌ CoinMarketCap error: {str(e)}")
-            
-        return results
+            self._enrichment_failed(provider.name, e)
+            return
+        limit = asyncio.Semaphore(provider.enrich_concurrency)
+        
+        async def fetch(url: str, target: Any):
+            async with limit:
+                try:
+                    payload = await self._get_json(provider.name, url, timeout=provider.enrich_timeout)
+                    if payload is not None:
+                        provider.enrich(target, payload)
+                except Exception as e:
+                    self._enrichment_failed(provider.name, e)
+        
+        await asyncio.gather(*(fetch(url, target) for url, target in jobs))
     
-    def search_geckoterminal(self, token_name: str) -> List[Dict]:
-        """Search GeckoTerminal for DEX data"""
-        print(f"🔍 Searching GeckoTerminal for '{token_name}'...")
+    @instrumented
+    async def search_provider(self, platform: str, token_name: str) -> SearchResults:
+        """Search one platform over the network and enrich its hits; a failed search returns no results and its error"""
+        provider = self.provider(platform)
+        self._log(f"🔍 Searching {provider.label} for '{token_name}'...")
         results = []
         
         try:
-            url = f"https://api.geckoterminal.com/api/v2/search/pools?query={token_name}"
-            response = self.session.get(url, timeout=10)
-            
-            if response.status_code == 200:
-                data = response.json()
-                for pool in data.get('data', []):
-                    attrs = pool.get('attributes', {})
-                    pool_name = attrs.get('name', '')
-                    
-                    # Only include if pool name matches
-                    if self.is_match(pool_name, token_name):
-                        token_info = {
-                            'platform': 'GeckoTerminal',
-                            'name': pool_name,
-                            'address': attrs.get('address'),
-                            'chain': attrs.get('network', '').upper(),
-                            'dex': attrs.get('dex_id'),
-                            'price_usd': attrs.get('base_token_price_usd'),
-                            'liquidity_usd': attrs.get('reserve_in_usd'),
-                            'volume_24h': attrs.get('volume_usd', {}).get('h24'),
-                            'price_change_24h': attrs.get('price_change_percentage', {}).get('h24'),
-                            'pool_created_at': attrs.get('pool_created_at'),
-                            'url': f"https://www.geckoterminal.com/{attrs.get('network')}/pools/{attrs.get('address')}"
-                        }
-                        results.append(token_info)
-                        if len(results) >= 5:  # Limit to 5 results
-                            break
-                    
+            if provider.listing:
+                data = await self._listing_lookup(provider, token_name)
+            else:
+                data = await self._get_json(platform, provider.url(token_name))
+            if data is not None:
+                results = provider.parse(data, token_name)
+                await self._enrich(provider, results)
         except Exception as e:
-            print(f"❌ GeckoTerminal error: {str(e)}")
+            return self._search_failed(platform, provider.label, e)
             
+        return SearchResults(results)
+    
+    async def _refresh_listing(self, provider: Provider):
+        listing = self.listing(provider.name)
+        try:
+            payload = await self._get_json(provider.name, provider.search_url)
+            if payload is not None:
+                listing.update(payload)
+        finally:
+            listing.end_refresh()
+    
+    async def _refresh_listing_in_background(self, provider: Provider):
+        try:
+            await self._refresh_listing(provider)
+        except Exception as e:
+            self._search_failed(provider.name, f"{provider.label} listing refresh", e)
+    
+    async def _listing_lookup(self, provider: Provider, token_name: str) -> List[Dict]:
+        """Look the query up in the provider's listing; see EnhancedTokenChecker._listing_lookup"""
+        listing = self.listing(provider.name)
+        load = self._listing_loads.get(provider.name)
+        if listing.is_empty:
+            # Cold start: concurrent searches share the one download and all see its error
+            if load is None or load.done():
+                if listing.begin_refresh():
+                    load = self._listing_loads[provider.name] = asyncio.ensure_future(self._refresh_listing(provider))
+                    load.add_done_callback(lambda done: done.cancelled() or done.exception())
+            if load is not None:
+                await asyncio.shield(load)
+            if listing.is_empty:
+                raise PlatformError(f"{provider.name} listing is unavailable")
+        elif listing.is_stale and listing.begin_refresh():
+            self._listing_loads[provider.name] = asyncio.ensure_future(self._refresh_listing_in_background(provider))
+        return listing.lookup(token_name)
+    
+    async def _search_platform(self, platform: str, token_name: str) -> SearchResults:
+        """Answer from the token index when it can; see EnhancedTokenChecker._search_platform"""
+        records = self._from_index(platform, token_name)
+        if records is not None:
+            return SearchResults(records)
+        results = await self.search_provider(platform, token_name)
+        self._index_results(platform, token_name, results)
         return results
     
-    def search_all(self, token_name: str) -> Dict[str, List[Dict]]:
-        """Search all platforms for the token"""
-        print(f"\n{'='*60}")
-        print(f"🚀 Searching for token: {token_name}")
-        print(f"{'='*60}\n")
-        
-        all_results = {
-            'dexscreener': [],
-            'birdeye': [],
-            'coingecko': [],
-            'pumpfun': [],
-            'mexc': [],
-            'coinmarketcap': [],
-            'geckoterminal': []
-        }
+    async def search_all(self, token_name: str, platforms: Optional[Iterable[str]] = None,
+                         budget: Optional[float] = None) -> Dict[str, List[TokenRecord]]:
+        """Search the checker's platforms (or just `platforms`) for the token concurrently"""
+        self._log(f"\n{'='*60}")
+        self._log(f"🚀 Searching for token: {token_name}")
+        self._log(f"{'='*60}\n")
         
-        # Search each platform with delays to avoid rate limiting
-        all_results['dexscreener'] = self.search_dexscreener(token_name)
-        time.sleep(1)
+        platforms = self.platforms if platforms is None else tuple(platforms)
+        found = {platform: results async for platform, results in self._iter_platforms(token_name, platforms, budget)}
+        return {platform: found[platform] for platform in platforms}
+    
+    async def iter_search(self, token_name: str, platforms: Optional[Iterable[str]] = None,
+                          budget: Optional[float] = None) -> AsyncIterator[Tuple[str, List[TokenRecord]]]:
+        """Search the platforms concurrently, yielding (platform, results) as each one answers"""
+        self._log(f"\n{'='*60}")
+        self._log(f"🚀 Searching for token: {token_name}")
+        self._log(f"{'='*60}\n")
+        async for answer in self._iter_platforms(token_name, platforms, budget):
+            yield answer
+    
+    async def _iter_platforms(self, token_name: str, platforms: Optional[Iterable[str]] = None,
+                              budget: Optional[float] = None) -> AsyncIterator[Tuple[str, List[TokenRecord]]]:
+        """Yield (platform, results) as each platform answers; searches past their deadline are cancelled
         
-        all_results['birdeye'] = self.search_birdeye(token_name)
-        time.sleep(1)
+        See EnhancedTokenChecker._iter_platforms. Unlike threads, a late
+        search here is cancelled, so it sends no further requests.
+        """
+        platforms = self.platforms if platforms is None else tuple(platforms)
+        started = time.monotonic()
+        allowed = {platform: self._time_allowed(platform, budget) for platform in platforms}
+        skipped = [platform for platform in platforms if self._cannot_finish(platform, allowed[platform])]
+        tasks = {asyncio.ensure_future(self._search_platform(platform, token_name)): platform
+                 for platform in platforms if platform not in skipped}
+        pending = set(tasks)
+        try:
+            for platform in skipped:
+                yield self._missed_deadline(platform)
+            while pending:
+                next_deadline = started + min(allowed[tasks[task]] for task in pending)
+                timeout = None if next_deadline == float('inf') else max(0.0, next_deadline - time.monotonic())
+                done, pending = await asyncio.wait(pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    yield tasks[task], task.result()
+                expired = [task for task in pending if started + allowed[tasks[task]] <= time.monotonic()]
+                for task in expired:
+                    pending.discard(task)
+                    task.cancel()
+                    yield self._missed_deadline(tasks[task])
+        finally:
+            for task in pending:
+                task.cancel()
+    
+    async def search_many(self, token_names: List[str]) -> Dict[str, Dict[str, List[TokenRecord]]]:
+        """Search all platforms for several tokens on the same event loop"""
+        results = await asyncio.gather(*(self.search_all(token_name) for token_name in token_names))
+        return dict(zip(token_names, results))
+
+
+def normalize_chain(chain: Optional[str]) -> Optional[str]:
+    """Map the platforms' chain spellings ('ETH', 'Solana', 'polygon_pos', ...) to one identifier"""
+    if not chain:
+        return None
+    chain = chain.strip().lower().replace('-', '_').replace(' ', '_')
+    return CHAIN_ALIASES.get(chain, chain)
+
+
+def normalize_address(address: Optional[str]) -> Optional[str]:
+    """EVM addresses are case-insensitive hex, so lowercase them; base58 addresses are kept as is"""
+    if not address:
+        return None
+    address = address.strip()
+    if len(address) == 42 and address[:2].lower() == '0x':
+        return address.lower()
+    return address
+
+
+class TokenResolver:
+    """Merges records that refer to the same asset into consolidated entities
+    
+    Each record is keyed by normalized (chain, address) where the platform
+    reports a token address, and otherwise by the platform's own identifier
+    (CoinGecko id, CoinMarketCap slug, MEXC base asset, GeckoTerminal pool).
+    Records with the same key are merged in one dict lookup, so resolving
+    stays linear in the number of records. Entities are also grouped by
+    symbol, which makes same-symbol tokens at different addresses, the usual
+    impersonator pattern, easy to list.
+    """
+    
+    def __init__(self):
+        self._entities: Dict[str, Dict] = {}
+        self._by_symbol: Dict[str, List[str]] = {}
+        self._failures: Dict[Optional[str], set] = {}
+    
+    @classmethod
+    def from_results(cls, results: Dict[str, List[TokenRecord]], query: Optional[str] = None) -> 'TokenResolver':
+        resolver = cls()
+        resolver.add_results(results, query)
+        return resolver
+    
+    @staticmethod
+    def entity_key(record: Dict) -> Tuple[str, Optional[str], Optional[str]]:
+        """Return (key, chain, address) identifying the asset a record describes"""
+        platform = record.get('platform')
+        chain = normalize_chain(record.get('chain'))
+        address = normalize_address(record.get('address') or record.get('contract_address'))
+        if platform == 'GeckoTerminal':
+            return f"{chain}:pool:{address}", chain, None
+        if address:
+            return f"{chain}:{address}", chain, address
+        if record.get('coingecko_id'):
+            return f"coingecko:{record['coingecko_id']}", chain, None
+        if platform == 'CoinMarketCap':
+            return f"coinmarketcap:{(record.get('url') or '').rstrip('/').rsplit('/', 1)[-1]}", chain, None
+        if platform == 'MEXC':
+            return f"mexc:{record.get('symbol')}", chain, None
+        return f"{platform}:{record.get('name')}:{record.get('symbol')}", chain, None
+    
+    @staticmethod
+    def record_symbol(record: Dict) -> Optional[str]:
+        symbol = record.get('symbol')
+        if not symbol and record.get('platform') == 'GeckoTerminal':
+            # Pool names look like "PEPE / WETH"; the base token comes first
+            symbol = (record.get('name') or '').split(' / ')[0]
+        return symbol.strip().lstrip('$').upper() if symbol else None
+    
+    def add(self, record: Dict, query: Optional[str] = None) -> str:
+        """Merge one platform record and return the key of its entity"""
+        key, chain, address = self.entity_key(record)
+        symbol = self.record_symbol(record)
+        entity = self._entities.get(key)
+        if entity is None:
+            entity = {
+                'entity_id': key,
+                'chain': chain,
+                'address': address,
+                'symbol': symbol,
+                'name': record.get('name'),
+                'listed_on': [],
+                'sources': [],
+                'provenance': {},
+            }
+            self._entities[key] = entity
+            if symbol:
+                self._by_symbol.setdefault(symbol, []).append(key)
         
-        all_results['coingecko'] = self.search_coingecko(token_name)
-        time.sleep(1)
+        platform = record.get('platform')
+        entity['sources'].append({'platform': platform, 'url': record.get('url'), 'query': query})
+        for listing in record.get('listed_on') or ():
+            if listing and listing not in entity['listed_on']:
+                entity['listed_on'].append(listing)
         
-        all_results['pumpfun'] = self.search_pumpfun(token_name)
-        time.sleep(1)
+        # The first source to report a field wins; provenance records which one it was
+        for field, value in record.items():
+            if field in RESOLVER_SKIP_FIELDS or value is None:
+                continue
+            if entity.get(field) is None:
+                entity[field] = value
+                entity['provenance'][field] = platform
+        return key
+    
+    def add_results(self, results: Dict[str, List[TokenRecord]], query: Optional[str] = None):
+        for platform, records in results.items():
+            if getattr(records, 'error', None):
+                self.add_failure(platform, query)
+            for record in records:
+                self.add(record, query)
+    
+    def add_failure(self, platform: str, query: Optional[str] = None):
+        """Note that the platform could not be searched for query, so its silence says nothing"""
+        self._failures.setdefault(query, set()).add(platform)
+    
+    def failed_platforms(self, query: Optional[str] = None) -> set:
+        return self._failures.get(query, set())
+    
+    def entities(self) -> List[Dict]:
+        return list(self._entities.values())
+    
+    def clone_groups(self, min_addresses: int = 2) -> Dict[str, List[Dict]]:
+        """Symbols claimed by at least min_addresses distinct on-chain tokens, with all their entities"""
+        groups = {}
+        for symbol, keys in self._by_symbol.items():
+            entities = [self._entities[key] for key in keys]
+            if sum(1 for entity in entities if entity['address']) >= min_addresses:
+                groups[symbol] = entities
+        return groups
+
+
+def _entity_created_at(entity: Dict) -> Optional[float]:
+    """Earliest known launch time of an entity in epoch seconds"""
+    times = []
+    for field in ('pair_created_at', 'created_timestamp'):
+        if entity.get(field):
+            times.append(entity[field] / 1000)
+    if entity.get('pool_created_at'):
+        try:
+            times.append(datetime.fromisoformat(str(entity['pool_created_at']).replace('Z', '+00:00')).timestamp())
+        except ValueError:
+            pass
+    return min(times) if times else None
+
+
+class RiskScorer:
+    """Scores resolved token entities for rug-pull and impersonation risk, all at once
+    
+    Entities are loaded into NumPy columns and every feature is computed as
+    one array operation, each scaled to 0 (healthy) .. 1 (suspicious):
+    
+    * liquidity_vs_fdv   liquidity under RISK_HEALTHY_LIQUIDITY_RATIO of FDV (or market cap)
+    * young              launched less than RISK_YOUNG_DAYS ago
+    * volume_spike       24h volume many times the liquidity (wash trading, exit pumps)
+    * few_holders        under ~1000 holders, on a log scale
+    * unlisted           token not listed by CoinGecko or CoinMarketCap, matched on chain and
+                         address; by symbol only where the tracker names no contract, which
+                         scores 0.5 if other tokens claim the symbol (reason shared_listing).
+                         Missing when the trackers could not be searched for any query that
+                         found the token
+    * clones             other tokens claiming the same symbol, on any chain
+    
+    The score is the RISK_WEIGHTS-weighted mean of the features an entity
+    has data for, times 100. Requires numpy.
+    """
+    
+    FEATURES = ('liquidity_vs_fdv', 'young', 'volume_spike', 'few_holders', 'unlisted', 'clones')
+    TRACKERS = {'coingecko': 'CoinGecko', 'coinmarketcap': 'CoinMarketCap'}  # platform name: record label
+    
+    def __init__(self, weights: Dict[str, float] = RISK_WEIGHTS):
+        if np is None:
+            raise ImportError("RiskScorer requires numpy (pip install numpy)")
+        self.weights = np.array([weights.get(feature, 0.0) for feature in self.FEATURES])
+    
+    @staticmethod
+    def _column(entities: List[Dict], field: str) -> 'np.ndarray':
+        values = (entity.get(field) for entity in entities)
+        return np.fromiter((np.nan if value is None else value for value in values), dtype=float, count=len(entities))
+    
+    def features(self, resolver: TokenResolver, now: Optional[float] = None) -> Tuple[List[Dict], 'np.ndarray']:
+        """(entities, matrix) with one row per entity and one column per feature, NaN where data is missing"""
+        entities = resolver.entities()
+        count = len(entities)
+        now = time.time() if now is None else now
+        liquidity = self._column(entities, 'liquidity_usd')
+        valuation = self._column(entities, 'fdv')
+        valuation = np.where(np.isnan(valuation), self._column(entities, 'market_cap'), valuation)
+        volume = self._column(entities, 'volume_24h')
+        holders = self._column(entities, 'holder_count')
+        created = np.fromiter((np.nan if t is None else t for t in map(_entity_created_at, entities)),
+                              dtype=float, count=count)
         
-        all_results['mexc'] = self.search_mexc(token_name)
-        time.sleep(1)
+        # Per symbol: how many on-chain tokens claim it. Per tracker listing: the contracts it names, or
+        # just its symbol when the tracker gives no address (CoinMarketCap)
+        on_chain: Dict[str, int] = {}
+        listed_contracts = set()
+        addressed_symbols = set()
+        listed_symbols = set()
+        for entity in entities:
+            symbol = entity['symbol']
+            if entity['address']:
+                on_chain[symbol] = on_chain.get(symbol, 0) + 1
+            if not self._from_tracker(entity):
+                continue
+            contracts = {tuple(contract.split(':', 1)) for contract in entity.get('contract_addresses') or ()}
+            if entity['address']:
+                contracts.add((entity['chain'], entity['address']))
+            if contracts:
+                listed_contracts.update(contracts)
+                addressed_symbols.add(symbol)
+            else:
+                listed_symbols.add(symbol)
+        # Clone counts only say something about on-chain tokens, not the trackers' own entries
+        clones = np.fromiter((on_chain.get(entity['symbol'], 0) if entity['address'] else np.nan for entity in entities),
+                             dtype=float, count=count)
         
-        all_results['coinmarketcap'] = self.search_coinmarketcap(token_name)
-        time.sleep(1)
+        def listing(entity: Dict) -> int:
+            """2 if a tracker lists this very token, 1 if one lists its symbol and names no contracts, else 0"""
+            if (entity['chain'], entity['address']) in listed_contracts or (not entity['address'] and self._from_tracker(entity)):
+                return 2
+            symbol = entity['symbol']
+            if symbol in listed_symbols and not (entity['address'] and symbol in addressed_symbols):
+                return 1
+            return 0
         
-        all_results['geckoterminal'] = self.search_geckoterminal(token_name)
+        listed = np.fromiter(map(listing, entities), dtype=int, count=count)
+        # Not being listed only counts when some query that found the token got an answer from the trackers
+        trackers = set(self.TRACKERS)
+        checked = np.fromiter((any(not resolver.failed_platforms(source['query']) & trackers
+                                   for source in entity['sources']) for entity in entities), dtype=bool, count=count)
         
-        return all_results
+        with np.errstate(divide='ignore', invalid='ignore'):
+            columns = [
+                1 - np.clip(liquidity / valuation / RISK_HEALTHY_LIQUIDITY_RATIO, 0, 1),
+                1 - np.clip((now - created) / 86400 / RISK_YOUNG_DAYS, 0, 1),
+                np.clip(np.log10(volume / liquidity) / 2, 0, 1),
+                1 - np.clip(np.log10(np.maximum(holders, 1)) / 3, 0, 1),
+                np.where(listed == 2, 0.0, np.where(listed == 1, np.where(clones > 1, 0.5, 0.0),  # NaN clones compare False
+                                                    np.where(checked, 1.0, np.nan))),
+                np.clip((clones - 1) / 5, 0, 1),
+            ]
+        matrix = np.column_stack(columns) if count else np.empty((0, len(self.FEATURES)))
+        # A zero valuation or liquidity leaves inf/NaN ratios; treat them as missing data
+        matrix[~np.isfinite(matrix)] = np.nan
+        return entities, matrix
     
-    def display_results(self, results: Dict[str, List[Dict]]):
-        """Display formatted results"""
-        total_found = sum(len(v) for v in results.values())
-        
-        print(f"\n{'='*60}")
-        print(f"📊 SEARCH RESULTS - Found {total_found} total matches")
-        print(f"{'='*60}\n")
-        
-        if total_found == 0:
-            print("❌ No tokens found matching your search.")
-            print("\n💡 Try:")
-            print("   • Different spelling or token symbol")
-            print("   • Searching by contract address if you have it")
-            print("   • Checking these explorers manually:")
-            print("     - Etherscan: https://etherscan.io/tokens")
-            print("     - BSCScan: https://bscscan.com/tokens")
-            print("     - Solscan: https://solscan.io")
-            print("     - OKLink: https://www.oklink.com")
-            return
+    def _from_tracker(self, entity: Dict) -> bool:
+        return any(source['platform'] in self.TRACKERS.values() for source in entity['sources'])
+    
+    @staticmethod
+    def _reason(feature: str, value: float) -> str:
+        # A listed symbol claimed by several tokens is not unlisted, just ambiguous
+        if feature == 'unlisted' and value < 1:
+            return 'shared_listing'
+        return feature
+    
+    def score(self, resolver: TokenResolver, now: Optional[float] = None) -> List[Dict]:
+        """Entities ranked riskiest first, each with risk_score (0-100), its features and the main reasons"""
+        entities, matrix = self.features(resolver, now)
+        if not entities:
+            return []
+        known = ~np.isnan(matrix)
+        weights = np.where(known, self.weights, 0.0)
+        totals = weights.sum(axis=1)
+        with np.errstate(invalid='ignore'):
+            scores = np.where(totals > 0, np.nansum(matrix * weights, axis=1) / totals, 0.0) * 100
         
-        for platform, tokens in results.items():
-            if tokens:
-                print(f"\n{'─'*60}")
-                print(f"🔹 {platform.upper()} ({len(tokens)} results)")
-                print(f"{'─'*60}")
+        ranked = []
+        for row in np.argsort(-scores, kind='stable'):
+            entity = entities[row]
+            features = {name: round(float(value), 3) for name, value in zip(self.FEATURES, matrix[row]) if not np.isnan(value)}
+            ranked.append({
+                'entity_id': entity['entity_id'],
+                'symbol': entity['symbol'],
+                'name': entity.get('name'),
+                'chain': entity['chain'],
+                'address': entity['address'],
+                'risk_score': round(float(scores[row]), 1),
+                'reasons': [self._reason(name, value) for name, value in features.items() if value >= 0.5],
+                'features': features,
+                'platforms': list(dict.fromkeys(source['platform'] for source in entity['sources'])),
+            })
+        return ranked
+
+
+def load_batch_results(path: str) -> TokenResolver:
+    """Resolve every record in a batch output file, either one line per token or one per record (--ndjson)"""
+    resolver = TokenResolver()
+    with open(path) as f:
+        for line in f:
+            if not line.strip():
+                continue
+            document = json.loads(line)
+            if 'results' in document:
+                resolver.add_results(document['results'] or {}, document.get('token'))
+                for platform in document.get('errors') or {}:
+                    resolver.add_failure(platform, document.get('token'))
+            elif 'error' in document and 'source' in document:
+                resolver.add_failure(document['source'], document.get('query'))
+            elif 'platform' in document:
+                query = document.pop('query', None)
+                document.pop('source', None)
+                resolver.add(document, query)
+    return resolver
+
+
+def write_risk_report(resolver: TokenResolver, output: str, top: int = 10):
+    """Score every entity, write the ranking as JSON Lines to output and print the riskiest ones"""
+    ranked = RiskScorer().score(resolver)
+    with NDJSONWriter(output) as out:
+        for entry in ranked:
+            out.write(entry)
+    print(f"🚨 Risk scores for {len(ranked)} tokens saved to {output}; riskiest:", file=sys.stderr)
+    for entry in ranked[:top]:
+        reasons = ', '.join(entry['reasons']) or 'no strong signals'
+        print(f"   {entry['risk_score']:5.1f}  {entry['symbol'] or '?':<10} {entry['chain'] or '':<10} "
+              f"{entry['address'] or entry['entity_id']}  ({reasons})", file=sys.stderr)
+
+
+def read_token_names(source: str) -> Iterator[str]:
+    """Yield distinct token names or addresses from a file ('-' for stdin), one per line
+    
+    Blank lines and lines starting with '#' are skipped.
+    """
+    f = sys.stdin if source == '-' else open(source)
+    seen = set()
+    try:
+        for line in f:
+            token_name = line.strip()
+            if token_name and not token_name.startswith('#') and token_name not in seen:
+                seen.add(token_name)
+                yield token_name
+    finally:
+        if f is not sys.stdin:
+            f.close()
+
+
+class NDJSONWriter:
+    """Writes one JSON document per line to a file or stdout ('-'), flushing as it goes"""
+    
+    def __init__(self, target: str = '-'):
+        self.target = target
+        self._stream: TextIO = sys.stdout if target == '-' else open(target, 'w')
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc_info):
+        self.close()
+    
+    def write(self, document: Dict):
+        self._stream.write(json.dumps(document, default=json_default) + '\n')
+        self._stream.flush()
+    
+    def write_records(self, query: str, platform: str, records: List[TokenRecord]):
+        """Write each record on its own line, tagged with the query and platform key"""
+        for record in records:
+            self.write({'query': query, 'source': platform, **record})
+    
+    def close(self):
+        if self._stream is not sys.stdout:
+            self._stream.close()
+
+
+def diff_records(previous: List[TokenRecord], current: List[TokenRecord],
+                 thresholds: Dict[str, float] = WATCH_THRESHOLDS) -> List[Dict]:
+    """Changes between two results of the same search: new and removed records, and field moves over threshold"""
+    before = {TokenIndex.record_key(record): record for record in previous}
+    after = {TokenIndex.record_key(record): record for record in current}
+    changes = []
+    for key, record in after.items():
+        old = before.get(key)
+        if old is None:
+            changes.append({'event': 'new', 'key': key, 'record': record})
+            continue
+        for field, threshold in thresholds.items():
+            old_value, new_value = old.get(field), record.get(field)
+            if old_value is None or new_value is None or old_value == new_value:
+                continue
+            # A move away from zero has no percentage; it is always reported, with change_pct None
+            change = (new_value - old_value) / abs(old_value) if old_value else None
+            if change is None or abs(change) >= threshold:
+                changes.append({'event': 'change', 'key': key, 'record': record, 'field': field, 'old': old_value,
+                                'new': new_value, 'change_pct': round(change * 100, 2) if change is not None else None})
+    for key, record in before.items():
+        if key not in after:
+            changes.append({'event': 'removed', 'key': key, 'record': record})
+    return changes
+
+
+def watch_cache(intervals: Dict[str, float], db_path: Optional[str] = None) -> ResponseCache:
+    """A response cache whose entries expire before the next poll of their platform
+    
+    Shared snapshots such as MEXC tickers are still reused by every token
+    polled within the same interval.
+    """
+    rules = [(platform, fragment, min(ttl, intervals.get(platform, ttl) * 0.9))
+             for platform, fragment, ttl in CACHE_TTL_RULES]
+    defaults = {platform: min(ttl, intervals.get(platform, ttl) * 0.9) for platform, ttl in CACHE_DEFAULT_TTLS.items()}
+    return ResponseCache(db_path=db_path, ttl_rules=rules, default_ttls=defaults)
+
+
+class Watcher:
+    """Polls every (token, platform) pair on its own schedule and yields only what changed
+    
+    Each pair is re-searched every intervals[platform] seconds. A pair whose
+    results come back unchanged waits twice as long next time, up to
+    max_backoff times its interval, and drops back to the base interval as
+    soon as it changes, so quiet tokens cost little and moving ones are
+    watched closely. The first poll of a pair sets its baseline silently;
+    failed polls keep the previous snapshot. Polls always go to the network,
+    so an offline checker cannot be watched.
+    """
+    
+    def __init__(self, checker: EnhancedTokenChecker, token_names: Iterable[str],
+                 intervals: Optional[Dict[str, float]] = None, thresholds: Dict[str, float] = WATCH_THRESHOLDS,
+                 workers: int = 4, max_backoff: float = WATCH_MAX_BACKOFF, platforms: Optional[Iterable[str]] = None):
+        if checker.offline:
+            raise ValueError("cannot watch for changes with an offline checker")
+        self.checker = checker
+        self.token_names = list(dict.fromkeys(token_names))
+        self.platforms = checker.platforms if platforms is None else tuple(platforms)
+        self.intervals = {**{platform: checker.provider(platform).watch_interval for platform in self.platforms},
+                          **(intervals or {})}
+        self.thresholds = thresholds
+        self.workers = workers
+        self.max_backoff = max_backoff
+        self.snapshots: Dict[Tuple[str, str], List[TokenRecord]] = {}
+        self.backoff: Dict[Tuple[str, str], float] = {}
+        self.polls = 0
+        self._done = queue.Queue()
+        self._stop = threading.Event()
+    
+    def stop(self):
+        self._stop.set()
+    
+    def _poll(self, token_name: str, platform: str):
+        try:
+            results = self.checker.search_provider(platform, token_name)
+            self.checker._index_results(platform, token_name, results)
+        except Exception as e:
+            results = SearchResults(error=str(e))
+        self._done.put((token_name, platform, results))
+    
+    def _update(self, token_name: str, platform: str, results: SearchResults) -> List[Dict]:
+        """Diff a poll against the pair's snapshot and adjust when it is polled next"""
+        pair = (token_name, platform)
+        if results.error is not None:
+            return []
+        previous = self.snapshots.get(pair)
+        self.snapshots[pair] = results
+        if previous is None:
+            return []
+        changes = diff_records(previous, results, self.thresholds)
+        if changes:
+            self.backoff[pair] = 1.0
+        else:
+            self.backoff[pair] = min(self.max_backoff, self.backoff.get(pair, 1.0) * 2)
+        now = datetime.now().isoformat(timespec='seconds')
+        return [{'time': now, 'token': token_name, 'platform': platform, **change} for change in changes]
+    
+    def run(self, duration: Optional[float] = None) -> Iterator[Dict]:
+        """Poll until stop() is called or duration seconds pass, yielding change events as they are found"""
+        deadline = time.monotonic() + duration if duration is not None else None
+        order = itertools.count()
+        start = time.monotonic()
+        schedule = [(start, next(order), token_name, platform)
+                    for token_name in self.token_names for platform in self.platforms]
+        heapq.heapify(schedule)
+        in_flight = 0
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            while not self._stop.is_set() and (deadline is None or time.monotonic() < deadline):
+                now = time.monotonic()
+                while schedule and schedule[0][0] <= now and in_flight < self.workers:
+                    _, _, token_name, platform = heapq.heappop(schedule)
+                    executor.submit(self._poll, token_name, platform)
+                    in_flight += 1
                 
-                for i, token in enumerate(tokens, 1):
-                    print(f"\n  #{i}")
-                    for key, value in token.items():
-                        if value is not None and key != 'description':
-                            # Format large numbers
-                            if isinstance(value, (int, float)) and value > 1000:
-                                if key in ['liquidity_usd', 'volume_24h', 'market_cap', 'fdv']:
-                                    value = f"${value:,.2f}"
-                                elif key in ['supply', 'circulating_supply', 'total_supply', 'max_supply']:
-                                    value = f"{value:,.0f}"
-                                elif key == 'holder_count':
-                                    value = f"{value:,}"
-                            
-                            # Format timestamps
-                            if key in ['pair_created_at', 'pool_created_at', 'created_timestamp']:
-                                try:
-                                    if isinstance(value, (int, float)):
-                                        dt = datetime.fromtimestamp(value / 1000 if value > 10000000000 else value)
-                                        value = dt.strftime("%Y-%m-%d %H:%M:%S")
-                                except:
-                                    pass
-                            
-                            # Format lists
-                            if isinstance(value, list):
-                                value = ', '.join(str(v) for v in value if v)
-                            
-                            print(f"    {key.replace('_', ' ').title()}: {value}")
-                    
-                    # Show description if available
-                    if token.get('description'):
-                        desc = token['description']
-                        if len(desc) > 150:
-                            desc = desc[:150] + "..."
-                        print(f"    Description: {desc}")
-        
-        # Add helpful links at the end
-        print(f"\n{'='*60}")
-        print("💡 TIP: For more detailed info, also check:")
-        print("   • Etherscan (ETH): https://etherscan.io/tokens")
-        print("   • BSCScan (BSC): https://bscscan.com/tokens") 
-        print("   • Solscan (Solana): https://solscan.io")
-        print("   • OKLink (Multi-chain): https://www.oklink.com")
-        print(f"{'='*60}\n")
+                wait = 1.0
+                if schedule and in_flight < self.workers:
+                    wait = min(wait, max(0.0, schedule[0][0] - now))
+                try:
+                    token_name, platform, results = self._done.get(timeout=wait)
+                except queue.Empty:
+                    continue
+                in_flight -= 1
+                self.polls += 1
+                yield from self._update(token_name, platform, results)
+                pair = (token_name, platform)
+                next_poll = time.monotonic() + self.intervals.get(platform, WATCH_DEFAULT_INTERVAL) * self.backoff.get(pair, 1.0)
+                heapq.heappush(schedule, (next_poll, next(order), token_name, platform))
+            self._stop.set()
+
+
+def format_watch_event(event: Dict) -> str:
+    record = event['record']
+    label = record.get('symbol') or record.get('name') or event['key']
+    where = f"{event['token']} @ {event['platform']}"
+    if event['event'] == 'new':
+        return f"🆕 [{event['time']}] {where}: new {label} ({record.get('chain') or record.get('dex') or record.get('url')})"
+    if event['event'] == 'removed':
+        return f"🗑️  [{event['time']}] {where}: {label} no longer listed"
+    icon = '📈' if event['new'] > event['old'] else '📉'
+    field = event['field'].replace('_', ' ')
+    change = f"{event['change_pct']:+.1f}% " if event['change_pct'] is not None else ''
+    return f"{icon} [{event['time']}] {where}: {label} {field} {change}({event['old']:,.6g} → {event['new']:,.6g})"
+
+
+def run_watch(checker: EnhancedTokenChecker, source: str, intervals: Dict[str, float], workers: int,
+              output: Optional[str] = None, duration: Optional[float] = None):
+    """Watch every token in source, printing each change, or writing it as NDJSON to output ('-' for stdout)"""
+    watcher = Watcher(checker, read_token_names(source), intervals=intervals, workers=workers)
+    print(f"👀 Watching {len(watcher.token_names)} tokens on {len(watcher.platforms)} platforms "
+          f"(Ctrl+C to stop)", file=sys.stderr)
+    writer = NDJSONWriter(output) if output else None
+    started = time.time()
+    changes = 0
+    try:
+        for event in watcher.run(duration):
+            changes += 1
+            if writer is not None:
+                writer.write(event)
+            else:
+                print(format_watch_event(event))
+    except KeyboardInterrupt:
+        watcher.stop()
+    finally:
+        if writer is not None:
+            writer.close()
+    print(f"\n👀 {watcher.polls} polls, {changes} changes in {time.time() - started:.0f}s", file=sys.stderr)
+
+
+def print_platform_timings(metrics: Metrics, file: TextIO = sys.stdout):
+    """One line per platform with search latency and failure counts, slowest first"""
+    platforms = metrics.snapshot()['platforms']
+    timed = [(platform, stats) for platform, stats in platforms.items() if stats['search_latency']]
+    if not timed:
+        return
+    print("⏱️  Search time per platform (p50 / p95, bucket upper bounds):", file=file)
+    for platform, stats in sorted(timed, key=lambda item: item[1]['search_latency']['mean'], reverse=True):
+        latency = stats['search_latency']
+        p50, p95 = (f"≤{value:g}s" if value is not None else ">30s" for value in (latency['p50'], latency['p95']))
+        problems = ''
+        if stats['search_errors'] or stats['enrichment_failures']:
+            problems = f", {stats['search_errors']} errors, {stats['enrichment_failures']} enrichment failures"
+        if stats['deadline_misses']:
+            problems += f", {stats['deadline_misses']} past deadline"
+        print(f"   • {platform:<14} {p50:>7} / {p95:<7} mean {latency['mean']:.2f}s over {latency['count']} searches{problems}",
+              file=file)
+
+
+def run_batch(checker: EnhancedTokenChecker, source: str, output: str, workers: int, per_record: bool = False,
+              entities_output: Optional[str] = None, risk_output: Optional[str] = None,
+              renderer: Optional[ResultRenderer] = None):
+    """Check every token in source, streaming JSON Lines to output ('-' for stdout)
     
-    def save_results(self, results: Dict[str, List[Dict]], filename: str = "token_results.json"):
-        """Save results to JSON file"""
+    By default each line holds one token's full results, with the platforms
+    that could not be searched and why under "errors"; with per_record every
+    matched record is written on its own line as soon as its platform answers,
+    and a failed platform as a {"query", "source", "error"} line.
+    With entities_output, records are also resolved across platforms and the
+    consolidated entities are written there at the end; with risk_output the
+    entities are also ranked by RiskScorer. With a renderer, every record is
+    also printed in that format as its platform answers.
+    """
+    checked = failed = platform_failures = 0
+    started = time.time()
+    resolver = TokenResolver() if entities_output or risk_output else None
+    if renderer is not None:
+        renderer.start()
+    with NDJSONWriter(output) as out:
+        tokens = checker.stream_batch(read_token_names(source), workers=workers)
+        found: Dict[str, Dict[str, List[TokenRecord]]] = {}
+        errors: Dict[str, Dict[str, str]] = {}
+        for token_name, platform, results, error in tokens:
+            if platform is not None:
+                if renderer is not None:
+                    renderer.render(platform, results, query=token_name)
+                if results.error is not None:
+                    errors.setdefault(token_name, {})[platform] = results.error
+                    if resolver is not None:
+                        resolver.add_failure(platform, token_name)
+                if resolver is not None:
+                    for record in results:
+                        resolver.add(record, token_name)
+                if per_record:
+                    if results.error is not None:
+                        out.write({'query': token_name, 'source': platform, 'error': results.error})
+                    out.write_records(token_name, platform, results)
+                    found.setdefault(token_name, {})[platform] = len(results)
+                else:
+                    found.setdefault(token_name, {})[platform] = results
+                continue
+            
+            checked += 1
+            token_results = found.pop(token_name, {})
+            token_errors = errors.pop(token_name, {})
+            if error:
+                failed += 1
+                out.write({'token': token_name, 'results': None, 'errors': token_errors, 'error': error})
+                print(f"❌ [{checked}] {token_name}: {error}", file=sys.stderr)
+                continue
+            
+            platform_failures += len(token_errors)
+            if per_record:
+                total_found = sum(token_results.values())
+            else:
+                total_found = sum(len(v) for v in token_results.values())
+                out.write({'token': token_name, 'results': {p: token_results.get(p, []) for p in checker.platforms},
+                           'errors': token_errors, 'error': None})
+            unanswered = f" (no answer from {', '.join(token_errors)})" if token_errors else ""
+            print(f"✅ [{checked}] {token_name}: {total_found} matches{unanswered}", file=sys.stderr)
+    if renderer is not None:
+        renderer.flush()
+    
+    print(f"\n📦 Checked {checked} tokens ({failed} failed, {platform_failures} platform searches failed) "
+          f"in {time.time() - started:.1f}s", file=sys.stderr)
+    print_platform_timings(checker.metrics, file=sys.stderr)
+    if output != '-':
+        print(f"💾 Results saved to {output}", file=sys.stderr)
+    
+    if risk_output:
+        write_risk_report(resolver, risk_output)
+    if entities_output:
+        clones = {symbol: len(entities) for symbol, entities in resolver.clone_groups().items()}
+        with NDJSONWriter(entities_output) as out:
+            for entity in resolver.entities():
+                out.write({**entity, 'same_symbol_tokens': clones.get(entity['symbol'], 0)})
+        print(f"🔗 {len(resolver.entities())} distinct tokens, {len(clones)} symbols with look-alikes, "
+              f"saved to {entities_output}", file=sys.stderr)
+
+
+class TokenAPIHandler(BaseHTTPRequestHandler):
+    """Routes for TokenAPIServer; every response is JSON except /metrics"""
+    
+    server: 'TokenAPIServer'
+    protocol_version = 'HTTP/1.1'
+    
+    def do_GET(self):
+        parts = urlsplit(self.path)
+        params = dict(parse_qsl(parts.query))
+        path = parts.path.rstrip('/')
+        if path == '/health':
+            return self._send(200, self.server.health())
+        if path == '/metrics':
+            return self._send_text(200, self.server.checker.metrics.render_prometheus())
+        if path == '/metrics.json':
+            return self._send(200, self.server.checker.metrics.snapshot())
+        if path == '/search' or path.startswith('/search/'):
+            query = params.get('q', '').strip()
+            if not query:
+                return self._send(400, {'error': "missing query parameter 'q'"})
+            if path == '/search':
+                platforms = params.get('platforms')
+                platforms = platforms.split(',') if platforms else self.server.checker.platforms
+            else:
+                platforms = [path[len('/search/'):]]
+            return self._search([query], platforms, single=True)
+        self._send(404, {'error': f"unknown path {parts.path}"})
+    
+    def do_POST(self):
+        # Read the body before any reply, or it would be parsed as the next request on this connection
         try:
-            with open(filename, 'w') as f:
-                json.dump(results, f, indent=2)
-            print(f"💾 Results saved to {filename}")
+            length = int(self.headers.get('Content-Length') or 0)
+        except ValueError:
+            length = -1
+        if length < 0:
+            self.close_connection = True
+            return self._send(400, {'error': "invalid Content-Length"})
+        raw_body = self.rfile.read(length)
+        if urlsplit(self.path).path.rstrip('/') != '/batch':
+            return self._send(404, {'error': f"unknown path {self.path}"})
+        try:
+            body = json.loads(raw_body or b'{}')
+            tokens = body.get('tokens', [])
+            platforms = body.get('platforms') or self.server.checker.platforms
+        except (ValueError, AttributeError):
+            return self._send(400, {'error': "expected a JSON object like {\"tokens\": [...], \"platforms\": [...]}"})
+        for field, value in (('tokens', tokens), ('platforms', platforms)):
+            if not isinstance(value, (list, tuple)) or not all(isinstance(item, str) for item in value):
+                return self._send(400, {'error': f"'{field}' must be a list of strings"})
+        tokens = [token.strip() for token in tokens if token.strip()]
+        if not tokens:
+            return self._send(400, {'error': "no tokens given"})
+        if len(tokens) > SERVER_MAX_BATCH:
+            return self._send(413, {'error': f"at most {SERVER_MAX_BATCH} tokens per batch"})
+        self._search(list(dict.fromkeys(tokens)), platforms, single=False)
+    
+    def _search(self, queries: List[str], platforms: Iterable[str], single: bool):
+        platforms = tuple(dict.fromkeys(platforms))
+        unknown = [platform for platform in platforms if platform not in PROVIDERS]
+        if unknown:
+            return self._send(400, {'error': f"unknown platforms: {', '.join(unknown)}", 'platforms': list(PROVIDERS)})
+        
+        # Backpressure: refuse work the upstream limits could not serve in time, rather than queueing it
+        backlog = self.server.backlog(platforms)
+        if backlog > self.server.max_queue_delay:
+            return self._send(429, {'error': "upstream rate limits are saturated", 'retry_after': round(backlog, 1)},
+                              retry_after=backlog)
+        if not self.server.begin():
+            return self._send(503, {'error': "too many lookups in progress"}, retry_after=1)
+        try:
+            started = time.perf_counter()
+            if single:
+                results = self.server.lookup(queries[0], platforms)
+                document = {'query': queries[0], 'results': results, 'errors': platform_errors(results),
+                            'total': sum(len(records) for records in results.values())}
+            else:
+                document = {'results': {}, 'platform_errors': {}, 'errors': {}}
+                with ThreadPoolExecutor(max_workers=SERVER_BATCH_WORKERS) as executor:
+                    futures = {executor.submit(self.server.lookup, query, platforms): query for query in queries}
+                    for future in as_completed(futures):
+                        query = futures[future]
+                        try:
+                            document['results'][query] = future.result()
+                        except Exception as e:
+                            document['errors'][query] = str(e)
+                            continue
+                        failures = platform_errors(document['results'][query])
+                        if failures:
+                            document['platform_errors'][query] = failures
+            document['elapsed_ms'] = round((time.perf_counter() - started) * 1000, 1)
+            self._send(200, document)
         except Exception as e:
-            print(f"❌ Error saving results: {str(e)}")
+            self._send(500, {'error': str(e)})
+        finally:
+            self.server.end()
+    
+    def _send(self, status: int, document: Any, retry_after: Optional[float] = None):
+        self._send_bytes(status, json.dumps(document, default=json_default).encode(), 'application/json', retry_after)
+    
+    def _send_text(self, status: int, text: str):
+        self._send_bytes(status, text.encode(), 'text/plain; version=0.0.4')
+    
+    def _send_bytes(self, status: int, body: bytes, content_type: str, retry_after: Optional[float] = None):
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        if retry_after is not None:
+            self.send_header('Retry-After', str(max(1, int(retry_after + 0.999))))
+        if self.close_connection:
+            self.send_header('Connection', 'close')
+        self.end_headers()
+        self.wfile.write(body)
+    
+    def log_message(self, format: str, *args):
+        if self.server.checker.verbose:
+            super().log_message(format, *args)
+
+
+class TokenAPIServer(ThreadingHTTPServer):
+    """Local HTTP JSON API sharing one warm checker between many clients
+    
+    GET /search?q=NAME[&platforms=a,b], GET /search/PLATFORM?q=NAME and
+    POST /batch {"tokens": [...], "platforms": [...]} answer with the
+    search_all result shape. Identical lookups in flight at the same time
+    share one upstream search. At most max_concurrent lookups run at once,
+    and requests that would wait more than max_queue_delay for the upstream
+    rate limits get 429 with Retry-After instead of piling up. /health,
+    /metrics and /metrics.json report on the process.
+    """
+    
+    daemon_threads = True
+    
+    def __init__(self, checker: EnhancedTokenChecker, host: str = '127.0.0.1', port: int = SERVER_PORT,
+                 max_concurrent: int = SERVER_MAX_CONCURRENT, max_queue_delay: float = SERVER_MAX_QUEUE_DELAY):
+        super().__init__((host, port), TokenAPIHandler)
+        self.checker = checker
+        self.flights = SingleFlight()
+        self.slots = threading.BoundedSemaphore(max_concurrent)
+        self.max_queue_delay = max_queue_delay
+        self.in_progress = 0
+        self._count_lock = threading.Lock()
+        self.started = time.time()
+    
+    def begin(self) -> bool:
+        """Take a lookup slot, waiting up to SERVER_SLOT_WAIT seconds; False when none frees up"""
+        if not self.slots.acquire(timeout=SERVER_SLOT_WAIT):
+            return False
+        with self._count_lock:
+            self.in_progress += 1
+        return True
+    
+    def end(self):
+        with self._count_lock:
+            self.in_progress -= 1
+        self.slots.release()
+    
+    def lookup(self, query: str, platforms: Tuple[str, ...]) -> Dict[str, List[TokenRecord]]:
+        """search_all, coalesced with any identical lookup already running"""
+        key = (TokenIndex.normalize_query(query), platforms)
+        return self.flights.do(key, self.checker.search_all, query, platforms=platforms)
+    
+    def backlog(self, platforms: Iterable[str]) -> float:
+        """Longest upstream wait for a full search among the platforms; open circuits fail fast, so they do not count"""
+        waits = [self.checker.limiter.backlog(platform, self.checker.provider(platform).cost) for platform in platforms]
+        return max((wait for wait in waits if wait != float('inf')), default=0.0)
+    
+    def health(self) -> Dict[str, Any]:
+        backlog = {platform: self.checker.limiter.backlog(platform) for platform in self.checker.platforms}
+        checker = self.checker
+        return {
+            'status': 'ok',
+            'uptime_seconds': round(time.time() - self.started, 1),
+            'lookups_in_progress': self.in_progress,
+            'coalesced_lookups': self.flights.shared,
+            'upstream_wait_seconds': {platform: None if wait == float('inf') else round(wait, 2)
+                                      for platform, wait in backlog.items()},
+            'open_circuits': [platform for platform, wait in backlog.items() if wait == float('inf')],
+            'cache': checker.cache.stats() if checker.cache is not None else None,
+            'index': checker.index.stats() if checker.index is not None else None,
+        }
+
+
+def run_server(checker: EnhancedTokenChecker, host: str, port: int):
+    """Serve the JSON API until interrupted"""
+    server = TokenAPIServer(checker, host, port)
+    print(f"🌐 Token checker API on http://{host}:{server.server_address[1]} "
+          f"(GET /search?q=NAME, GET /search/PLATFORM?q=NAME, POST /batch, GET /health)", file=sys.stderr)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        print("\n👋 Server stopped", file=sys.stderr)
 
 
-def main():
+def main(argv: Optional[List[str]] = None):
     """Main function to run the token checker"""
-    checker = EnhancedTokenChecker()
+    parser = argparse.ArgumentParser(description="Search for tokens across blockchain platforms")
+    parser.add_argument('--no-cache', action='store_true', help="always query the APIs, bypassing the response cache")
+    parser.add_argument('--cache-db', nargs='?', const=CACHE_DB_FILE, default=None, metavar='PATH',
+                        help=f"also keep cached responses in SQLite (default path: {CACHE_DB_FILE})")
+    parser.add_argument('--batch', metavar='FILE',
+                        help="check every token name or address listed in FILE ('-' for stdin) without prompting")
+    parser.add_argument('--output', default='batch_results.jsonl', metavar='FILE',
+                        help="where batch mode writes its JSON Lines results, '-' for stdout (default: %(default)s)")
+    parser.add_argument('--ndjson', action='store_true',
+                        help="in batch mode, stream one line per matched record as each platform answers; "
+                             "in watch mode, write change events to --output as NDJSON")
+    parser.add_argument('--entities', metavar='FILE',
+                        help="in batch mode, also merge records for the same token across platforms and write them to FILE")
+    parser.add_argument('--risk', metavar='FILE',
+                        help="in batch mode, rank the tokens found by rug-pull and impersonation risk into FILE (needs numpy)")
+    parser.add_argument('--score', metavar='RESULTS',
+                        help="rank the tokens in an existing batch results file by risk into --risk FILE, then exit")
+    parser.add_argument('--format', choices=sorted(RENDERERS), metavar='{text,table,csv}',
+                        help="how results are printed: labelled fields (text, the default), one row per record (table) "
+                             "or CSV; in batch mode, also print every record to stdout in this format")
+    parser.add_argument('--workers', type=int, default=4,
+                        help="tokens searched concurrently in batch mode (default: %(default)s)")
+    parser.add_argument('--watch', metavar='FILE',
+                        help="keep re-checking the tokens listed in FILE and report only what changes")
+    parser.add_argument('--interval', type=float, metavar='SECONDS',
+                        help="in watch mode, poll every platform this often instead of its default pace")
+    parser.add_argument('--serve', nargs='?', type=int, const=SERVER_PORT, default=None, metavar='PORT',
+                        help=f"run a local HTTP JSON API instead of prompting (default port: {SERVER_PORT})")
+    parser.add_argument('--host', default='127.0.0.1',
+                        help="address the API server listens on (default: %(default)s)")
+    parser.add_argument('--metrics-port', type=int, metavar='PORT',
+                        help="serve Prometheus metrics at http://127.0.0.1:PORT/metrics while running")
+    parser.add_argument('--index', nargs='?', const=TOKEN_INDEX_FILE, default=None, metavar='PATH',
+                        help=f"keep every result in a local token index and answer repeat queries from it "
+                             f"(default path: {TOKEN_INDEX_FILE})")
+    parser.add_argument('--index-ttl', type=float, default=TOKEN_INDEX_TTL, metavar='SECONDS',
+                        help="how long indexed results answer repeat queries before being refreshed (default: %(default)s)")
+    parser.add_argument('--offline', action='store_true',
+                        help="answer only from the local token index, without any network requests (implies --index)")
+    parser.add_argument('--platforms', metavar='NAMES',
+                        help=f"comma-separated platforms to search (default: all of {','.join(PLATFORMS)})")
+    parser.add_argument('--budget', type=float, metavar='SECONDS',
+                        help="return each lookup's results after this long, leaving out platforms still searching")
+    parser.add_argument('--deadline', action='append', default=[], metavar='PLATFORM=SECONDS',
+                        help="how long a lookup waits for one platform; may be repeated")
+    parser.add_argument('--plugin', action='append', default=[], metavar='NAME=MODULE:CLASS',
+                        help="add a Provider subclass as platform NAME, imported only if it is searched; may be repeated")
+    args = parser.parse_args(argv)
+    for plugin in args.plugin:
+        name, _, spec = plugin.partition('=')
+        if not name or ':' not in spec:
+            parser.error(f"--plugin expects NAME=MODULE:CLASS, got {plugin!r}")
+        register_provider(spec, name)
+    platforms = tuple(name.strip() for name in args.platforms.split(',') if name.strip()) if args.platforms else None
+    unknown = [platform for platform in platforms or () if platform not in PROVIDERS]
+    if unknown:
+        parser.error(f"unknown platforms: {', '.join(unknown)} (known: {', '.join(PROVIDERS)})")
+    deadlines = {}
+    for deadline in args.deadline:
+        platform, _, seconds = deadline.partition('=')
+        try:
+            deadlines[platform] = float(seconds)
+        except ValueError:
+            parser.error(f"--deadline expects PLATFORM=SECONDS, got {deadline!r}")
+        if platform not in PROVIDERS:
+            parser.error(f"unknown platform in --deadline: {platform}")
+    if (args.risk or args.score) and np is None:
+        parser.error("risk scoring requires numpy (pip install numpy)")
+    
+    if args.watch and args.offline:
+        parser.error("--watch polls the platforms for changes, so it cannot run --offline")
+    if args.batch and args.format and args.output == '-':
+        parser.error("--format prints batch results to stdout, so write --output to a file")
+    
+    if args.score:
+        write_risk_report(load_batch_results(args.score), args.risk or 'risk_scores.jsonl')
+        return
+    
+    if args.metrics_port:
+        serve_metrics(args.metrics_port)
+    
+    intervals = dict(WATCH_INTERVALS)
+    if args.interval:
+        intervals = {platform: args.interval for platform in platforms or PROVIDERS}
+    if args.no_cache:
+        cache = None
+    elif args.watch:
+        cache = watch_cache(intervals, db_path=args.cache_db)
+    else:
+        cache = ResponseCache(db_path=args.cache_db)
+    index = None
+    if args.index or args.offline:
+        index = TokenIndex(args.index or TOKEN_INDEX_FILE, ttl=args.index_ttl)
+    options = dict(cache=cache, use_cache=not args.no_cache, index=index, offline=args.offline,
+                   platforms=platforms, deadlines=deadlines, budget=args.budget)
+    
+    if args.serve is not None:
+        checker = EnhancedTokenChecker(verbose=False, pool_size=SERVER_MAX_CONCURRENT * BIRDEYE_OVERVIEW_CONCURRENCY,
+                                       **options)
+        if index is not None and not args.offline:
+            checker.start_index_refresh()
+        run_server(checker, args.host, args.serve)
+        return
+    
+    if args.watch:
+        checker = EnhancedTokenChecker(verbose=False, pool_size=args.workers * BIRDEYE_OVERVIEW_CONCURRENCY, **options)
+        run_watch(checker, args.watch, intervals, args.workers, output=args.output if args.ndjson else None)
+        return
+    
+    if args.batch:
+        checker = EnhancedTokenChecker(verbose=False, pool_size=args.workers * BIRDEYE_OVERVIEW_CONCURRENCY, **options)
+        renderer = None
+        if args.format == 'table':
+            renderer = TableRenderer(show_query=True)
+        elif args.format:
+            renderer = RENDERERS[args.format]()
+        run_batch(checker, args.batch, args.output, args.workers, per_record=args.ndjson,
+                  entities_output=args.entities, risk_output=args.risk, renderer=renderer)
+        return
+    
+    checker = EnhancedTokenChecker(**options)
+    checker.renderer = RENDERERS[args.format or 'text']()
+    if index is not None and not args.offline:
+        checker.start_index_refresh()
     
     print("\n" + "="*60)
     print("🪙  ENHANCED BLOCKCHAIN TOKEN CHECKER")
     print("="*60)
-    print("\nSearches across 7 platforms:")
-    print("  • DexScreener (Multi-chain)")
-    print("  • CoinGecko & CoinMarketCap (Market Data)")
-    print("  • Birdeye (Solana)")
-    print("  • Pump.fun (Solana Meme Tokens)")
-    print("  • MEXC Exchange")
-    print("  • GeckoTerminal (DEX Data)")
+    print(f"\nSearches across {len(checker.platforms)} platforms:")
+    for platform in checker.platforms:
+        provider = checker.provider(platform)
+        print(f"  • {provider.label} ({provider.description})")
+    if args.offline:
+        print("\n📴 Offline: answering from the local token index only")
 
     print("="*60 + "\n")
     
@@ -493,6 +3721,13 @@ def main():
         token_name = input("Enter token name (or 'quit' to exit): ").strip()
         
         if token_name.lower() in ['quit', 'exit', 'q']:
+            if cache is not None:
+                stats = cache.stats()
+                print(f"\n🗄️  Cache: {stats['hits']} hits, {stats['misses']} misses, {stats['evictions']} evictions")
+            if index is not None:
+                stats = index.stats()
+                print(f"📚 Index: {stats['tokens']} tokens from {stats['searches']} searches")
+            print_platform_timings(checker.metrics)
             print("\n👋 Goodbye!")
             break
         
@@ -500,11 +3735,9 @@ def main():
             print("⚠️  Please enter a token name.")
             continue
         
-        # Search all platforms
-        results = checker.search_all(token_name)
-        
-        # Display results
-        checker.display_results(results)
+        # Search all platforms, showing each one's results as soon as it answers
+        results = checker.display_stream(checker.iter_search(token_name))
+        checker.display_clones(results)
         
         # Ask if user wants to save results
         save = input("\nSave results to JSON? (y/n): ").strip().lower()